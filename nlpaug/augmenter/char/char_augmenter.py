@@ -1,6 +1,8 @@
-import string
 import re
 
+import numpy as np
+
+from nlpaug.augmenter.char import char_noise
 from nlpaug.util import Method
 from nlpaug.util.text.tokenizer import Tokenizer
 from nlpaug import Augmenter
@@ -8,6 +10,9 @@ from nlpaug.util import WarningException, WarningName, WarningCode, WarningMessa
 
 
 class CharAugmenter(Augmenter):
+    # Actions which are supported by vectorized engine (see char_noise)
+    BATCH_ACTIONS = []
+
     def __init__(self, action, name='Char_Aug', min_char=2, aug_char_min=1, aug_char_max=10, aug_char_p=0.3,
                  aug_word_min=1, aug_word_max=10, aug_word_p=0.3, tokenizer=None, reverse_tokenizer=None,
                  stopwords=None, device='cpu', verbose=0, stopwords_regex=None, include_special_char=True,
@@ -50,6 +55,42 @@ class CharAugmenter(Augmenter):
     def skip_aug(self, token_idxes, tokens):
         return token_idxes
 
+    def get_mapping_table(self):
+        """
+        :return: MappingTable of candidates which is used by vectorized engine.
+        """
+        raise NotImplementedError
+
+    def _get_batch_action_handler(self):
+        # Change logs and warnings are only produced per input
+        if self.action not in self.BATCH_ACTIONS or self.include_detail or self.verbose > 0:
+            return None
+        return self.augment_batch
+
+    def _is_word_eligible(self, tokens, token_lens):
+        # Same as pre_skip_aug but only length is checked if other conditions are not set
+        if self.stopwords is None and self.stopwords_regex is None and self.include_special_char:
+            return token_lens >= self.min_char
+
+        eligible = np.zeros(len(tokens), dtype=bool)
+        eligible[self.pre_skip_aug(tokens)] = True
+        return eligible
+
+    def augment_batch(self, data):
+        """
+        Vectorized version of action for list of texts. Words and characters of whole batch are drawn by NumPy at
+        once and augmented texts are rebuilt once at the end. Draws are seeded from python's `random` so that
+        `random.seed` reproduces them.
+
+        :param list data: Texts
+        :return: Augmented texts
+        """
+        return char_noise.augment_batch(
+            data, self.action, self.get_mapping_table(), tokenize_batch=self.tokenize_batch,
+            detokenize_batch=self.detokenize_batch, word_eligible_fx=self._is_word_eligible,
+            aug_word_min=self.aug_word_min, aug_word_max=self.aug_word_max, aug_word_p=self.aug_word_p,
+            aug_char_min=self.aug_char_min, aug_char_max=self.aug_char_max, aug_char_p=self.aug_char_p)
+
     @staticmethod
     def _build_augmented_token(chars, aug_idxes, replacement):
         aug_idx_set = set(aug_idxes)
@@ -62,6 +103,7 @@ class CharAugmenter(Augmenter):
         )
 
     def pre_skip_aug(self, tokens, tuple_idx=None):
+        matcher = self.get_stopword_matcher()
         results = []
         for token_idx, token in enumerate(tokens):
             if tuple_idx is not None:
@@ -69,19 +111,13 @@ class CharAugmenter(Augmenter):
             else:
                 _token = token
             # skip punctuation
-            if _token in string.punctuation and not self.include_special_char:
+            if not self.include_special_char and matcher.is_punctuation(_token):
                 continue
             """
                 TODO: cannot skip word that were split by tokenizer
             """
-            # skip stopwords by list
-            if self.stopwords is not None and _token in self.stopwords:
-                continue
-
-            # skip stopwords by regex
-            if self.stopwords_regex is not None and (
-                    self.stopwords_regex.match(_token) or self.stopwords_regex.match(' '+_token+' ') or
-                    self.stopwords_regex.match(' '+_token) or self.stopwords_regex.match(_token+' ')):
+            # skip stopwords by list and regex
+            if matcher.is_skipped(_token):
                 continue
 
             # skip if char is too less
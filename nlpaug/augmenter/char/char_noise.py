@@ -0,0 +1,141 @@
+"""
+    Vectorized engine which applies character noise (substitute, insert and delete) to a batch of texts. Tokens of
+    whole batch are flattened into one code point array, words and characters are drawn by NumPy at once and
+    augmented texts are rebuilt once at the end. NumPy generator is seeded from python's `random` so that
+    `random.seed` reproduces augmented texts.
+"""
+
+import random
+
+import numpy as np
+
+from nlpaug.model.char import MappingTable
+from nlpaug.util import Action
+
+# Same as Augmenter._generate_aug_cnt when aug_p is None
+DEFAULT_AUG_P = 0.3
+
+
+def count_aug(sizes, aug_min, aug_max, aug_p):
+    """
+    Vectorized Augmenter._generate_aug_cnt.
+
+    :param numpy sizes: Number of tokens (or characters) per group
+    :param int aug_min: Minimum number of augmentation
+    :param int aug_max: Maximum number of augmentation
+    :param float aug_p: Percentage of augmentation. Default percentage of Augmenter._generate_aug_cnt is used if None
+        is passed.
+    :return: numpy Number of augmentation per group
+    """
+    if aug_p is None:
+        aug_p = DEFAULT_AUG_P
+    cnts = np.ceil(aug_p * sizes).astype(np.int64)
+    results = cnts
+    if aug_max:
+        results = np.where(cnts > aug_max, aug_max, results)
+    # aug_min takes priority over aug_max
+    if aug_min:
+        results = np.where(cnts < aug_min, aug_min, results)
+    return results
+
+
+def sample_in_groups(group_ids, group_starts, eligible, cnts, rng=None):
+    """
+    Draw cnts[g] eligible items of each group g without replacement. Every eligible item gets a random key and
+    items which are ranked within top cnts[g] of its group are drawn.
+
+    :param numpy group_ids: Group of each item. Items of same group should be next to each other.
+    :param numpy group_starts: Index of first item of each group
+    :param numpy eligible: Whether item can be drawn
+    :param numpy cnts: Number of items to draw per group
+    :param numpy.random.Generator rng: Random generator. np.random is used if it is None.
+    :return: numpy Whether item is drawn
+    """
+    keys = (np.random if rng is None else rng).random(len(group_ids))
+    # Ineligible items are ranked after eligible ones
+    keys[~eligible] = 2.
+    orders = np.lexsort((keys, group_ids))
+    ranks = np.empty(len(orders), dtype=np.int64)
+    ranks[orders] = np.arange(len(orders)) - group_starts[group_ids[orders]]
+    return eligible & (ranks < cnts[group_ids])
+
+
+def augment_batch(texts, action, table, tokenize_batch, detokenize_batch, word_eligible_fx, aug_word_min, aug_word_max,
+                  aug_word_p, aug_char_min, aug_char_max, aug_char_p):
+    """
+    :param list texts: Input texts
+    :param str action: Action.SUBSTITUTE, Action.INSERT or Action.DELETE
+    :param MappingTable table: Candidates of each character. Character which does not have candidate is not
+        substituted (or inserted before).
+    :param func tokenize_batch: Function which tokenizes list of texts
+    :param func detokenize_batch: Function which rebuilds list of texts from their tokens
+    :param func word_eligible_fx: Function which takes flat tokens and their lengths (numpy) and returns whether
+        each token can be augmented (numpy)
+    :return: Augmented texts
+    """
+    if action not in [Action.SUBSTITUTE, Action.INSERT, Action.DELETE]:
+        raise ValueError('Action must be one of {} while {} is passed'.format(
+            [Action.SUBSTITUTE, Action.INSERT, Action.DELETE], action))
+
+    text_tokens = [
+        _tokens if text and text.strip() else [] for text, _tokens in zip(texts, tokenize_batch(texts))]
+    tokens = [token for _tokens in text_tokens for token in _tokens]
+    num_tokens = np.array([len(_tokens) for _tokens in text_tokens], dtype=np.int64)
+    token_lens = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+    codepoints = MappingTable.encode(''.join(tokens)).astype(np.int64)
+    rng = np.random.default_rng(random.getrandbits(64))
+
+    # Words
+    token_text_ids = np.repeat(np.arange(len(texts)), num_tokens)
+    token_selected = sample_in_groups(
+        token_text_ids, np.cumsum(num_tokens) - num_tokens, word_eligible_fx(tokens, token_lens),
+        count_aug(num_tokens, aug_word_min, aug_word_max, aug_word_p), rng=rng)
+
+    # Characters of selected words
+    char_token_ids = np.repeat(np.arange(len(tokens)), token_lens)
+    rows = table.lookup(codepoints)
+    # Deletion does not need any candidate
+    char_eligible = token_selected[char_token_ids] if action == Action.DELETE else \
+        (rows >= 0) & token_selected[char_token_ids]
+    char_selected = sample_in_groups(
+        char_token_ids, np.cumsum(token_lens) - token_lens, char_eligible,
+        count_aug(token_lens, aug_char_min, aug_char_max, aug_char_p), rng=rng)
+
+    # Output length of each input character
+    selected_idxes = np.flatnonzero(char_selected)
+    out_lens = np.ones(len(codepoints), dtype=np.int64)
+    value_lens = None
+    if action == Action.DELETE:
+        out_lens[selected_idxes] = 0
+    else:
+        value_idxes = table.sample(rows[selected_idxes], rng=rng)
+        value_lens = table.value_lens[value_idxes]
+        out_lens[selected_idxes] = value_lens + (1 if action == Action.INSERT else 0)
+    out_starts = np.cumsum(out_lens) - out_lens
+    outputs = np.empty(int(out_lens.sum()), dtype=np.int64)
+
+    # Original characters. Inserted characters are placed before original one.
+    kept_idxes = np.flatnonzero(~char_selected) if action != Action.INSERT else np.arange(len(codepoints))
+    kept_offsets = np.zeros(len(codepoints), dtype=np.int64)
+    if action == Action.INSERT:
+        kept_offsets[selected_idxes] = value_lens
+    outputs[out_starts[kept_idxes] + kept_offsets[kept_idxes]] = codepoints[kept_idxes]
+
+    # Candidates (may have more than one character)
+    if value_lens is not None and len(selected_idxes) > 0:
+        inner_offsets = np.arange(int(value_lens.sum())) - np.repeat(np.cumsum(value_lens) - value_lens, value_lens)
+        outputs[np.repeat(out_starts[selected_idxes], value_lens) + inner_offsets] = \
+            table.value_codepoints[np.repeat(table.value_offsets[value_idxes], value_lens) + inner_offsets]
+
+    # Rebuild texts once
+    augmented = MappingTable.decode(outputs)
+    new_token_ends = np.cumsum(np.bincount(char_token_ids, weights=out_lens, minlength=len(tokens)).astype(np.int64))
+    new_token_starts = np.concatenate([[0], new_token_ends[:-1]]).astype(np.int64)
+    new_tokens = [augmented[s:e] for s, e in zip(new_token_starts.tolist(), new_token_ends.tolist())]
+
+    text_ends = np.cumsum(num_tokens).tolist()
+    text_starts = [0] + text_ends[:-1]
+    results = detokenize_batch([
+        [token for token in new_tokens[start:end] if token] for start, end in zip(text_starts, text_ends)])
+    # Empty text is returned as it is
+    return [result if text and text.strip() else text for text, result in zip(texts, results)]
@@ -5,9 +5,26 @@
 import os
 
 from nlpaug.augmenter.char import CharAugmenter
-from nlpaug.util import Action, Method, Doc, LibraryUtil
+from nlpaug.util import Action, Method, Doc, LibraryUtil, LOOKUP_CACHE
 import nlpaug.model.char as nmc
 
+KEYBOARD_MODELS = LOOKUP_CACHE.namespace('keyboard')
+
+
+def init_keyboard_model(model_path, special_char=True, numeric=True, upper_case=True, lang="en", force_reload=False):
+    # Load model once at runtime. Mapping is read-only so that it is shared by augmenters. Modification time is part
+    # of key so that updated file is loaded again.
+    return KEYBOARD_MODELS.get_or_create(
+        (model_path, _get_mtime(model_path), special_char, numeric, upper_case),
+        factory=lambda: nmc.Keyboard(special_char=special_char, numeric=numeric, upper_case=upper_case, lang=lang,
+                                     model_path=model_path),
+        force_reload=force_reload,
+    )
+
+
+def _get_mtime(path):
+    return os.path.getmtime(path) if path and os.path.isfile(path) else None
+
 
 class KeyboardAug(CharAugmenter):
     # https://arxiv.org/pdf/1711.02173.pdf
@@ -33,7 +50,9 @@ class KeyboardAug(CharAugmenter):
     :param bool include_upper_case: If True, upper case character may be included in augmented data.
     :param bool include_numeric: If True, numeric character may be included in augmented data.
     :param int min_char: If word less than this value, do not draw word for augmentation
-    :param str model_path: Loading customize model from file system
+    :param str model_path: Loading customize model from file system. Snapshot (.npz) which is saved by
+        `Keyboard.save_snapshot` can be passed to skip parsing json. Snapshot is filtered already so that
+        include_special_char, include_numeric and include_upper_case do not apply to it.
     :param str lang: Indicate built-in language model. Default value is 'en'. Possible values are 'en', 'th' (Thai), 
         'tr'(Turkish), 'de'(German), 'es'(Spanish), 'fr'(French), 'it'(Italian), 'nl'(Dutch), 'pl'(Polish), 
         'uk'(Ukrainian), 'he'(Hebrew). If custom model is used (passing model_path), this value will be ignored. 
@@ -43,6 +62,8 @@ class KeyboardAug(CharAugmenter):
     >>> aug = nac.KeyboardAug()
     """
 
+    BATCH_ACTIONS = [Action.SUBSTITUTE]
+
     def __init__(self, name='Keyboard_Aug', aug_char_min=1, aug_char_max=10, aug_char_p=0.3,
                  aug_word_p=0.3, aug_word_min=1, aug_word_max=10, stopwords=None,
                  tokenizer=None, reverse_tokenizer=None, include_special_char=True, include_numeric=True,
@@ -85,6 +106,9 @@ class KeyboardAug(CharAugmenter):
             self.model_path = model_path
         self.model = self.get_model(include_special_char, include_numeric, include_upper_case, lang, self.model_path)
 
+    def get_mapping_table(self):
+        return self.model.get_mapping_table()
+
     def skip_aug(self, token_idxes, tokens):
         results = []
         for token_idx in token_idxes:
@@ -133,6 +157,7 @@ class KeyboardAug(CharAugmenter):
             return self.reverse_tokenizer(doc.get_augmented_tokens())
 
     @classmethod
-    def get_model(cls, special_char=True, numeric=True, upper_case=True, lang="en", model_path=None):
-        return nmc.Keyboard(special_char=special_char, numeric=numeric, upper_case=upper_case, lang=lang,
-                            model_path=model_path)
+    def get_model(cls, special_char=True, numeric=True, upper_case=True, lang="en", model_path=None,
+                  force_reload=False):
+        return init_keyboard_model(model_path, special_char=special_char, numeric=numeric, upper_case=upper_case,
+                                   lang=lang, force_reload=force_reload)
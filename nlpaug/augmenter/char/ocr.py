@@ -4,9 +4,34 @@
 import os
 
 from nlpaug.augmenter.char import CharAugmenter
-from nlpaug.util import Action, Method, Doc, ReadUtil, LibraryUtil
+from nlpaug.util import Action, Method, Doc, ReadUtil, LibraryUtil, LOOKUP_CACHE
 import nlpaug.model.char as nmc
 
+OCR_MODELS = LOOKUP_CACHE.namespace('ocr')
+
+
+def init_ocr_model(dict_path, force_reload=False):
+    # Load model once at runtime. Mapping is read-only so that it is shared by augmenters. Modification time is part
+    # of key so that updated file is loaded again.
+    mtime = os.path.getmtime(dict_path) if os.path.isfile(dict_path) else None
+    return OCR_MODELS.get_or_create(
+        (dict_path, mtime),
+        factory=lambda: _create_ocr_model(dict_path),
+        force_reload=force_reload,
+    )
+
+
+def _create_ocr_model(dict_path):
+    if nmc.Ocr.is_snapshot(dict_path):
+        model = nmc.Ocr(model={})
+        model.load_snapshot(dict_path)
+        return model
+
+    mapping = ReadUtil.read_json(dict_path)
+    if not mapping:
+        raise ValueError('The dict_of_path does not exist. Please check "{}"'.format(dict_path))
+    return nmc.Ocr(model=mapping)
+
 
 class OcrAug(CharAugmenter):
     """
@@ -29,12 +54,15 @@ class OcrAug(CharAugmenter):
     :param func tokenizer: Customize tokenization process
     :param func reverse_tokenizer: Customize reverse of tokenization process
     :param obj dict_of_path: Use pre-defined dictionary by default. Pass either file path of dict to use custom mapping. 
+        Snapshot (.npz) which is saved by `Ocr.save_snapshot` can be passed to skip parsing json.
     :param str name: Name of this augmenter
 
     >>> import nlpaug.augmenter.char as nac
     >>> aug = nac.OcrAug()
     """
 
+    BATCH_ACTIONS = [Action.SUBSTITUTE]
+
     def __init__(self, name='OCR_Aug', aug_char_min=2, aug_char_max=10, aug_char_p=0.3,
                  aug_word_p=0.3, aug_word_min=1, aug_word_max=10, stopwords=None,
                  tokenizer=None, reverse_tokenizer=None, verbose=0, stopwords_regex=None, min_char=1, dict_of_path=None):
@@ -46,6 +74,9 @@ class OcrAug(CharAugmenter):
 
         self.model = self.get_model(dict_of_path)
 
+    def get_mapping_table(self):
+        return self.model.get_mapping_table()
+
     def skip_aug(self, token_idxes, tokens):
         results = []
         for token_idx in token_idxes:
@@ -94,19 +125,12 @@ class OcrAug(CharAugmenter):
             return self.reverse_tokenizer(doc.get_augmented_tokens())
 
     @classmethod
-    def get_model(cls, dict_of_path):
-        # Use default
-        if not dict_of_path:
-            default_path = os.path.join(LibraryUtil.get_res_dir(), 'char', 'ocr', 'en.json')
-            model = ReadUtil.read_json(default_path)
-            return nmc.Ocr(model=model)
-
+    def get_model(cls, dict_of_path, force_reload=False):
         # Use dict
         if type(dict_of_path) is dict:
             return nmc.Ocr(model=dict_of_path)
 
-        # Use json from file
-        model = ReadUtil.read_json(dict_of_path)
-        if not model:
-            raise ValueError('The dict_of_path does not exist. Please check "{}"'.format(dict_of_path))
-        return nmc.Ocr(model=model)
+        # Use default or json (or snapshot) from file
+        if not dict_of_path:
+            dict_of_path = os.path.join(LibraryUtil.get_res_dir(), 'char', 'ocr', 'en.json')
+        return init_ocr_model(dict_of_path, force_reload=force_reload)
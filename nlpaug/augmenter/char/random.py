@@ -7,6 +7,7 @@
 import string
 
 from nlpaug.augmenter.char import CharAugmenter
+from nlpaug.model.char import MappingTable
 from nlpaug.util import Action, Method, Doc
 
 
@@ -53,6 +54,8 @@ class RandomCharAug(CharAugmenter):
     >>> aug = nac.RandomCharAug()
     """
 
+    BATCH_ACTIONS = [Action.INSERT, Action.SUBSTITUTE, Action.DELETE]
+
     def __init__(self, action=Action.SUBSTITUTE, name='RandomChar_Aug', aug_char_min=1, aug_char_max=10, aug_char_p=0.3,
                  aug_word_p=0.3, aug_word_min=1, aug_word_max=10, include_upper_case=True, include_lower_case=True,
                  include_numeric=True, min_char=4, swap_mode='adjacent', spec_char='!@#$%^&*()_+', stopwords=None,
@@ -71,6 +74,7 @@ class RandomCharAug(CharAugmenter):
         self.candidates = candidates
 
         self.model = self.get_model()
+        self._mapping_table = None
 
     def insert(self, data):
         if not data or not data.strip():
@@ -259,6 +263,11 @@ class RandomCharAug(CharAugmenter):
 
         return candidates
 
+    def get_mapping_table(self):
+        if self._mapping_table is None:
+            self._mapping_table = MappingTable(candidates=self.model)
+        return self._mapping_table
+
     def _get_swap_position(self, pos, token_length, mode='adjacent'):
         if mode == 'adjacent':
             if pos == 0:
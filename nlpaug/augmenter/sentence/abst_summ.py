@@ -2,18 +2,16 @@
     Augmenter that apply operation (sentence level) to textual input based on abstractive summarization.
 """
 
-import os
-
 from nlpaug.augmenter.sentence import SentenceAugmenter
 import nlpaug.model.lang_models as nml
-from nlpaug.util import Action, Doc, ModelCache
+from nlpaug.util import Action, Doc, MODEL_CACHE, get_model_key
 
-ABST_SUMM_MODELS = ModelCache()
+ABST_SUMM_MODELS = MODEL_CACHE.namespace('abst_summ')
 
 def init_abst_summ_model(model_path, tokenizer_path, device, force_reload=False,
     min_length=20, max_length=50, batch_size=32, temperature=1.0, top_k=50, top_p=0.9, 
     use_custom_api=True):
-    model_name = '_'.join([os.path.basename(model_path), os.path.basename(tokenizer_path), str(device)])
+    model_name = (get_model_key(model_path), get_model_key(tokenizer_path), str(device), use_custom_api)
     return ABST_SUMM_MODELS.get_or_create(
         model_name,
         factory=lambda: _create_abst_summ_model(
@@ -104,7 +102,7 @@ class AbstSummAug(SentenceAugmenter):
             top_k=top_k, top_p=top_p, use_custom_api=use_custom_api)
         self.device = self.model.device
 
-    def substitute(self, data):
+    def substitute(self, data, n=1):
         if not data:
             return data
 
@@ -115,6 +113,12 @@ class AbstSummAug(SentenceAugmenter):
                 return data
             all_data = [data]
 
+        if n > 1 and not isinstance(data, list):
+            # n summaries of single input come from one generate call
+            if isinstance(self.model, nml.XSumTransformers):
+                return self.model.predict(all_data, n=n)[0]
+            return [result for _ in range(n) for result in self.model.predict(all_data)]
+
         return self.model.predict(all_data)
 
     @classmethod
@@ -2,21 +2,20 @@
     Augmenter that apply operation (sentence level) to textual input based on contextual word embeddings.
 """
 
-import os
 from typing import Iterable
 
 from nlpaug.augmenter.sentence import SentenceAugmenter
 import nlpaug.model.lang_models as nml
-from nlpaug.util import Action, Doc, ModelCache
+from nlpaug.util import Action, Doc, MODEL_CACHE, get_model_key
 import nlpaug.util.text.tokenizer as text_tokenizer
 
-CONTEXT_WORD_EMBS_SENTENCE_MODELS = ModelCache()
+CONTEXT_WORD_EMBS_SENTENCE_MODELS = MODEL_CACHE.namespace('context_word_embs_sentence')
 
 
 def init_context_word_embs_sentence_model(model_path, model_type, device, force_reload=False, 
     min_length=100, max_length=300, batch_size=32, temperature=1.0, top_k=50, top_p=0.9, 
     silence=True, use_custom_api=True):
-    model_name = '_'.join([os.path.basename(model_path), str(device)])
+    model_name = (get_model_key(model_path), model_type, str(device), use_custom_api)
     return CONTEXT_WORD_EMBS_SENTENCE_MODELS.get_or_create(
         model_name,
         factory=lambda: _create_context_word_embs_sentence_model(
@@ -143,6 +142,10 @@ class ContextualWordEmbsForSentenceAug(SentenceAugmenter):
             all_data = [data]
             
         if self.use_custom_api:
+            # Reuse past key values across steps so that only newly sampled token is fed to model
+            if self.model_type in ['gpt2'] and hasattr(self.model, 'predict_next') \
+                    and self.model.optimize['external_memory']:
+                return self._custom_insert_with_memory(all_data)
             return self._custom_insert(all_data)
         else:
             return self._native_insert(all_data)
@@ -223,6 +226,54 @@ class ContextualWordEmbsForSentenceAug(SentenceAugmenter):
 
         return results
 
+    def _custom_insert_with_memory(self, all_data):
+        max_try = 30  # On average 30 should be enough to complete a sentence
+        generated_ids = [[] for _ in all_data]
+        docs = [Doc() for _ in all_data]
+        doc_token_idxes = [0] * len(all_data)
+        change_seq = 0
+
+        aug_input_poses = list(range(len(all_data)))  # input of each row in external memory
+        outputs, external_memory = self.model.predict_next(texts=list(all_data), include_punctuation=True)
+
+        for step in range(max_try):
+            next_rows = []
+            next_ids = []
+            for row, (aug_input_pos, output) in enumerate(zip(aug_input_poses, outputs)):
+                candidate, candidate_id = '', None
+                # Probability may follow token and token id if return_proba is enabled
+                if len(output) == 1:
+                    candidate, candidate_id = output[0][:2]
+                elif len(output) > 1:
+                    candidate, candidate_id = self.sample(output, 1)[0][:2]
+
+                change_seq += 1
+                token_idx = doc_token_idxes[aug_input_pos]
+                docs[aug_input_pos].add_token(token_idx, token='', action=Action.INSERT, change_seq=0)
+                docs[aug_input_pos].update_change_log(token_idx, token=self.model.clean(candidate), action=Action.INSERT,
+                    change_seq=self.parent_change_seq + change_seq)
+                doc_token_idxes[aug_input_pos] += 1
+
+                if candidate_id is not None:
+                    generated_ids[aug_input_pos].append(candidate_id)
+
+                # Stop if generated a sentence. Same as _custom_insert, row also stops if there is no candidate ('' is
+                # in SENTENCE_SEPARATOR). Row is pruned from external memory.
+                if candidate_id is not None and candidate not in text_tokenizer.SENTENCE_SEPARATOR:
+                    next_rows.append(row)
+                    next_ids.append(candidate_id)
+
+            if not next_rows or step == max_try - 1:
+                break
+
+            aug_input_poses = [aug_input_poses[row] for row in next_rows]
+            outputs, external_memory = self.model.predict_next(
+                next_ids=next_ids, external_memory=external_memory, rows=next_rows, include_punctuation=True)
+
+        # Generated text is decoded from token ids so that it is same as the context which model conditioned on
+        # (e.g. "un" + "likely" is "unlikely" while "Ġun" + "Ġlikely" is "un likely")
+        return [d + self.model.decode(ids) for d, ids in zip(all_data, generated_ids)]
+
     def _native_insert(self, all_data):
         return self.model.predict(all_data)
 
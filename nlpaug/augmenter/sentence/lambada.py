@@ -7,13 +7,13 @@ import json
 
 from nlpaug.augmenter.sentence import SentenceAugmenter
 import nlpaug.model.lang_models as nml
-from nlpaug.util import Action, Doc, ModelCache
+from nlpaug.util import Action, Doc, MODEL_CACHE, get_model_key
 
-LAMBADA_MODELS = ModelCache()
+LAMBADA_MODELS = MODEL_CACHE.namespace('lambada')
 
 def init_lambada_model(model_dir, threshold, min_length, max_length, batch_size, 
     temperature, top_k, top_p, repetition_penalty, device, force_reload):
-    model_name = '_'.join([os.path.basename(model_dir), str(device)])
+    model_name = (get_model_key(model_dir), str(device))
     return LAMBADA_MODELS.get_or_create(
         model_name,
         factory=lambda: nml.Lambada(
@@ -4,13 +4,13 @@
 
 from nlpaug.augmenter.word import WordAugmenter
 import nlpaug.model.lang_models as nml
-from nlpaug.util import ModelCache
+from nlpaug.util import MODEL_CACHE, TranslationCache
 
-BACK_TRANSLATION_MODELS = ModelCache()
+BACK_TRANSLATION_MODELS = MODEL_CACHE.namespace('back_translation')
 
 
 def init_back_translation_model(from_model_name, to_model_name, device, force_reload=False,
-                                batch_size=32, max_length=None):
+                                batch_size=32, max_length=None, max_tokens=None, pipelined=False):
     model_name = '_'.join([from_model_name, to_model_name, str(device)])
     return BACK_TRANSLATION_MODELS.get_or_create(
         model_name,
@@ -20,11 +20,15 @@ def init_back_translation_model(from_model_name, to_model_name, device, force_re
             device=device,
             batch_size=batch_size,
             max_length=max_length,
+            max_tokens=max_tokens,
+            pipelined=pipelined,
         ),
         force_reload=force_reload,
         updates={
             'batch_size': batch_size,
             'max_length': max_length,
+            'max_tokens': max_tokens,
+            'pipelined': pipelined,
         },
     )
 
@@ -46,6 +50,14 @@ class BackTranslationAug(WordAugmenter):
         Default value is False and suggesting to keep it as False if performance is the consideration.
     :param int batch_size: Batch size.
     :param int max_length: The max length of output text.
+    :param int max_tokens: Maximum number of (padded) tokens per batch. Inputs are batched by length under both
+        batch_size and max_tokens. Default value is None which means only batch_size is applied.
+    :param bool pipelined: If True, translating back a batch is overlapped with translating next batch (in a
+        background thread). It fits large offline jobs. Default value is False.
+    :param str cache_path: File path of persistent translation cache (SQLite). If it is provided, translations are
+        read from it first and only missed texts are translated. Default value is None which means no cache.
+    :param int cache_max_bytes: Approximate budget (in bytes) of translation cache. Least recently used translations
+        are evicted when it is exceeded. Default value is None which means no limit.
     :param str name: Name of this augmenter
 
     >>> import nlpaug.augmenter.word as naw
@@ -53,13 +65,17 @@ class BackTranslationAug(WordAugmenter):
     """
 
     def __init__(self, from_model_name='facebook/wmt19-en-de', to_model_name='facebook/wmt19-de-en',
-        name='BackTranslationAug', device='cpu', batch_size=32, max_length=300, force_reload=False, verbose=0):
+        name='BackTranslationAug', device='cpu', batch_size=32, max_length=300, force_reload=False, verbose=0,
+        max_tokens=None, pipelined=False, cache_path=None, cache_max_bytes=None):
         super().__init__(
             action='substitute', name=name, aug_p=None, aug_min=None, aug_max=None, tokenizer=None,
             device=device, verbose=verbose, include_detail=False)
 
+        # Cache belongs to this augmenter as model is shared by augmenters
+        self.cache = TranslationCache(cache_path, max_bytes=cache_max_bytes) if cache_path else None
         self.model = self.get_model(from_model_name=from_model_name, to_model_name=to_model_name, 
-            device=device, batch_size=batch_size, max_length=max_length
+            device=device, batch_size=batch_size, max_length=max_length, max_tokens=max_tokens,
+            pipelined=pipelined
         )
         self.device = self.model.device
 
@@ -67,14 +83,18 @@ class BackTranslationAug(WordAugmenter):
         if not data:
             return data
 
-        augmented_text = self.model.predict(data)
+        # n back translated texts of single input come from one generate call
+        if n > 1 and isinstance(data, str):
+            return self.model.predict([data], n=n)[0]
+
+        augmented_text = self.model.predict(data, cache=self.cache)
         return augmented_text
 
     @classmethod
     def get_model(cls, from_model_name, to_model_name, device='cuda', force_reload=False,
-                  batch_size=32, max_length=None):
+                  batch_size=32, max_length=None, max_tokens=None, pipelined=False):
         return init_back_translation_model(from_model_name, to_model_name, device,
-            force_reload, batch_size, max_length)
+            force_reload, batch_size, max_length, max_tokens, pipelined)
 
     @classmethod
     def clear_cache(cls):
@@ -3,20 +3,19 @@
 """
 
 import string
-import os
 import re
 import logging
 
 from nlpaug.augmenter.word import WordAugmenter
 import nlpaug.model.lang_models as nml
-from nlpaug.util import Action, Doc, ModelCache
+from nlpaug.util import Action, Doc, MODEL_CACHE, get_model_key
 
-CONTEXT_WORD_EMBS_MODELS = ModelCache()
+CONTEXT_WORD_EMBS_MODELS = MODEL_CACHE.namespace('context_word_embs')
 
 
 def init_context_word_embs_model(model_path, model_type, device, force_reload=False, batch_size=32, 
-    top_k=None, silence=True, use_custom_api=False):
-    model_name = '_'.join([os.path.basename(model_path), model_type, str(device)])
+    top_k=None, silence=True, use_custom_api=False, max_tokens=None, backend='torch'):
+    model_name = (get_model_key(model_path), model_type, str(device), use_custom_api, backend)
     return CONTEXT_WORD_EMBS_MODELS.get_or_create(
         model_name,
         factory=lambda: _create_context_word_embs_model(
@@ -27,24 +26,31 @@ def init_context_word_embs_model(model_path, model_type, device, force_reload=Fa
             top_k=top_k,
             silence=silence,
             use_custom_api=use_custom_api,
+            max_tokens=max_tokens,
+            backend=backend,
         ),
         force_reload=force_reload,
         updates={
             'top_k': top_k,
             'batch_size': batch_size,
             'silence': silence,
+            'max_tokens': max_tokens,
         },
     )
 
 
-def _create_context_word_embs_model(model_path, model_type, device, batch_size, top_k, silence, use_custom_api):
+def _create_context_word_embs_model(model_path, model_type, device, batch_size, top_k, silence, use_custom_api,
+    max_tokens=None, backend='torch'):
     if use_custom_api:
         if model_type == 'distilbert':
-            return nml.DistilBert(model_path, device=device, top_k=top_k, silence=silence, batch_size=batch_size)
+            return nml.DistilBert(model_path, device=device, top_k=top_k, silence=silence, batch_size=batch_size,
+                max_tokens=max_tokens, backend=backend)
         if model_type == 'roberta':
-            return nml.Roberta(model_path, device=device, top_k=top_k, silence=silence, batch_size=batch_size)
+            return nml.Roberta(model_path, device=device, top_k=top_k, silence=silence, batch_size=batch_size,
+                max_tokens=max_tokens, backend=backend)
         if model_type == 'bert':
-            return nml.Bert(model_path, device=device, top_k=top_k, silence=silence, batch_size=batch_size)
+            return nml.Bert(model_path, device=device, top_k=top_k, silence=silence, batch_size=batch_size,
+                max_tokens=max_tokens, backend=backend)
         raise ValueError('Model type value is unexpected. Only support bert and roberta models.')
 
     if model_type in ['distilbert', 'bert', 'roberta', 'bart']:
@@ -85,20 +91,38 @@ class ContextualWordEmbsAug(WordAugmenter):
     :param str device: Default value is CPU. If value is CPU, it uses CPU for processing. If value is CUDA, it uses GPU
         for processing. Possible values include 'cuda' and 'cpu'. (May able to use other options)
     :param int batch_size: Batch size.
+    :param int max_tokens: Only applicable for custom API (use_custom_api=True). Maximum number of (padded) tokens
+        per batch. Inputs are batched by length under both batch_size and max_tokens. Default value is None which
+        means only batch_size is applied.
+    :param str backend: Only applicable for custom API (use_custom_api=True). Inference backend of model. Possible
+        values are 'torch' (default), 'quantized' (PyTorch dynamic int8 quantization), 'onnx' (ONNX Runtime) and
+        'onnx_quantized' (ONNX Runtime with int8 quantization). Except 'torch', model is exported or quantized once
+        and cached under ~/.cache/nlpaug/backends. Only CPU is supported except 'torch'.
     :param bool force_reload: Force reload the contextual word embeddings model to memory when initialize the class.
         Default value is False and suggesting to keep it as False if performance is the consideration.
     :param bool silence: Default is True. transformers library will print out warning message when leveraing
         pre-trained model. Set True to disable the expected warning message.
+    :param bool multi_mask: Only applicable for 'substitute' action with custom API (use_custom_api=True). If True,
+        all selected words are masked at once and predicted by a single forward pass instead of one forward pass per
+        word. Default value is False.
+    :param int refine_steps: Only applicable when multi_mask is True. Number of refinement passes after the first
+        prediction. Each pass masks every second substituted word (alternating between passes) and predicts them
+        again given the others. Each pass costs one more forward pass. Default value is 0.
+    :param bool use_token_ids: Only applicable for custom API (use_custom_api=True). If True, masked inputs are
+        passed to model as input ids instead of decoding tokens to text and tokenizing it again. Default value is
+        False.
     :param str name: Name of this augmenter
 
     >>> import nlpaug.augmenter.word as naw
     >>> aug = naw.ContextualWordEmbsAug()
+    >>> aug = naw.ContextualWordEmbsAug(multi_mask=True, refine_steps=1)
     """
 
     def __init__(self, model_path='bert-base-uncased', model_type='', action="substitute", top_k=100, 
                  name='ContextualWordEmbs_Aug', aug_min=1, aug_max=10, aug_p=0.3, stopwords=None,
                  batch_size=32, device='cpu', force_reload=False, stopwords_regex=None,
-                 verbose=0, silence=True, use_custom_api=True):
+                 verbose=0, silence=True, use_custom_api=True, multi_mask=False, refine_steps=0,
+                 use_token_ids=False, max_tokens=None, backend='torch'):
         super().__init__(
             action=action, name=name, aug_p=aug_p, aug_min=aug_min, aug_max=aug_max, tokenizer=None,
             device=device, stopwords=stopwords, verbose=verbose, stopwords_regex=stopwords_regex,
@@ -110,9 +134,22 @@ class ContextualWordEmbsAug(WordAugmenter):
         # TODO: Slow when switching to HuggingFace pipeline. #https://github.com/makcedward/nlpaug/issues/248
         self.use_custom_api = use_custom_api
 
+        if multi_mask and not use_custom_api:
+            raise ValueError('multi_mask is only supported when use_custom_api is True')
+        if refine_steps < 0:
+            raise ValueError('refine_steps must be a non-negative integer while {} is passed'.format(refine_steps))
+        if backend != 'torch' and not use_custom_api:
+            raise ValueError('backend is only supported when use_custom_api is True')
+        if use_token_ids and not use_custom_api:
+            raise ValueError('use_token_ids is only supported when use_custom_api is True')
+        self.multi_mask = multi_mask
+        self.use_token_ids = use_token_ids
+        self.refine_steps = refine_steps
+
         self.model = self.get_model(
             model_path=model_path, model_type=self.model_type, device=device, force_reload=force_reload,
-            batch_size=batch_size, top_k=top_k, silence=silence, use_custom_api=use_custom_api)
+            batch_size=batch_size, top_k=top_k, silence=silence, use_custom_api=use_custom_api,
+            max_tokens=max_tokens, backend=backend)
         # Override stopwords
         # if stopwords and self.model_type in ['xlnet', 'roberta']:
         #     stopwords = [self.stopwords]
@@ -177,7 +214,7 @@ class ContextualWordEmbsAug(WordAugmenter):
             unknown_token = self.model.get_unknown_token() or self.model.UNKNOWN_TOKEN
             if token == unknown_token:
                 return True
-            return token.lower() in self.stopwords
+            return token.lower() in self.get_stopword_matcher().stopwords
         else:
             return False
 
@@ -306,22 +343,21 @@ class ContextualWordEmbsAug(WordAugmenter):
                     change_seq=self.parent_change_seq+change_seq)
 
                 aug_input_poses.append(j)
-                # some tokenizers handle special charas (e.g. don't can merge after decode)
-                if self.model_type in ['bert', 'electra']:
-                    ids = self.model.get_tokenizer().convert_tokens_to_ids(head_doc.get_augmented_tokens())
-                    masked_text = self.model.get_tokenizer().decode(ids).strip()
-                elif self.model_type in ['xlnet', 'roberta', 'bart']:
-                    masked_text = self.model.get_tokenizer().convert_tokens_to_string(head_doc.get_augmented_tokens()).strip()
-
-                masked_texts.append(masked_text)
+                if not self.use_token_ids:
+                    masked_texts.append(self._to_masked_text(head_doc))
 
-            if not len(masked_texts):
+            if not len(aug_input_poses):
                 continue
 
-            outputs = self.model.predict(masked_texts, target_words=None, n=2)
+            if self.use_token_ids:
+                outputs = self._predict_by_token_ids(
+                    [split_results[j][5] for j in aug_input_poses], [[split_results[j][6][i]] for j in aug_input_poses])
+                outputs = [output[0] if output else [] for output in outputs]
+            else:
+                outputs = self.model.predict(masked_texts, target_words=None, n=2)
 
             # Update doc
-            for aug_input_pos, output, masked_text in zip(aug_input_poses, outputs, masked_texts):
+            for aug_input_pos, output in zip(aug_input_poses, outputs):
                 split_result = split_results[aug_input_pos]
                 head_doc = split_result[5]
                 aug_idx = split_result[6][i] # augment position in text
@@ -423,6 +459,33 @@ class ContextualWordEmbsAug(WordAugmenter):
 
             split_results[i] += (cleaned_head_tokens, head_doc, aug_idxes, )
 
+        if self.multi_mask:
+            self._substitute_by_single_pass(split_results, change_seq)
+        else:
+            self._substitute_by_position(split_results, change_seq)
+
+        augmented_texts = []
+        for split_result in split_results:
+            tail_text, head_doc = split_result[1], split_result[5]
+
+            head_tokens = head_doc.get_augmented_tokens()
+            # if self.model_type in ['xlnet', 'roberta']:
+            #     # xlent and roberta tokens include prefix (e.g. ▁ or Ġ')
+            #     head_tokens = [self.model.get_subword_prefix() + t if self.model.get_subword_prefix() not in t and i != 0 else t for i, t in enumerate(head_tokens)]
+
+            ids = self.model.get_tokenizer().convert_tokens_to_ids(head_tokens)
+            augmented_text = self.model.get_tokenizer().decode(ids)
+
+            if tail_text is not None:
+                augmented_text += ' ' + tail_text
+            augmented_texts.append(augmented_text)
+
+        if isinstance(data, list):
+            return augmented_texts
+        else:
+            return augmented_texts[0]
+
+    def _substitute_by_position(self, split_results, change_seq):
         # Pad aug_idxes
         max_aug_size = max([len(split_result[6]) for split_result in split_results])
         for split_result in split_results:
@@ -454,39 +517,25 @@ class ContextualWordEmbsAug(WordAugmenter):
                     change_seq=self.parent_change_seq+change_seq)
 
                 # remove continuous sub-word
-                to_remove_idxes = []
-                for k in range(aug_idx+1, head_doc.size()):
-                    subword_token = head_doc.get_token(k).orig_token.token
-                    if subword_token in string.punctuation:
-                        break
-                    if self.model_type in ['bert', 'electra'] and self.model.get_subword_prefix() in subword_token:
-                        to_remove_idxes.append(k)
-                    elif self.model_type in ['xlnet', 'roberta', 'bart'] and self.model.get_subword_prefix() not in subword_token:
-                        to_remove_idxes.append(k)
-                    else:
-                        break
-                for k in reversed(to_remove_idxes):
-                    head_doc.add_change_log(k, new_token='', action=Action.SUBSTITUTE,
-                        change_seq=self.parent_change_seq+change_seq)
+                self._remove_subwords(head_doc, aug_idx, change_seq)
 
                 aug_input_poses.append(j)
+                if not self.use_token_ids:
+                    masked_texts.append(self._to_masked_text(head_doc))
 
-                # some tokenizers handle special charas (e.g. don't can merge after decode)
-                if self.model_type in ['bert', 'electra']:
-                    ids = self.model.get_tokenizer().convert_tokens_to_ids(head_doc.get_augmented_tokens())
-                    masked_text = self.model.get_tokenizer().decode(ids).strip()
-                elif self.model_type in ['xlnet', 'roberta', 'bart']:
-                    masked_text = self.model.get_tokenizer().convert_tokens_to_string(head_doc.get_augmented_tokens()).strip()
-
-                masked_texts.append(masked_text)
-
-            if not len(masked_texts):
+            if not len(aug_input_poses):
                 continue
 
-            outputs = self.model.predict(masked_texts, target_words=original_tokens, n=2)
+            if self.use_token_ids:
+                outputs = self._predict_by_token_ids(
+                    [split_results[j][5] for j in aug_input_poses], [[split_results[j][6][i]] for j in aug_input_poses],
+                    [[original_token] for original_token in original_tokens])
+                outputs = [output[0] if output else [] for output in outputs]
+            else:
+                outputs = self.model.predict(masked_texts, target_words=original_tokens, n=2)
 
             # Update doc
-            for original_token, aug_input_pos, output, masked_text in zip(original_tokens, aug_input_poses, outputs, masked_texts):
+            for original_token, aug_input_pos, output in zip(original_tokens, aug_input_poses, outputs):
                 split_result = split_results[aug_input_pos]
                 head_doc = split_result[5]
                 aug_idx = split_result[6][i] # augment position in text
@@ -521,32 +570,181 @@ class ContextualWordEmbsAug(WordAugmenter):
                     for j in range(i+1, max_aug_size):
                         split_results[aug_input_pos][6][j] = -1
 
-        augmented_texts = []
-        for split_result in split_results:
-            tail_text, head_doc = split_result[1], split_result[5]
+    def _substitute_by_single_pass(self, split_results, change_seq):
+        token_placeholder = self.model.get_mask_token()
+        if self.model_type in ['xlnet', 'roberta', 'bart']:
+            token_placeholder = self.model.get_subword_prefix() + token_placeholder  # Adding prefix for
 
-            head_tokens = head_doc.get_augmented_tokens()
-            # if self.model_type in ['xlnet', 'roberta']:
-            #     # xlent and roberta tokens include prefix (e.g. ▁ or Ġ')
-            #     head_tokens = [self.model.get_subword_prefix() + t if self.model.get_subword_prefix() not in t and i != 0 else t for i, t in enumerate(head_tokens)]
+        change_seq += 1
+        head_docs = [split_result[5] for split_result in split_results]
+        aug_idxes_list = [sorted(split_result[6]) for split_result in split_results]
 
-            ids = self.model.get_tokenizer().convert_tokens_to_ids(head_tokens)
-            augmented_text = self.model.get_tokenizer().decode(ids)
+        # Ids of original tokens are kept so that they can be restored if no candidate is appropriate
+        original_ids_list = None
+        if self.use_token_ids:
+            input_ids, token_poses_list = self._encode_docs(head_docs, aug_idxes_list)
+            original_ids_list = [
+                [int(input_ids[row, token_poses[aug_idx]]) for aug_idx in aug_idxes]
+                for row, (token_poses, aug_idxes) in enumerate(zip(token_poses_list, aug_idxes_list))]
 
-            if tail_text is not None:
-                augmented_text += ' ' + tail_text
-            augmented_texts.append(augmented_text)
+        original_tokens_list = []
+        for head_doc, aug_idxes in zip(head_docs, aug_idxes_list):
+            original_tokens = []
+            for aug_idx in aug_idxes:
+                original_tokens.append(head_doc.get_token(aug_idx).get_latest_token().token)
+                head_doc.add_change_log(aug_idx, new_token=token_placeholder, action=Action.SUBSTITUTE,
+                    change_seq=self.parent_change_seq+change_seq)
+                self._remove_subwords(head_doc, aug_idx, change_seq)
+
+            original_tokens_list.append(original_tokens)
+
+        # Number of tokens does not change from now on. Input ids are built once and updated in place.
+        input_ids, mask_poses_list = None, None
+        if self.use_token_ids:
+            input_ids, token_poses_list = self._encode_docs(head_docs, aug_idxes_list)
+            mask_poses_list = [
+                [token_poses[aug_idx] for aug_idx in aug_idxes]
+                for token_poses, aug_idxes in zip(token_poses_list, aug_idxes_list)]
+
+        # Predict all masked words at once
+        self._fill_masks(head_docs, aug_idxes_list, original_tokens_list, token_placeholder,
+            input_ids=input_ids, mask_poses_list=mask_poses_list, original_ids_list=original_ids_list)
+
+        # Re-mask every second word (alternating between passes) and predict them again given the others
+        for step in range(self.refine_steps):
+            self._fill_masks(
+                head_docs,
+                [aug_idxes[step % 2::2] for aug_idxes in aug_idxes_list],
+                [original_tokens[step % 2::2] for original_tokens in original_tokens_list],
+                token_placeholder,
+                input_ids=input_ids,
+                mask_poses_list=None if mask_poses_list is None else [
+                    mask_poses[step % 2::2] for mask_poses in mask_poses_list],
+                original_ids_list=None if original_ids_list is None else [
+                    original_ids[step % 2::2] for original_ids in original_ids_list])
+
+    def _fill_masks(self, head_docs, aug_idxes_list, original_tokens_list, token_placeholder, input_ids=None,
+        mask_poses_list=None, original_ids_list=None):
+        masked_texts = []
+        target_words = []
+        aug_input_poses = []
+        for i, (head_doc, aug_idxes, original_tokens) in enumerate(zip(head_docs, aug_idxes_list, original_tokens_list)):
+            if not aug_idxes:
+                continue
 
-        if isinstance(data, list):
-            return augmented_texts
+            if input_ids is not None:
+                input_ids[i, mask_poses_list[i]] = self.model.mask_id
+            else:
+                for aug_idx in aug_idxes:
+                    head_doc.update_change_log(aug_idx, token=token_placeholder)
+                masked_texts.append(self._to_masked_text(head_doc))
+
+            target_words.append(original_tokens)
+            aug_input_poses.append(i)
+
+        if not aug_input_poses:
+            return
+
+        if input_ids is not None:
+            outputs = self.model.predict_ids(
+                input_ids[aug_input_poses], [mask_poses_list[i] for i in aug_input_poses], target_words=target_words)
         else:
-            return augmented_texts[0]
+            outputs = self.model.predict_masks(masked_texts, target_words=target_words, n=2)
+
+        for aug_input_pos, output in zip(aug_input_poses, outputs):
+            head_doc = head_docs[aug_input_pos]
+            for k, (aug_idx, original_token) in enumerate(
+                    zip(aug_idxes_list[aug_input_pos], original_tokens_list[aug_input_pos])):
+                # Tokenizer may merge mask tokens in rare case. Fallback to original token
+                candidates = output[k] if k < len(output) else []
+                candidates = [c for c in candidates if c != '']
+                candidate = self.sample(candidates, 1)[0] if candidates else original_token
+
+                head_doc.update_change_log(aug_idx, token=candidate)
+                if input_ids is not None:
+                    # Candidate is a vocabulary token (id2token) while original token is restored by its original id
+                    input_ids[aug_input_pos, mask_poses_list[aug_input_pos][k]] = \
+                        self.model.token2id(candidate) if candidates else original_ids_list[aug_input_pos][k]
+
+    def _predict_by_token_ids(self, head_docs, aug_idxes_list, target_words_list=None):
+        input_ids, token_poses_list = self._encode_docs(head_docs, aug_idxes_list)
+        mask_poses_list = [
+            [token_poses[aug_idx] for aug_idx in aug_idxes]
+            for token_poses, aug_idxes in zip(token_poses_list, aug_idxes_list)]
+        for row, mask_poses in enumerate(mask_poses_list):
+            input_ids[row, mask_poses] = self.model.mask_id
+
+        return self.model.predict_ids(input_ids, mask_poses_list, target_words=target_words_list)
+
+    def _encode_docs(self, head_docs, aug_idxes_list):
+        """
+        Convert latest tokens of docs to input ids. Stopword which is substituted back (in place of unknown token) is
+        raw text so it is tokenized again and may take more than one id. Other tokens take one id.
+
+        :param list head_docs: Docs
+        :param list aug_idxes_list: Index of augmented tokens per doc. They are always converted to one id.
+        :return: Input ids and position (in input ids) of each token per doc. Position of removed (empty) token is
+            None.
+        """
+        unknown_token = self.model.get_unknown_token() or self.model.UNKNOWN_TOKEN
+        token_lists, token_poses_list = [], []
+        for head_doc, aug_idxes in zip(head_docs, aug_idxes_list):
+            aug_idxes = set(aug_idxes)
+            tokens, token_poses = [], []
+            for idx in range(head_doc.size()):
+                change_log = head_doc.get_token(idx)
+                token = change_log.get_latest_token().token
+                if len(token) == 0:
+                    token_poses.append(None)
+                    continue
+
+                # Start token is counted
+                token_poses.append(len(tokens) + 1)
+                if self.stopwords and idx not in aug_idxes and change_log.orig_token.token == unknown_token \
+                        and token != unknown_token:
+                    tokens.extend(self._tokenize_reserved_stopword(token, is_first=len(tokens) == 0))
+                else:
+                    tokens.append(token)
+
+            token_lists.append(tokens)
+            token_poses_list.append(token_poses)
+
+        return self.model.encode_tokens(token_lists), token_poses_list
+
+    def _tokenize_reserved_stopword(self, token, is_first=False):
+        # Stopword follows space (or non word character) in original text
+        if self.model_type in ['xlnet', 'roberta', 'bart'] and not is_first:
+            token = ' ' + token
+        return self.model.get_tokenizer().tokenize(token)
+
+    def _remove_subwords(self, head_doc, aug_idx, change_seq):
+        to_remove_idxes = []
+        for k in range(aug_idx+1, head_doc.size()):
+            subword_token = head_doc.get_token(k).orig_token.token
+            if subword_token in string.punctuation:
+                break
+            if self.model_type in ['bert', 'electra'] and self.model.get_subword_prefix() in subword_token:
+                to_remove_idxes.append(k)
+            elif self.model_type in ['xlnet', 'roberta', 'bart'] and self.model.get_subword_prefix() not in subword_token:
+                to_remove_idxes.append(k)
+            else:
+                break
+        for k in reversed(to_remove_idxes):
+            head_doc.add_change_log(k, new_token='', action=Action.SUBSTITUTE,
+                change_seq=self.parent_change_seq+change_seq)
+
+    def _to_masked_text(self, head_doc):
+        # some tokenizers handle special charas (e.g. don't can merge after decode)
+        if self.model_type in ['bert', 'electra']:
+            ids = self.model.get_tokenizer().convert_tokens_to_ids(head_doc.get_augmented_tokens())
+            return self.model.get_tokenizer().decode(ids).strip()
+        return self.model.get_tokenizer().convert_tokens_to_string(head_doc.get_augmented_tokens()).strip()
 
     @classmethod
     def get_model(cls, model_path, model_type, device='cuda', force_reload=False, batch_size=32,
-        top_k=None, silence=True, use_custom_api=False):
+        top_k=None, silence=True, use_custom_api=False, max_tokens=None, backend='torch'):
         return init_context_word_embs_model(model_path, model_type, device, force_reload, batch_size, top_k,
-            silence, use_custom_api)
+            silence, use_custom_api, max_tokens, backend)
 
     def substitute_back_reserved_stopwords(self, doc, reserved_stopword_tokens, change_seq):
         unknown_token = self.model.get_unknown_token() or self.model.UNKNOWN_TOKEN
@@ -7,22 +7,18 @@ import os
 import nlpaug
 import nlpaug.model.word_dict as nmwd
 from nlpaug.augmenter.word import WordAugmenter
-from nlpaug.util import Action, Doc, LibraryUtil
+from nlpaug.util import Action, Doc, LibraryUtil, MODEL_CACHE
 
-SPELLING_ERROR_MODEL = {}
+SPELLING_ERROR_MODEL = MODEL_CACHE.namespace('spelling')
 
 
 def init_spelling_error_model(dict_path, include_reverse, force_reload=False):
     # Load model once at runtime
-    global SPELLING_ERROR_MODEL
-    if SPELLING_ERROR_MODEL and not force_reload:
-        return SPELLING_ERROR_MODEL
-
-    spelling_error_model = nmwd.Spelling(dict_path, include_reverse)
-
-    SPELLING_ERROR_MODEL = spelling_error_model
-
-    return SPELLING_ERROR_MODEL
+    return SPELLING_ERROR_MODEL.get_or_create(
+        (dict_path, include_reverse),
+        factory=lambda: nmwd.Spelling(dict_path, include_reverse),
+        force_reload=force_reload,
+    )
 
 
 class SpellingAug(WordAugmenter):
@@ -5,24 +5,20 @@
 import os
 
 from nlpaug.augmenter.word import WordAugmenter
-from nlpaug.util import Action, Doc, PartOfSpeech, WarningException, WarningName, WarningCode, WarningMessage
+from nlpaug.util import Action, Doc, MODEL_CACHE, get_model_key, PartOfSpeech, WarningException, WarningName, WarningCode, WarningMessage
 import nlpaug.model.word_dict as nmw
 
-PPDB_MODEL = {}
+PPDB_MODEL = MODEL_CACHE.namespace('ppdb')
 
 
 def init_ppdb_model(dict_path, force_reload=False):
     # Load model once at runtime
-    global PPDB_MODEL
-
-    model_name = os.path.basename(dict_path)
-    if model_name in PPDB_MODEL and not force_reload:
-        return PPDB_MODEL[model_name]
-
-    model = nmw.Ppdb(dict_path)
-    PPDB_MODEL[model_name] = model
-
-    return model
+    model_name = get_model_key(dict_path)
+    return PPDB_MODEL.get_or_create(
+        model_name,
+        factory=lambda: nmw.Ppdb(dict_path),
+        force_reload=force_reload,
+    )
 
 
 class SynonymAug(WordAugmenter):
@@ -3,23 +3,19 @@
 """
 
 from nlpaug.augmenter.word import WordAugmenter
-from nlpaug.util import Action, Doc, WarningException, WarningName, WarningCode, WarningMessage
+from nlpaug.util import Action, Doc, MODEL_CACHE, WarningException, WarningName, WarningCode, WarningMessage
 import nlpaug.model.word_stats as nmws
 
-TFIDF_MODEL = {}
+TFIDF_MODEL = MODEL_CACHE.namespace('tfidf')
 
 
 def init_tfidf_model(model_path, force_reload=False):
     # Load model once at runtime
-    global TFIDF_MODEL
-    if TFIDF_MODEL and not force_reload:
-        return TFIDF_MODEL
-
-    tfidf_model = nmws.TfIdf()
-    tfidf_model.read(model_path)
-    TFIDF_MODEL = tfidf_model
-
-    return tfidf_model
+    return TFIDF_MODEL.get_or_create(
+        model_path,
+        factory=lambda: nmws.TfIdf(model_path=model_path),
+        force_reload=force_reload,
+    )
 
 
 class TfIdfAug(WordAugmenter):
@@ -1,4 +1,3 @@
-import string
 import re
 from typing import Iterable
 
@@ -33,9 +32,10 @@ class WordAugmenter(Augmenter):
         return token_idxes
 
     def is_stop_words(self, token):
-        return self.stopwords is not None and token in self.stopwords
+        return self.stopwords is not None and self.get_stopword_matcher().is_stopword(token)
 
     def pre_skip_aug(self, tokens, tuple_idx=None):
+        matcher = self.get_stopword_matcher()
         results = []
         for token_idx, token in enumerate(tokens):
             if tuple_idx is not None:
@@ -43,16 +43,13 @@ class WordAugmenter(Augmenter):
             else:
                 _token = token
             # skip punctuation
-            if _token in string.punctuation:
+            if matcher.is_punctuation(_token):
                 continue
             # skip stopwords by list
             if self.is_stop_words(_token):
                 continue
             # skip stopwords by regex
-            # https://github.com/makcedward/nlpaug/issues/81
-            if self.stopwords_regex is not None and (
-                    self.stopwords_regex.match(_token) or self.stopwords_regex.match(' '+_token+' ') or
-                    self.stopwords_regex.match(' '+_token) or self.stopwords_regex.match(_token+' ')):
+            if matcher.match_regex(_token):
                 continue
 
             results.append(token_idx)
@@ -3,34 +3,49 @@
 """
 
 from nlpaug.augmenter.word import WordAugmenter
-from nlpaug.util import Action, Doc
+from nlpaug.util import Action, Doc, MODEL_CACHE, get_model_key
 import nlpaug.model.word_embs as nmw
 
 
-WORD_EMBS_MODELS = {}
+WORD_EMBS_MODELS = MODEL_CACHE.namespace('word_embs')
 model_types = ['word2vec', 'glove', 'fasttext']
 
 
-def init_word_embs_model(model_path, model_type, force_reload=False, top_k=None, skip_check=False):
-    global WORD_EMBS_MODELS
+def init_word_embs_model(model_path, model_type, force_reload=False, top_k=None, skip_check=False,
+                         index_path=None, neighbour_table_path=None):
+    if model_type not in model_types:
+        raise ValueError('Model type value is unexpected. Expected values include {}'.format(model_types))
+
+    model_name = (get_model_key(model_path), model_type, skip_check)
+    model = WORD_EMBS_MODELS.get_or_create(
+        model_name,
+        factory=lambda: _create_word_embs_model(
+            model_path=model_path, model_type=model_type, top_k=top_k, skip_check=skip_check),
+        force_reload=force_reload,
+        updates={
+            'top_k': top_k,
+        },
+    )
+
+    if index_path is not None and model.index is None:
+        model.init_index(index_path)
+    if neighbour_table_path is not None and model.neighbour_table is None:
+        model.load_neighbour_table(neighbour_table_path)
+    return model
 
-    if model_type in WORD_EMBS_MODELS and not force_reload:
-        WORD_EMBS_MODELS[model_type].top_k = top_k
-        return WORD_EMBS_MODELS[model_type]
 
+def _create_word_embs_model(model_path, model_type, top_k, skip_check):
     if model_type == 'word2vec':
         model = nmw.Word2vec(top_k=top_k, skip_check=skip_check)
-        model.read(model_path)
     elif model_type == 'glove':
         model = nmw.GloVe(top_k=top_k, skip_check=skip_check)
-        model.read(model_path)
     elif model_type == 'fasttext':
         model = nmw.Fasttext(top_k=top_k, skip_check=skip_check)
-        model.read(model_path)
-    else:
-        raise ValueError('Model type value is unexpected. Expected values include {}'.format(model_types))
 
-    WORD_EMBS_MODELS[model_type] = model
+    if nmw.WordEmbeddings.is_snapshot(model_path):
+        model.load_snapshot(model_path)
+    else:
+        model.read(model_path)
     return model
 
 
@@ -41,7 +56,8 @@ class WordEmbsAug(WordAugmenter):
     Augmenter that leverage word embeddings to find top n similar word for augmentation.
 
     :param str model_type: Model type of word embeddings. Expected values include 'word2vec', 'glove' and 'fasttext'.
-    :param str model_path: Downloaded model directory. Either model_path or model is must be provided
+    :param str model_path: Downloaded model directory. Either model_path or model is must be provided. It can be a
+        snapshot directory which is saved by `model.save_snapshot` for faster loading.
     :param obj model: Pre-loaded model (e.g. model class is nlpaug.model.word_embs.nmw.Word2vec(), nlpaug.model.word_embs.nmw.Glove()
         or nlpaug.model.word_embs.nmw.Fasttext())
     :param str action: Either 'insert or 'substitute'. If value is 'insert', a new word will be injected to random
@@ -61,6 +77,12 @@ class WordEmbsAug(WordAugmenter):
     :param func reverse_tokenizer: Customize reverse of tokenization process
     :param bool force_reload: If True, model will be loaded every time while it takes longer time for initialization.
     :param bool skip_check: Default is False. If True, no validation for size of vocabulary embedding.
+    :param str index_path: Directory of approximate nearest neighbour index (e.g. model_path + '.ivf'). If it exists,
+        index is memory-mapped and used for finding similar words. Otherwise, index will be built and saved to this
+        path. Default value is None which means exact (brute-force) search is used.
+    :param str neighbour_table_path: Path of precomputed neighbour table (.npy) which is built by
+        `nmw.WordEmbeddings.build_neighbour_table` offline. Table is memory-mapped and words in table are looked up
+        directly. Other words fall back to index or exact search.
     :param str name: Name of this augmenter
 
     >>> import nlpaug.augmenter.word as naw
@@ -70,7 +92,7 @@ class WordEmbsAug(WordAugmenter):
     def __init__(self, model_type, model_path='.', model=None, action=Action.SUBSTITUTE,
         name='WordEmbs_Aug', aug_min=1, aug_max=10, aug_p=0.3, top_k=100, n_gram_separator='_',
         stopwords=None, tokenizer=None, reverse_tokenizer=None, force_reload=False, stopwords_regex=None,
-        verbose=0, skip_check=False):
+        verbose=0, skip_check=False, index_path=None, neighbour_table_path=None):
         super().__init__(
             action=action, name=name, aug_p=aug_p, aug_min=aug_min, aug_max=aug_max, stopwords=stopwords,
             tokenizer=tokenizer, reverse_tokenizer=reverse_tokenizer, device='cpu', verbose=verbose,
@@ -86,7 +108,8 @@ class WordEmbsAug(WordAugmenter):
 
         if model is None:
             self.model = self.get_model(model_path=model_path, model_type=model_type, force_reload=force_reload,
-                                        top_k=self.top_k, skip_check=skip_check)
+                                        top_k=self.top_k, skip_check=skip_check, index_path=index_path,
+                                        neighbour_table_path=neighbour_table_path)
         else:
             self.model = model
 
@@ -95,19 +118,15 @@ class WordEmbsAug(WordAugmenter):
             raise ValueError('Model type value is unexpected. Expected values include {}'.format(model_types))
 
     @classmethod
-    def get_model(cls, model_path, model_type, force_reload=False, top_k=100, skip_check=False):
-        return init_word_embs_model(model_path, model_type, force_reload, top_k=top_k, skip_check=skip_check)
+    def get_model(cls, model_path, model_type, force_reload=False, top_k=100, skip_check=False, index_path=None,
+                  neighbour_table_path=None):
+        return init_word_embs_model(model_path, model_type, force_reload, top_k=top_k, skip_check=skip_check,
+                                    index_path=index_path, neighbour_table_path=neighbour_table_path)
 
     def skip_aug(self, token_idxes, tokens):
-        results = []
-        for token_idx in token_idxes:
-            # Some words do not come with vector. It will be excluded in lucky draw.
-            word = tokens[token_idx]
-
-            if word in self.model.get_vocab():
-                results.append(token_idx)
-
-        return results
+        # Some words do not come with vector. It will be excluded in lucky draw.
+        is_in_vocab = self.model.contains_many([tokens[token_idx] for token_idx in token_idxes])
+        return [token_idx for token_idx, in_vocab in zip(token_idxes, is_in_vocab) if in_vocab]
 
     def insert(self, data):
         if not data or not data.strip():
@@ -1,10 +1,37 @@
+import itertools
 import math
+import os
+import pickle
 import random
+import weakref
 import numpy as np
 import pandas as pd
+from multiprocessing import Pool as ProcessPool
 from multiprocessing.dummy import Pool as ThreadPool
 
 from nlpaug.util import Action, Method, WarningException, WarningName, WarningCode, WarningMessage
+from nlpaug.util.text.tokenizer import Tokenizer
+from nlpaug.util.text.stopword_matcher import get_stopword_matcher
+
+
+# Action handler owned by the current worker process. It is set once per worker by `_init_process_worker` so that
+# the augmenter is pickled once per pool rather than once per input.
+_WORKER_ACTION_FX = None
+
+
+def _init_process_worker(augmenter, action_name):
+    global _WORKER_ACTION_FX
+    # Handler is rebuilt from pickled augmenter so that pool does not refer to the augmenter in parent process
+    _WORKER_ACTION_FX = getattr(pickle.loads(augmenter), action_name)
+
+    # Forked workers inherit the parent random state. Reseed it so that workers do not generate identical outputs.
+    seed = int.from_bytes(os.urandom(4), 'little')
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def _process_worker_augment(data):
+    return _WORKER_ACTION_FX(data)
 
 
 class Augmenter:
@@ -23,6 +50,9 @@ class Augmenter:
         'ContextualWordEmbsAug',
         'ContextualWordEmbsForSentenceAug',
     }
+    # Model-backed augmenters which return n outputs of single input by one call
+    MULTI_SAMPLE_AUGMENTERS = {'AbstSummAug', 'BackTranslationAug'}
+    EXECUTORS = {'thread', 'process'}
 
     def __init__(self, name, method, action, aug_min, aug_max, aug_p=0.1, device='cpu', 
         include_detail=False, verbose=0):
@@ -39,6 +69,12 @@ class Augmenter:
 
         self.parent_change_seq = 0
 
+        # Worker pool is created lazily by `get_pool` and reused across `augment` calls
+        self._pool = None
+        self._pool_key = None
+        self._pool_finalizer = None
+        self._owns_pool = True
+
         self._validate_augmenter(method, action)
 
     @classmethod
@@ -51,7 +87,7 @@ class Augmenter:
             raise ValueError(
                 'Action must be one of {} while {} is passed'.format(Action.getall(), action))
 
-    def augment(self, data, n=1, num_thread=1):
+    def augment(self, data, n=1, num_thread=1, executor='thread', chunksize=1):
         """
         :param object/list data: Data for augmentation. It can be list of data (e.g. list 
             of string or numpy) or single element (e.g. string or numpy). Numpy format only
@@ -59,13 +95,24 @@ class Augmenter:
             list of string.
         :param int n: Default is 1. Number of unique augmented output. Will be force to 1 
             if input is list of data
-        :param int num_thread: Number of thread for data augmentation. Use this option 
-            when you are using CPU and n is larger than 1
-        :return: Augmented data
+        :param int num_thread: Number of thread (or process) for data augmentation. Use this option 
+            when you are using CPU and n is larger than 1. Worker pool is kept and reused by next augment call.
+            Call `close()` (or use augmenter as context manager) to release it.
+        :param str executor: Either 'thread' or 'process'. Pure python augmenters (e.g. RandomCharAug, KeyboardAug)
+            are bound by GIL so 'process' is recommended for them. Augmenter is pickled once per pool.
+            Not effective for model-backed augmenters which already process data in batch.
+        :param int chunksize: Number of inputs sent to a worker process at once. Only effective when executor is
+            'process'.
+        :return: Augmented data (Follows original order)
 
         >>> augmented_data = aug.augment(data)
+        >>> augmented_data = aug.augment(data, num_thread=4, executor='process', chunksize=64)
 
         """
+        if executor not in self.EXECUTORS:
+            raise ValueError(
+                'Executor must be one of {} while {} is passed'.format(self.EXECUTORS, executor))
+
         max_retry_times = 3  # max loop times of n to generate expected number of outputs
         aug_num = 1 if isinstance(data, list) else n
         expected_output_num = len(data) if isinstance(data, list) else aug_num
@@ -89,7 +136,10 @@ class Augmenter:
 
         clean_data = self.clean(data)
         action_fx = self._get_action_handler()
+        batch_action_fx = self._get_batch_action_handler()
 
+        # Unique outputs of sampling augmenter are accumulated across retries
+        sampled_results = []
         for _ in range(max_retry_times+1):
             augmented_results = []
             augmenter_name = self.__class__.__name__
@@ -97,6 +147,12 @@ class Augmenter:
             # By design, it is one-to-many
             if augmenter_name in self.ONE_TO_MANY_AUGMENTERS:
                 augmented_results = action_fx(clean_data, n=n)
+            # PyTorch's augmenter which samples n outputs at once
+            elif augmenter_name in self.MULTI_SAMPLE_AUGMENTERS and aug_num > 1:
+                for result in action_fx(clean_data, n=aug_num):
+                    if result not in sampled_results:
+                        sampled_results.append(result)
+                augmented_results = list(sampled_results)
             # PyTorch's augmenter
             elif augmenter_name in self.MODEL_BATCH_AUGMENTERS:
                 for _ in range(aug_num):
@@ -107,29 +163,31 @@ class Augmenter:
                         augmented_results.append(result)
             # Multi inputs
             elif isinstance(data, list):
+                # Vectorized over whole batch
+                if num_thread == 1 and batch_action_fx is not None:
+                    augmented_results = batch_action_fx(clean_data)
                 # Single Thread
-                if num_thread == 1:
+                elif num_thread == 1:
                     augmented_results = [action_fx(d) for d in clean_data]
 
-                # Multi Thread
+                # Multi Thread/ Process
                 else:
-                    batch_data = [clean_data[i:i+num_thread] for i in range(0, len(clean_data), num_thread)]
-                    for mini_batch_data in batch_data:
-                        threaded_results = self._parallel_augments(
-                            lambda item: action_fx(item),
-                            mini_batch_data,
-                        )
-                        augmented_results.extend(threaded_results)
+                    augmented_results = self._parallel_augment(
+                        action_fx, clean_data, num_thread=num_thread, executor=executor, chunksize=chunksize)
 
             # Single input with/without multiple input
             else:
+                # Vectorized over whole batch
+                if num_thread == 1 and batch_action_fx is not None and n > 1:
+                    augmented_results = batch_action_fx([clean_data] * n)
                 # Single Thread
-                if num_thread == 1:
+                elif num_thread == 1:
                     augmented_results = [action_fx(clean_data) for _ in range(n)]
 
-                # Multi Thread
+                # Multi Thread/ Process
                 else:
-                    augmented_results = self._parallel_augment(action_fx, clean_data, n=n, num_thread=num_thread)
+                    augmented_results = self._parallel_augment(
+                        action_fx, [clean_data] * n, num_thread=num_thread, executor=executor, chunksize=chunksize)
 
             if len(augmented_results) >= expected_output_num:
                 break
@@ -152,6 +210,48 @@ class Augmenter:
 
         # return augmented_results
 
+    def augment_iter(self, data, batch_size=32, n=1, num_thread=1, executor='thread', chunksize=1):
+        """
+        Augment data lazily. Inputs are pulled from iterable batch by batch so that memory usage is bounded by
+        batch_size instead of size of input.
+
+        :param iterable data: Iterable of data (e.g. generator of string or opened file).
+        :param int batch_size: Number of inputs augmented at once. Model-backed augmenters (e.g.
+            ContextualWordEmbsAug) receive whole batch in one call.
+        :param int n: Default is 1. Number of augmented output per input. If it is larger than 1, list of n
+            augmented data is yielded per input.
+        :param int num_thread: Number of thread (or process) for data augmentation.
+        :param str executor: Either 'thread' or 'process'.
+        :param int chunksize: Number of inputs sent to a worker process at once. Only effective when executor is
+            'process'.
+        :return: Generator of augmented data. One result per input and it follows input order.
+
+        >>> with open('corpus.txt') as f:
+        >>>     for augmented_text in aug.augment_iter((line.strip() for line in f), batch_size=64):
+        >>>         print(augmented_text)
+        """
+        if batch_size < 1:
+            raise ValueError('batch_size must be larger than 0 while {} is passed'.format(batch_size))
+
+        iterator = iter(data)
+        while True:
+            batch_data = list(itertools.islice(iterator, batch_size))
+            if len(batch_data) == 0:
+                return
+
+            if n == 1:
+                yield from self._augment_batch(
+                    batch_data, num_thread=num_thread, executor=executor, chunksize=chunksize)
+            else:
+                rounds = [self._augment_batch(
+                    batch_data, num_thread=num_thread, executor=executor, chunksize=chunksize) for _ in range(n)]
+                for augmented_results in zip(*rounds):
+                    yield list(augmented_results)
+
+    def _augment_batch(self, data, num_thread=1, executor='thread', chunksize=1):
+        # One augmented result per input
+        return self.augment(data, num_thread=num_thread, executor=executor, chunksize=chunksize)
+
     # def augments(self, data, num_thread=1):
     #     """
     #     :param list data: List of data
@@ -187,21 +287,100 @@ class Augmenter:
 
         return []
 
-    @classmethod
-    def _parallel_augment(cls, action_fx, data, n, num_thread=2):
-        if n <= 1:
-            return [action_fx(data)]
+    def set_pool(self, pool):
+        """
+        :param object pool: Externally managed worker pool (e.g. `multiprocessing.Pool` or
+            `multiprocessing.dummy.Pool`). It will be used by `augment` whatever `executor` is passed. Caller is
+            responsible for closing it.
 
-        with ThreadPool(num_thread) as pool:
-            return pool.map(action_fx, [data] * n)
+        >>> from multiprocessing.dummy import Pool
+        >>> aug.set_pool(Pool(4))
+        """
+        self.close()
+        self._pool = pool
+        self._pool_key = None
+        self._owns_pool = False
 
-    @classmethod
-    def _parallel_augments(cls, action_fx, data):
-        if len(data) <= 1:
-            return [action_fx(data[0])] if data else []
+    def get_pool(self, num_thread, executor='thread', action_fx=None):
+        """
+        Return worker pool of this augmenter. Pool is created lazily and reused across `augment` calls until
+        `close` is called or another number of workers (or executor) is requested.
+
+        :param int num_thread: Number of workers
+        :param str executor: Either 'thread' or 'process'.
+        :param func action_fx: Function which will be executed in worker process. Only effective when executor is
+            'process'. It should be a method of this augmenter. Augmenter is pickled once at pool creation so later
+            changes of augmenter attributes are not visible to existing workers.
+        :return: Worker pool
+        """
+        if self._pool is not None and not self._owns_pool:
+            return self._pool
+
+        action_name = action_fx.__name__ if action_fx is not None else None
+        pool_key = (executor, num_thread, action_name)
+        if self._pool is not None and self._pool_key == pool_key:
+            return self._pool
+
+        self.close()
+        if executor == 'process':
+            # Pool (and its finalizer) must not refer to this augmenter. Otherwise, the augmenter is never garbage
+            # collected and the finalizer never terminates workers.
+            pool = ProcessPool(
+                num_thread, initializer=_init_process_worker, initargs=(pickle.dumps(self), action_name))
+        else:
+            pool = ThreadPool(num_thread)
+
+        self._pool = pool
+        self._pool_key = pool_key
+        self._owns_pool = True
+        # Release workers even if close() is never called
+        self._pool_finalizer = weakref.finalize(self, pool.terminate)
+        return pool
+
+    def close(self):
+        """
+        Release worker pool owned by this augmenter. Injected pool (via `set_pool`) will not be closed.
 
-        with ThreadPool(len(data)) as pool:
-            return pool.map(action_fx, data)
+        >>> with naw.RandomWordAug() as aug:
+        >>>     augmented_data = aug.augment(data, num_thread=4)
+        """
+        if self._pool is not None and self._owns_pool:
+            self._pool_finalizer.detach()
+            self._pool.close()
+            self._pool.join()
+        self._pool = None
+        self._pool_key = None
+        self._pool_finalizer = None
+        self._owns_pool = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        # Worker pool cannot be pickled. Worker process does not need it.
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        state['_pool_key'] = None
+        state['_pool_finalizer'] = None
+        state['_owns_pool'] = True
+        return state
+
+    def _parallel_augment(self, action_fx, data, num_thread=2, executor='thread', chunksize=1):
+        if len(data) <= 1:
+            return [action_fx(d) for d in data]
+
+        pool = self.get_pool(num_thread, executor=executor, action_fx=action_fx)
+        chunksize = max(1, chunksize)
+        # All inputs are submitted in one pass. imap keeps original order while idle workers pick up next chunk.
+        if self._owns_pool and executor == 'process':
+            return list(pool.imap(_process_worker_augment, data, chunksize=chunksize))
+        if hasattr(pool, 'imap'):
+            return list(pool.imap(action_fx, data, chunksize=chunksize))
+        # e.g. concurrent.futures.Executor
+        return list(pool.map(action_fx, data))
 
     def _get_action_handler(self):
         method_name = self.ACTION_METHOD_NAMES.get(self.action)
@@ -209,6 +388,42 @@ class Augmenter:
             raise ValueError('Unsupported action {}'.format(self.action))
         return getattr(self, method_name)
 
+    def _get_batch_action_handler(self):
+        """
+        :return: Function which augments list of inputs at once. None if action is applied per input.
+        """
+        return None
+
+    def get_stopword_matcher(self):
+        """
+        :return: StopwordMatcher of stopwords and stopwords_regex. It is looked up again if either of them is replaced
+            (e.g. `aug.stopwords = [...]`). Modifying stopwords in place is not detected.
+        """
+        stopwords, stopwords_regex = getattr(self, 'stopwords', None), getattr(self, 'stopwords_regex', None)
+        source = getattr(self, '_stopword_matcher_source', None)
+        if source is None or source[0] is not stopwords or source[1] is not stopwords_regex:
+            self._stopword_matcher = get_stopword_matcher(stopwords=stopwords, stopwords_regex=stopwords_regex)
+            self._stopword_matcher_source = (stopwords, stopwords_regex)
+        return self._stopword_matcher
+
+    def tokenize_batch(self, texts):
+        """
+        :param list texts: Texts
+        :return: Tokens of each text. Default tokenizer processes whole batch at once.
+        """
+        if self.tokenizer is Tokenizer.tokenizer:
+            return Tokenizer.tokenize_batch(texts)
+        return [self.tokenizer(text) for text in texts]
+
+    def detokenize_batch(self, tokens_list):
+        """
+        :param list tokens_list: Tokens of each text
+        :return: Texts. Default reverse tokenizer processes whole batch at once.
+        """
+        if self.reverse_tokenizer is Tokenizer.reverse_tokenizer:
+            return Tokenizer.detokenize_batch(tokens_list)
+        return [self.reverse_tokenizer(tokens) for tokens in tokens_list]
+
     def insert(self, data):
         raise NotImplementedError
 
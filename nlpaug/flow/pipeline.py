@@ -1,3 +1,5 @@
+import numpy as np
+
 from nlpaug import Augmenter
 from nlpaug.augmenter.char import CharAugmenter
 from nlpaug.util import Method
@@ -25,6 +27,18 @@ class Pipeline(Augmenter, list):
     def draw(self):
         raise NotImplementedError
 
+    def draw_batch(self, size):
+        """
+        :param int size: Number of inputs
+        :return: Boolean array. True means augmenter will be applied to corresponding input.
+        """
+        return np.array([self.draw() for _ in range(size)], dtype=bool)
+
+    def close(self):
+        Augmenter.close(self)
+        for aug in self:
+            aug.close()
+
     def get_is_duplicate_fx(self):
         # Assume all augmenters share same is_duplicate function.
         for aug in self:
@@ -37,16 +51,31 @@ class Pipeline(Augmenter, list):
 
         return None
 
-    def augment(self, data, n=1, num_thread=1):
+    def augment(self, data, n=1, num_thread=1, executor='thread', chunksize=1, batch_mode=False):
         """
         :param data: Data for augmentation
         :param int n: Number of augmented output
-        :param int num_thread: Number of thread for data augmentation. Use this option when you are using CPU and
-            n is larger than 1
+        :param int num_thread: Number of thread (or process) for data augmentation. Use this option when you are
+            using CPU and n is larger than 1
+        :param str executor: Either 'thread' or 'process'. Flow is pickled once per pool if 'process' is
+            passed.
+        :param int chunksize: Number of inputs sent to a worker process at once. Only effective when executor is
+            'process'.
+        :param bool batch_mode: If True, all inputs (inputs x n) are sent through each augmenter in one call so that
+            model-backed augmenters (e.g. ContextualWordEmbsAug) receive whole batch. Data can be a list of data. In
+            this case, one result per input is returned (or list of n results per input if n is larger than 1).
+            Change logs are not returned.
         :return: Augmented data
 
         >>> augmented_data = flow.augment(data)
+        >>> augmented_data = flow.augment([data1, data2], n=3, batch_mode=True)
         """
+        if executor not in self.EXECUTORS:
+            raise ValueError(
+                'Executor must be one of {} while {} is passed'.format(self.EXECUTORS, executor))
+
+        if batch_mode:
+            return self._augment_in_batch(data, n=n, num_thread=num_thread, executor=executor, chunksize=chunksize)
 
         max_retry_times = 3  # max loop times of n to generate expected number of outputs
         results = []
@@ -58,8 +87,9 @@ class Pipeline(Augmenter, list):
                 augmented_results = [self._augment(data) for _ in range(n)]
             else:
                 if self.device == 'cpu':
-                    augmented_results = self._parallel_augment(self._augment, data, n=n, num_thread=num_thread)
-                    
+                    augmented_results = self._parallel_augment(
+                        self._augment, [data] * n, num_thread=num_thread, executor=executor, chunksize=chunksize)
+
                 # TODO: Externalize to util for checking
                 elif 'cuda' in self.device:
                     # TODO: support multiprocessing for GPU
@@ -85,6 +115,57 @@ class Pipeline(Augmenter, list):
             return [data]
         return results[:n]
 
+    def _augment_in_batch(self, data, n=1, num_thread=1, executor='thread', chunksize=1):
+        max_retry_times = 3  # max loop times of n to generate expected number of outputs
+        if data is None or len(data) == 0:
+            return []
+
+        inputs = data if isinstance(data, list) else [data]
+        is_duplicate_fx = self.get_is_duplicate_fx()
+        results = [[] for _ in inputs]
+
+        for _ in range(max_retry_times+1):
+            # Repeat each input for number of missing outputs (inputs x n in first round)
+            expanded_idxes = [i for i, r in enumerate(results) for _ in range(n - len(r))]
+            if len(expanded_idxes) == 0:
+                break
+
+            augmented_results = self._augment_batch(
+                [inputs[i] for i in expanded_idxes], num_thread=num_thread, executor=executor, chunksize=chunksize)
+            for i, augmented_result in zip(expanded_idxes, augmented_results):
+                if is_duplicate_fx is not None and is_duplicate_fx(results[i] + [inputs[i]], augmented_result):
+                    continue
+                results[i].append(augmented_result)
+
+        # if not result, return itself
+        results = [r if len(r) > 0 else [d] for r, d in zip(results, inputs)]
+
+        if not isinstance(data, list):
+            return results[0]
+        if n == 1:
+            return [r[0] for r in results]
+        return results
+
+    def _augment_batch(self, data, num_thread=1, executor='thread', chunksize=1):
+        # Each augmenter receives all inputs (which are drawn) in one call. Change logs are not returned.
+        augmented_data = list(data)
+
+        for aug in self:
+            aug_idxes = np.flatnonzero(self.draw_batch(len(augmented_data))).tolist()
+            if len(aug_idxes) == 0:
+                continue
+
+            augmented_results = aug._augment_batch(
+                [augmented_data[i] for i in aug_idxes], num_thread=num_thread, executor=executor,
+                chunksize=chunksize)
+            for i, augmented_result in zip(aug_idxes, augmented_results):
+                # (augmented_data, change_log)
+                if isinstance(augmented_result, tuple):
+                    augmented_result = augmented_result[0]
+                augmented_data[i] = augmented_result
+
+        return augmented_data
+
     def _augment(self, data, n=1, num_thread=1):
         results = []
         augmented_data = data[:]
@@ -2,6 +2,8 @@
     Flow that apply augmentation sequentially.
 """
 
+import numpy as np
+
 from nlpaug.util import Action
 from nlpaug.flow import Pipeline
 
@@ -25,3 +27,6 @@ class Sequential(Pipeline):
 
     def draw(self):
         return True
+
+    def draw_batch(self, size):
+        return np.ones(size, dtype=bool)
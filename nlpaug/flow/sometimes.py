@@ -2,6 +2,8 @@
     Flow that apply augmentation randomly.
 """
 
+import numpy as np
+
 from nlpaug.util import Action
 from nlpaug.flow import Pipeline
 
@@ -26,3 +28,7 @@ class Sometimes(Pipeline):
 
     def draw(self):
         return self.aug_p > self.prob()
+
+    def draw_batch(self, size):
+        # One draw for all inputs. Only selected inputs are sent to augmenter.
+        return self.aug_p > np.random.random(size)
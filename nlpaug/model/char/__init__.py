@@ -1,4 +1,5 @@
 from __future__ import absolute_import
+from nlpaug.model.char.mapping_table import *
 from nlpaug.model.char.char import *
 from nlpaug.model.char.keyboard import *
 from nlpaug.model.char.ocr import *
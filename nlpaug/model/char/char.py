@@ -1,3 +1,57 @@
+import os
+
+from nlpaug.model.char.mapping_table import MappingTable
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict. Mapping of character model is shared by augmenters (see LOOKUP_CACHE) so that it should not be
+    modified in place.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('{} is read-only'.format(self.__class__.__name__))
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return self.__class__, (dict(self), )
+
+
 class Character:
+    SNAPSHOT_FILE_EXTENSION = '.npz'
+
     def __init__(self, cache=True):
         self.cache = cache
+        self._mapping_table = None
+
+    def get_mapping_table(self):
+        """
+        :return: MappingTable of this model. It is built once and reused.
+        """
+        if self._mapping_table is None:
+            self._mapping_table = MappingTable(mapping=self.model)
+        return self._mapping_table
+
+    @classmethod
+    def is_snapshot(cls, snapshot_path):
+        return isinstance(snapshot_path, str) and snapshot_path.endswith(cls.SNAPSHOT_FILE_EXTENSION) and \
+            os.path.isfile(snapshot_path)
+
+    def save_snapshot(self, snapshot_path):
+        """
+        :param str snapshot_path: Path of .npz file. Compiled mapping is saved so that it can be loaded without parsing
+            and filtering original json file.
+
+        >>> model.save_snapshot('keyboard_en.npz')
+        """
+        self.get_mapping_table().save(snapshot_path)
+
+    def load_snapshot(self, snapshot_path):
+        """
+        :param str snapshot_path: Path of .npz file which is saved by `save_snapshot`.
+
+        >>> model.load_snapshot('keyboard_en.npz')
+        """
+        self._mapping_table = MappingTable.load(snapshot_path)
+        self.model = FrozenDict(self._mapping_table.to_mapping())
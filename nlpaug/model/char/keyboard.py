@@ -2,7 +2,10 @@ import re
 import os
 import json
 
-from nlpaug.model.char import Character
+from nlpaug.model.char import Character, FrozenDict
+
+NUMERIC_REGEX = re.compile("^[0-9]*$")
+ALPHANUMERIC_REGEX = re.compile("^[a-z0-9]*$")
 
 
 class Keyboard(Character):
@@ -14,8 +17,12 @@ class Keyboard(Character):
         self.upper_case = upper_case
         self.lang = lang
         self.model_path = model_path
-        self.model = self.get_model(model_path=model_path, special_char=special_char, numeric=numeric, 
-            upper_case=upper_case, lang=lang)
+        # Snapshot is compiled mapping which is filtered already
+        if self.is_snapshot(model_path):
+            self.load_snapshot(model_path)
+        else:
+            self.model = FrozenDict(self.get_model(model_path=model_path, special_char=special_char,
+                numeric=numeric, upper_case=upper_case, lang=lang))
 
     def predict(self, data):
         return self.model[data]
@@ -33,10 +40,10 @@ class Keyboard(Character):
 
         for key, values in mapping.items():
             # Skip records if key is numeric while include_numeric is false
-            if not numeric and re.match("^[0-9]*$", key):
+            if not numeric and NUMERIC_REGEX.match(key):
                 continue
             # skip record if key is special character while include_spec is false
-            if not special_char and not re.match("^[a-z0-9]*$", key):
+            if not special_char and not ALPHANUMERIC_REGEX.match(key):
                 continue
 
             result[key] = []
@@ -44,11 +51,11 @@ class Keyboard(Character):
 
             for value in values:
                 # Skip record if value is numeric while include_numeric is false
-                if not numeric and re.match("^[0-9]*$", value):
+                if not numeric and NUMERIC_REGEX.match(value):
                     continue
 
                 # skip record if value is special character while include_spec is false
-                if not special_char and not re.match("^[a-z0-9]*$", value):
+                if not special_char and not ALPHANUMERIC_REGEX.match(value):
                     continue
 
                 result[key].append(value)
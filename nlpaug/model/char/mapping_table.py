@@ -0,0 +1,122 @@
+import numpy as np
+
+
+class MappingTable:
+    """
+    Array-backed character mapping. Candidates of each character are stored as a row of padded index matrix so that
+    candidates of many characters can be looked up and drawn by NumPy at once.
+
+    :param dict mapping: Candidates (list of string) per character. Key which is not single character is ignored.
+    :param list candidates: Candidates (list of string) which are shared by every character. It is used when mapping
+        is None (e.g. random alphabets).
+
+    >>> from nlpaug.model.char import MappingTable
+    >>> table = MappingTable(mapping={'a': ['s', 'q'], 'o': ['0']})
+    """
+
+    def __init__(self, mapping=None, candidates=None):
+        self.values = []
+        value_idxes = {}
+
+        def _value_idx(value):
+            if value not in value_idxes:
+                value_idxes[value] = len(self.values)
+                self.values.append(value)
+            return value_idxes[value]
+
+        self.shared = mapping is None
+        if self.shared:
+            keys = []
+            rows = [[_value_idx(v) for v in candidates or []]]
+        else:
+            keys = sorted(k for k, values in mapping.items() if len(k) == 1 and len(values) > 0)
+            # Duplicated candidates are kept so that drawing probability is same as sampling from the list
+            rows = [[_value_idx(v) for v in mapping[k]] for k in keys]
+
+        self.keys = np.array([ord(k) for k in keys], dtype=np.int64)
+        self.counts = np.array([len(row) for row in rows], dtype=np.int64)
+        self.candidates = np.full((len(rows), max(self.counts, default=0)), -1, dtype=np.int64)
+        for i, row in enumerate(rows):
+            self.candidates[i, :len(row)] = row
+
+        # Candidate may have more than one character. All of them are stored as a flat code point array.
+        encoded_values = [self.encode(v) for v in self.values]
+        self.value_lens = np.array([len(v) for v in encoded_values], dtype=np.int64)
+        self.value_offsets = np.cumsum(self.value_lens) - self.value_lens
+        self.value_codepoints = np.concatenate(encoded_values) if encoded_values else np.array([], dtype=np.uint32)
+
+    # Arrays which are saved to (and loaded from) .npz file
+    ARRAY_NAMES = ['keys', 'counts', 'candidates', 'value_lens', 'value_codepoints']
+
+    def save(self, path):
+        """
+        :param str path: Path of .npz file. Table can be loaded without parsing original mapping file.
+
+        >>> table.save('keyboard_en.npz')
+        """
+        np.savez(path, shared=np.array(self.shared), **{name: getattr(self, name) for name in self.ARRAY_NAMES})
+
+    @classmethod
+    def load(cls, path):
+        """
+        :param str path: Path of .npz file which is saved by `save`.
+
+        >>> table = MappingTable.load('keyboard_en.npz')
+        """
+        table = cls.__new__(cls)
+        with np.load(path, allow_pickle=False) as arrays:
+            table.shared = bool(arrays['shared'])
+            for name in cls.ARRAY_NAMES:
+                setattr(table, name, arrays[name])
+        table.value_offsets = np.cumsum(table.value_lens) - table.value_lens
+        table.values = [
+            cls.decode(table.value_codepoints[start:start+length])
+            for start, length in zip(table.value_offsets.tolist(), table.value_lens.tolist())]
+        return table
+
+    def to_mapping(self):
+        """
+        :return: dict Candidates (list of string) per character. It is same as input mapping except keys which are not
+            single character.
+        """
+        return {
+            chr(key): [self.values[i] for i in self.candidates[row, :count]]
+            for row, (key, count) in enumerate(zip(self.keys.tolist(), self.counts.tolist()))}
+
+    @classmethod
+    def encode(cls, text):
+        """
+        :param str text: Input text
+        :return: numpy Code point of each character
+        """
+        return np.frombuffer(text.encode('utf-32-le', errors='surrogatepass'), dtype=np.uint32)
+
+    @classmethod
+    def decode(cls, codepoints):
+        """
+        :param numpy codepoints: Code points
+        :return: str Text
+        """
+        return codepoints.astype('<u4').tobytes().decode('utf-32-le', errors='surrogatepass')
+
+    def lookup(self, codepoints):
+        """
+        :param numpy codepoints: Code point of characters
+        :return: numpy Row of each character. -1 is returned if character does not have any candidate.
+        """
+        if self.shared:
+            return np.full(len(codepoints), 0 if self.counts[0] > 0 else -1, dtype=np.int64)
+        if len(self.keys) == 0:
+            return np.full(len(codepoints), -1, dtype=np.int64)
+
+        rows = np.minimum(np.searchsorted(self.keys, codepoints), len(self.keys) - 1)
+        return np.where(self.keys[rows] == codepoints, rows, -1)
+
+    def sample(self, rows, rng=None):
+        """
+        :param numpy rows: Row of each character (output of lookup). All of them should have candidates.
+        :param numpy.random.Generator rng: Random generator. np.random is used if it is None.
+        :return: numpy Index (of values) of one candidate per row. Candidates are drawn uniformly.
+        """
+        cols = ((np.random if rng is None else rng).random(len(rows)) * self.counts[rows]).astype(np.int64)
+        return self.candidates[rows, cols]
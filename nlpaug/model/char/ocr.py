@@ -1,13 +1,13 @@
 import os
 
-from nlpaug.model.char import Character
+from nlpaug.model.char import Character, FrozenDict
 
 
 class Ocr(Character):
     def __init__(self, model, cache=True):
         super().__init__(cache)
 
-        self.model = self.generate_mapping(model)
+        self.model = FrozenDict(self.generate_mapping(model))
 
     def generate_mapping(self, mapping):
         result = {}
@@ -1,5 +1,6 @@
 from __future__ import absolute_import
 from nlpaug.model.lang_models.language_models import *
+from nlpaug.model.lang_models.inference_backend import *
 from nlpaug.model.lang_models.bert import *
 from nlpaug.model.lang_models.xlnet import *
 from nlpaug.model.lang_models.gpt2 import *
@@ -6,6 +6,7 @@ except ImportError:
     pass
 
 from nlpaug.model.lang_models import LanguageModels
+from nlpaug.model.lang_models.inference_backend import load_masked_lm
 from nlpaug.util.selection.filtering import *
 
 
@@ -19,10 +20,11 @@ class Bert(LanguageModels):
     SUBWORD_PREFIX = '##'
 
     def __init__(self, model_path='bert-base-uncased', temperature=1.0, top_k=None, top_p=None, batch_size=32, 
-        device='cuda', silence=True):
-        super().__init__(device, temperature=temperature, top_k=top_k, top_p=top_p, batch_size=batch_size, silence=silence)
+        device='cuda', silence=True, max_tokens=None, backend='torch', backend_dir=None):
+        super().__init__(device, temperature=temperature, top_k=top_k, top_p=top_p, batch_size=batch_size, silence=silence,
+            max_tokens=max_tokens)
         try:
-            from transformers import AutoModelForMaskedLM, AutoTokenizer
+            from transformers import AutoConfig, AutoModelForMaskedLM, AutoTokenizer
         except ModuleNotFoundError:
             raise ModuleNotFoundError('Missed transformers library. Install transfomers by `pip install transformers`')
 
@@ -31,13 +33,16 @@ class Bert(LanguageModels):
         self.tokenizer = AutoTokenizer.from_pretrained(model_path)
         self.mask_id = self.token2id(self.MASK_TOKEN)
         self.pad_id = self.token2id(self.PAD_TOKEN)
-        self.model = self._load_with_optional_silence(
-            lambda: AutoModelForMaskedLM.from_pretrained(model_path),
-            silence=silence,
-        )
-
-        self.model.to(self.device)
-        self.model.eval()
+        self.backend = backend
+        self.model = load_masked_lm(
+            model_path,
+            lambda: self._load_with_optional_silence(
+                lambda: AutoModelForMaskedLM.from_pretrained(model_path),
+                silence=silence,
+            ),
+            backend=backend, backend_dir=backend_dir, device=self.device,
+            # Architecture only. Weights are loaded from cached quantized model.
+            skeleton_loader=lambda: AutoModelForMaskedLM.from_config(AutoConfig.from_pretrained(model_path)))
 
     def get_max_num_token(self):
         return self.model.config.max_position_embeddings - 2 * 5
@@ -58,36 +63,7 @@ class Bert(LanguageModels):
         return self.MASK_TOKEN
 
     def predict(self, texts, target_words=None, n=1):
-        results = []
-        # Prepare inputs
-        for start in range(0, len(texts), self.batch_size):
-            batch_texts = texts[start:start+self.batch_size]
-            batch_target_words = (
-                target_words[start:start+self.batch_size] if target_words is not None
-                else [None] * len(batch_texts)
-            )
-            encoded = self._encode_batch(batch_texts, padding=True, truncation=False, return_tensors='pt')
-            target_poses = []
-            for tokens in encoded['input_ids'].tolist():
-                target_poses.append(tokens.index(self.mask_id))
-            batch = self._batch_to_device(encoded)
-
-            # Prediction
-            with torch.no_grad():
-                outputs = self.model(**batch)
-            logits = self._model_logits(outputs)
-
-            # Selection
-            for output, target_pos, target_token in zip(logits, target_poses, batch_target_words):
-                target_token_logits = output[target_pos]
-                
-                seed = {'temperature': self.temperature, 'top_k': self.top_k, 'top_p': self.top_p}
-                target_token_logits = self.control_randomness(target_token_logits, seed)
-                target_token_logits, target_token_idxes = self.filtering(target_token_logits, seed)
-                if len(target_token_idxes) != 0:
-                    new_tokens = self.pick(target_token_logits, target_token_idxes, target_word=target_token, n=10)
-                    results.append([t[0] for t in new_tokens])
-                else:
-                    results.append([''])
-
-        return results
+        # Only the first mask token of each text is predicted
+        outputs = self.predict_masks(
+            texts, target_words=None if target_words is None else [[w] for w in target_words], n=n)
+        return [output[0] if output else [''] for output in outputs]
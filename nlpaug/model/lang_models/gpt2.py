@@ -48,6 +48,13 @@ class Gpt2(LanguageModels):
     def id2token(self, _id):
         return self.tokenizer.decode(_id, clean_up_tokenization_spaces=True).strip()
 
+    def decode(self, ids):
+        """
+        :param list ids: Generated token ids
+        :return: Text of ids. Leading space of each token (Ġ) is kept as it is.
+        """
+        return self.tokenizer.decode(ids, clean_up_tokenization_spaces=False)
+
     def predict(self, texts, target_words=None, n=1, external_memory=None, 
         include_punctuation=False):
         # Prepare inputs
@@ -72,22 +79,65 @@ class Gpt2(LanguageModels):
         mask_inputs = torch.tensor(mask_inputs).to(self.device)
 
         # Prediction
-        results = []
         with torch.no_grad():
             outputs = self.model(input_ids=input_idxes, attention_mask=mask_inputs, past_key_values=external_memory)
 
         # Selection
-        for output, target_token in zip(outputs[0], target_words):
-            target_token_logits = output[0]
-
-            seed = {'temperature': self.temperature, 'top_k': self.top_k, 'top_p': self.top_p}
-            target_token_logits = self.control_randomness(target_token_logits, seed)
-            target_token_logits, target_token_idxes = self.filtering(target_token_logits, seed)
-            if len(target_token_idxes) != 0:
-                new_tokens = self.pick(target_token_logits, target_token_idxes, target_word=target_token, 
-                    n=10, include_punctuation=include_punctuation)
-                results.append([t[0] for t in new_tokens])
-            else:
-                results.append([''])
-
-        return results
+        new_tokens = self.pick_batch(outputs[0][:, 0], target_words=target_words, n=10,
+            include_punctuation=include_punctuation)
+        return [[t[0] for t in tokens] or [''] for tokens in new_tokens]
+
+    @classmethod
+    def _select_rows(cls, past_key_values, rows):
+        if hasattr(past_key_values, 'batch_select_indices'):
+            past_key_values.batch_select_indices(rows)
+            return past_key_values
+        # Legacy format: tuple of (key, value) per layer
+        return tuple(tuple(t.index_select(0, rows) for t in layer) for layer in past_key_values)
+
+    def predict_next(self, texts=None, next_ids=None, external_memory=None, rows=None, include_punctuation=False):
+        """
+        Predict next token by reusing past key values (external memory) of previous step. First step encodes texts
+        while later steps only feed the newly sampled token of each row.
+
+        :param list texts: Prompts. Only used in the first step (external_memory is None).
+        :param list next_ids: Sampled token id of each row which is still generating.
+        :param dict external_memory: External memory returned by previous step.
+        :param list rows: Rows (of previous step) which are still generating. Other rows are pruned from memory.
+        :param bool include_punctuation: If True, punctuation can be returned as candidate.
+        :return: Candidates ((token, token id) pairs) of each row and external memory for next step.
+        """
+        if external_memory is None:
+            input_idxes = [self.tokenizer.encode(text) for text in texts]
+            max_token_size = max(len(idxes) for idxes in input_idxes)
+
+            # Left padding so that the last token of every row is at the last column
+            input_ids = torch.full((len(input_idxes), max_token_size), self.pad_id, dtype=torch.long)
+            attention_mask = torch.zeros((len(input_idxes), max_token_size), dtype=torch.long)
+            for row, idxes in enumerate(input_idxes):
+                input_ids[row, max_token_size-len(idxes):] = torch.tensor(idxes, dtype=torch.long)
+                attention_mask[row, max_token_size-len(idxes):] = 1
+            attention_mask = attention_mask.to(self.device)
+            past_key_values = None
+        else:
+            past_key_values = external_memory['past_key_values']
+            attention_mask = external_memory['attention_mask']
+            if rows is not None and len(rows) < attention_mask.size(0):
+                rows = torch.tensor(rows, dtype=torch.long, device=attention_mask.device)
+                past_key_values = self._select_rows(past_key_values, rows)
+                attention_mask = attention_mask.index_select(0, rows)
+
+            input_ids = torch.tensor(next_ids, dtype=torch.long).view(-1, 1)
+            attention_mask = torch.cat([attention_mask, attention_mask.new_ones((attention_mask.size(0), 1))], dim=1)
+
+        input_ids = input_ids.to(self.device)
+        position_ids = (attention_mask.cumsum(dim=1) - 1).clamp(min=0)[:, -input_ids.size(1):]
+
+        with torch.no_grad():
+            outputs = self.model(input_ids=input_ids, attention_mask=attention_mask, position_ids=position_ids,
+                past_key_values=past_key_values, use_cache=True)
+        logits = self._model_logits(outputs)[:, -1, :]
+
+        # Token ids are kept so that they can be fed to next step
+        results = self.pick_batch(logits, include_punctuation=include_punctuation)
+        return results, {'past_key_values': outputs.past_key_values, 'attention_mask': attention_mask}
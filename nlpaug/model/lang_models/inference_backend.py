@@ -0,0 +1,266 @@
+try:
+    import torch
+except ImportError:
+    # No installation required if not using this function
+    pass
+
+import hashlib
+import inspect
+import os
+import re
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+
+
+BACKENDS = ['torch', 'quantized', 'onnx', 'onnx_quantized']
+
+QUANTIZED_FILE_NAME = 'quantized_state_dict.pt'
+ONNX_FILE_NAME = 'model.onnx'
+ONNX_QUANTIZED_FILE_NAME = 'model.quantized.onnx'
+
+
+def _to_dir_name(name):
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', name.strip('/\\'))
+
+
+def write_atomic(path, write_fx):
+    """
+    Write artifact to temporary file in same directory and move it to path once it is completed. Interrupted write
+    (or concurrent writers) does not leave truncated artifact which would be loaded by later runs.
+
+    :param str path: File path of artifact.
+    :param func write_fx: Function which writes artifact to given path.
+    """
+    dir_name, file_name = os.path.split(path)
+    # Extension is kept as some writers (e.g. onnx) decide format by it
+    fd, tmp_path = tempfile.mkstemp(
+        dir=dir_name or None, prefix='.{}.'.format(file_name), suffix=os.path.splitext(file_name)[1])
+    os.close(fd)
+    try:
+        write_fx(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def get_model_revision(model_path):
+    """
+    :param str model_path: Model name or model path.
+    :return: Revision of model. It is hash of file names, sizes and modified times for local model and commit hash
+        for model of Hugging Face Hub. None is returned if it cannot be resolved.
+    """
+    if os.path.isdir(model_path):
+        files = []
+        for root, _, file_names in os.walk(model_path):
+            for file_name in sorted(file_names):
+                stat = os.stat(os.path.join(root, file_name))
+                files.append('{}:{}:{}'.format(
+                    os.path.relpath(os.path.join(root, file_name), model_path), stat.st_size, stat.st_mtime_ns))
+        return hashlib.sha1('|'.join(sorted(files)).encode('utf-8')).hexdigest()[:16]
+
+    try:
+        from transformers import AutoConfig
+        return getattr(AutoConfig.from_pretrained(model_path), '_commit_hash', None)
+    except Exception:
+        return None
+
+
+def get_library_versions():
+    """
+    :return: Versions of torch and transformers. Artifact built by other versions is not reused.
+    """
+    versions = []
+    for library in ['torch', 'transformers']:
+        try:
+            versions.append('{}-{}'.format(library, __import__(library).__version__))
+        except ImportError:
+            versions.append('{}-none'.format(library))
+    return '_'.join(versions)
+
+
+def default_backend_dir(model_path, backend, revision=None):
+    """
+    :param str model_path: Model name or model path.
+    :param str backend: Inference backend.
+    :param str revision: Revision of model (e.g. output of get_model_revision).
+    :return: Directory of cached artifact. It is under ~/.cache/nlpaug/backends and keyed by model, revision,
+        backend and versions of torch and transformers.
+    """
+    return os.path.join(
+        os.path.expanduser('~'), '.cache', 'nlpaug', 'backends', _to_dir_name(model_path),
+        _to_dir_name(revision or 'unknown'), backend, _to_dir_name(get_library_versions()))
+
+
+def load_masked_lm(model_path, loader, backend='torch', backend_dir=None, device='cpu', skeleton_loader=None,
+                   revision=None):
+    """
+    Load masked language model for inference. Except 'torch', artifact is built once (from model returned by loader)
+    and cached on disk. Later calls load the artifact directly.
+
+    :param str model_path: Model name or model path. It is used for naming default backend_dir.
+    :param func loader: Function which returns PyTorch model (e.g. AutoModelForMaskedLM.from_pretrained).
+    :param str backend: 'torch' (eager PyTorch), 'quantized' (PyTorch dynamic int8 quantization), 'onnx' (ONNX
+        Runtime) or 'onnx_quantized' (ONNX Runtime with dynamic int8 quantization). Except 'torch', only CPU is
+        supported.
+    :param str backend_dir: Directory of cached artifact. Default value is
+        ~/.cache/nlpaug/backends/<model>/<revision>/<backend>/<torch and transformers versions>
+    :param str device: Device of model.
+    :param func skeleton_loader: Function which returns PyTorch model with same architecture as loader but without
+        loading pre-trained weights (e.g. AutoModelForMaskedLM.from_config). Cached quantized weights are loaded into
+        it. Default value is loader.
+    :param str revision: Revision of model. It is resolved by get_model_revision if None is passed.
+    :return: Model which can be called by input_ids and attention_mask and returns logits.
+    """
+    if backend not in BACKENDS:
+        raise ValueError('backend must be one of {} while {} is passed'.format(BACKENDS, backend))
+
+    if backend == 'torch':
+        model = loader()
+        model.to(device)
+        model.eval()
+        return model
+
+    if device is not None and str(device) != 'cpu':
+        raise ValueError('{} backend only supports cpu device while {} is passed'.format(backend, device))
+
+    if backend_dir is None:
+        backend_dir = default_backend_dir(model_path, backend, revision=revision or get_model_revision(model_path))
+    os.makedirs(backend_dir, exist_ok=True)
+
+    if backend == 'quantized':
+        return load_quantized_model(loader, backend_dir, skeleton_loader=skeleton_loader)
+    return OnnxMaskedLm.load(loader, backend_dir, quantize=backend == 'onnx_quantized')
+
+
+def quantize_model(model):
+    return torch.ao.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_quantized_model(loader, backend_dir, skeleton_loader=None):
+    """
+    Apply dynamic int8 quantization to linear layers of model. Only state_dict of quantized model is saved. It is
+    loaded by weights_only (no arbitrary object is unpickled) into quantized skeleton so that pre-trained float
+    weights do not need to be loaded again.
+    """
+    state_dict_path = os.path.join(backend_dir, QUANTIZED_FILE_NAME)
+    if os.path.exists(state_dict_path):
+        model = quantize_model((skeleton_loader or loader)())
+        model.load_state_dict(torch.load(state_dict_path, weights_only=True))
+    else:
+        model = quantize_model(loader())
+        write_atomic(state_dict_path, lambda path: torch.save(model.state_dict(), path))
+
+    model.eval()
+    return model
+
+
+class OnnxMaskedLm:
+    """
+    ONNX Runtime (CPU) session of masked language model. It mimics PyTorch model so that it can be used by
+    LanguageModels without changing sampling logic.
+
+    :param str backend_dir: Directory which contains exported model and its config.
+    :param str file_name: File name of ONNX model.
+    :param int num_threads: Number of threads used by ONNX Runtime. Default value is decided by ONNX Runtime.
+    """
+
+    def __init__(self, backend_dir, file_name=ONNX_FILE_NAME, num_threads=None):
+        try:
+            import onnxruntime
+            from transformers import AutoConfig
+        except ModuleNotFoundError:
+            raise ModuleNotFoundError('Missed onnxruntime library. Install onnxruntime by `pip install onnxruntime`')
+
+        options = onnxruntime.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(backend_dir, file_name), options, providers=['CPUExecutionProvider'])
+        self.config = AutoConfig.from_pretrained(backend_dir)
+        self.device = torch.device('cpu')
+
+    @classmethod
+    def export(cls, model, backend_dir, opset_version=17):
+        """
+        :param torch.nn.Module model: PyTorch masked language model.
+        :param str backend_dir: Directory of exported model.
+        """
+        class LogitsOnly(torch.nn.Module):
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, input_ids, attention_mask):
+                return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+        model = model.eval().to('cpu')
+        dummy_input_ids = torch.ones((1, 8), dtype=torch.long)
+        dummy_attention_mask = torch.ones((1, 8), dtype=torch.long)
+        dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in ['input_ids', 'attention_mask', 'logits']}
+
+        kwargs = {}
+        # Newer PyTorch exports by dynamo by default which needs extra dependencies
+        if 'dynamo' in inspect.signature(torch.onnx.export).parameters:
+            kwargs['dynamo'] = False
+
+        def _export(path):
+            with torch.no_grad():
+                torch.onnx.export(
+                    LogitsOnly(model), (dummy_input_ids, dummy_attention_mask), path,
+                    input_names=['input_ids', 'attention_mask'], output_names=['logits'],
+                    dynamic_axes=dynamic_axes, opset_version=opset_version, **kwargs)
+
+        # Config is saved first as existence of exported model means that export is completed
+        model.config.save_pretrained(backend_dir)
+        write_atomic(os.path.join(backend_dir, ONNX_FILE_NAME), _export)
+
+    @classmethod
+    def quantize(cls, backend_dir):
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        write_atomic(
+            os.path.join(backend_dir, ONNX_QUANTIZED_FILE_NAME),
+            lambda path: quantize_dynamic(os.path.join(backend_dir, ONNX_FILE_NAME), path, weight_type=QuantType.QInt8))
+
+    @classmethod
+    def load(cls, loader, backend_dir, quantize=False, num_threads=None):
+        """
+        Load exported model from backend_dir. Model is exported (and quantized) first if it does not exist.
+
+        :param func loader: Function which returns PyTorch model.
+        :param str backend_dir: Directory of exported model.
+        :param bool quantize: If True, dynamic int8 quantized model is used.
+        :param int num_threads: Number of threads used by ONNX Runtime.
+        """
+        if not os.path.exists(os.path.join(backend_dir, ONNX_FILE_NAME)):
+            cls.export(loader(), backend_dir)
+
+        file_name = ONNX_FILE_NAME
+        if quantize:
+            file_name = ONNX_QUANTIZED_FILE_NAME
+            if not os.path.exists(os.path.join(backend_dir, file_name)):
+                cls.quantize(backend_dir)
+
+        return cls(backend_dir, file_name=file_name, num_threads=num_threads)
+
+    def __call__(self, input_ids, attention_mask=None, **kwargs):
+        if attention_mask is None:
+            attention_mask = torch.ones_like(input_ids)
+
+        logits = self.session.run(['logits'], {
+            'input_ids': input_ids.cpu().numpy().astype(np.int64),
+            'attention_mask': attention_mask.cpu().numpy().astype(np.int64),
+        })[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+    def to(self, device):
+        if str(device) != 'cpu':
+            raise ValueError('ONNX backend only supports cpu device while {} is passed'.format(device))
+        return self
+
+    def eval(self):
+        return self
@@ -10,11 +10,42 @@ import string
 import nlpaug.util.selection.filtering as filtering
 
 
+def make_length_batches(lengths, batch_size=None, max_tokens=None):
+    """
+    Group inputs of similar length into batches so that little compute is wasted on padding. Inputs are sorted by
+    length (longest first). A batch is closed when it has batch_size inputs or when its padded size (number of
+    inputs x longest length) would exceed max_tokens. An input longer than max_tokens forms a batch by itself.
+
+    :param list lengths: Number of tokens of each input.
+    :param int batch_size: Maximum number of inputs per batch. No limit if None is passed.
+    :param int max_tokens: Maximum number of (padded) tokens per batch. No limit if None is passed.
+    :return: List of batches. Each batch is a list of input indexes.
+
+    >>> make_length_batches([5, 400, 7, 390], batch_size=32, max_tokens=800)
+    [[1, 3], [2, 0]]
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+
+    batches = []
+    batch = []
+    for idx in order:
+        # First input of batch is the longest one as inputs are sorted
+        if batch and ((batch_size and len(batch) >= batch_size) or
+                      (max_tokens and lengths[batch[0]] * (len(batch) + 1) > max_tokens)):
+            batches.append(batch)
+            batch = []
+        batch.append(idx)
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
 class LanguageModels:
     OPTIMIZE_ATTRIBUTES = ['external_memory', 'return_proba']
 
     def __init__(self, device='cpu', model_type='', temperature=1.0, top_k=100, top_p=0.01, batch_size=32,
-        optimize=None, silence=True):
+        optimize=None, silence=True, max_tokens=None):
         try:
             import torch
         except ModuleNotFoundError:
@@ -27,6 +58,7 @@ class LanguageModels:
         self.top_k = top_k
         self.top_p = top_p
         self.batch_size = batch_size
+        self.max_tokens = max_tokens
         self.optimize = self.init_optimize(optimize)
         self.silence = silence
 
@@ -83,6 +115,32 @@ class LanguageModels:
             return_tensors=return_tensors,
         )
 
+    def _pad_ids(self, ids_list, tokenizer=None):
+        tokenizer = self.tokenizer if tokenizer is None else tokenizer
+        return tokenizer.pad({'input_ids': ids_list}, padding=True, return_tensors='pt')
+
+    def count_tokens(self, texts, tokenizer=None):
+        tokenizer = self.tokenizer if tokenizer is None else tokenizer
+        return [len(ids) for ids in tokenizer(texts, padding=False, truncation=False)['input_ids']]
+
+    def predict_in_batches(self, inputs, lengths, predict_fx):
+        """
+        Run predict_fx on batches of similar length (see make_length_batches) under `batch_size` and `max_tokens`
+        of this model, then restore original order.
+
+        :param list inputs: Inputs (e.g. texts or input ids).
+        :param list lengths: Number of tokens of each input.
+        :param func predict_fx: Function which receives list of inputs and returns one output per input.
+        :return: Outputs in original order.
+        """
+        results = [None] * len(inputs)
+        for batch_idxes in make_length_batches(lengths, batch_size=self.batch_size, max_tokens=self.max_tokens):
+            outputs = predict_fx([inputs[i] for i in batch_idxes])
+            for i, output in zip(batch_idxes, outputs):
+                results[i] = output
+
+        return results
+
     def _batch_to_device(self, batch):
         return {key: value.to(self.device) for key, value in batch.items()}
 
@@ -193,6 +251,221 @@ class LanguageModels:
 
         return logits, idxes
 
+    def filtering_batch(self, logits, seed):
+        """
+        Batched version of filtering. Unlike filtering, logits are not reordered. Filtered values are replaced by -inf.
+
+        :param torch.Tensor logits: Logits with shape [number of rows, vocabulary size].
+        :param dict seed: Values of top_k and top_p.
+        :return: Filtered logits with same shape as input.
+        """
+        top_k = seed['top_k']
+        top_p = seed['top_p']
+
+        if top_k is not None and 0 < top_k < logits.size(-1):
+            logits = filtering.filter_top_k_batch(logits, top_k)
+        if top_p is not None and 0 < top_p < 1:
+            logits = filtering.nucleus_sampling_batch(logits, top_p)
+
+        return logits
+
+    def _get_vocab_cache(self):
+        # Vocabulary arrays are kept on model (not MODEL_CACHE) so that they are dropped together with the model and
+        # looking them up per step does not touch the model registry.
+        if '_vocab_cache' not in self.__dict__:
+            self._vocab_cache = {}
+        return self._vocab_cache
+
+    def get_vocab_tokens(self, vocab_size):
+        """
+        :param int vocab_size: Vocabulary size of model output.
+        :return: Array of tokens which is indexed by token id. It is built once per model.
+        """
+        cache = self._get_vocab_cache()
+        key = ('tokens', vocab_size)
+        if key not in cache:
+            tokens = [self.id2token(_id) for _id in range(vocab_size)]
+            cache[key] = np.array([token if token is not None else '' for token in tokens], dtype=object)
+        return cache[key]
+
+    def get_skip_mask(self, vocab_size, include_punctuation=False):
+        """
+        Same rules as get_candidates except comparing with target word. Unknown token, subword prefix, 'unused'
+        token, punctuation and tokens returned by is_skip_candidate are marked. It is built once per model.
+
+        :param int vocab_size: Vocabulary size of model output.
+        :param bool include_punctuation: If True, punctuation is not marked.
+        :return: Boolean array which is indexed by token id. True means token cannot be a candidate.
+        """
+        cache = self._get_vocab_cache()
+        key = ('skip_mask', vocab_size, include_punctuation)
+        if key not in cache:
+            unpredictable_tokens = ['', self.get_unknown_token(), self.get_subword_prefix()]
+            cache[key] = np.array([
+                token in unpredictable_tokens or 'unused' in token or self.is_skip_candidate(token) or
+                (not include_punctuation and token in string.punctuation)
+                for token in self.get_vocab_tokens(vocab_size)], dtype=bool)
+        return cache[key]
+
+    def _get_skip_mask_tensor(self, vocab_size, include_punctuation, device):
+        # Mask is copied to device once instead of per step
+        cache = self._get_vocab_cache()
+        key = ('skip_mask_tensor', vocab_size, include_punctuation, str(device))
+        if key not in cache:
+            cache[key] = torch.from_numpy(self.get_skip_mask(vocab_size, include_punctuation)).to(device)
+        return cache[key]
+
+    def pick_batch(self, logits, target_words=None, n=10, include_punctuation=False):
+        """
+        Batched version of control_randomness, filtering and pick. Tokens marked by skip mask are removed from
+        logits, then temperature, top-k and top-p are applied to all rows at once and candidates of every row are
+        drawn by a single multinomial call.
+
+        :param torch.Tensor logits: Logits with shape [number of rows, vocabulary size].
+        :param list target_words: Original word of each row. Candidate which is same as it is skipped.
+        :param int n: Maximum number of candidates per row.
+        :param bool include_punctuation: If True, punctuation can be returned as candidate.
+        :return: Candidates ((token, token id) pairs) of each row. Probability is appended to each pair (i.e. token,
+            token id, probability) if return_proba of optimize is True.
+        """
+        if target_words is None:
+            target_words = [None] * len(logits)
+        if len(logits) == 0:
+            return []
+
+        vocab_size = logits.size(-1)
+        skip_mask = self._get_skip_mask_tensor(vocab_size, include_punctuation, logits.device)
+
+        seed = {'temperature': self.temperature, 'top_k': self.top_k, 'top_p': self.top_p}
+        # Invalid tokens are removed before filtering so that every drawn token is a candidate
+        logits = self.control_randomness(logits, seed).masked_fill(skip_mask, -float('Inf'))
+        logits = self.filtering_batch(logits, seed)
+
+        # Row which all values are filtered becomes nan after softmax
+        probas = torch.nan_to_num(F.softmax(logits.float(), dim=-1), nan=0.0)
+        # Filtered tokens get a negligible weight so that every row has enough tokens to draw. They are only drawn
+        # after the unfiltered ones and dropped below.
+        weights = probas.masked_fill(probas == 0, torch.finfo(probas.dtype).tiny)
+        # Extra candidates cover the ones which are same as target word
+        num_sample = min(n * 2, vocab_size)
+        sample_ids = torch.multinomial(weights, num_samples=num_sample, replacement=False)
+        sample_probas = probas.gather(-1, sample_ids)
+        sample_valids = sample_probas > 0
+
+        sample_ids = sample_ids.cpu().numpy()
+        sample_valids = sample_valids.cpu().numpy()
+        sample_probas = sample_probas.cpu().numpy()
+        vocab_tokens = self.get_vocab_tokens(vocab_size)
+        return_proba = self.optimize['return_proba']
+
+        results = []
+        for row_ids, row_valids, row_probas, target_word in zip(sample_ids, sample_valids, sample_probas, target_words):
+            target_word = target_word.lower() if target_word is not None else None
+            candidates = []
+            for candidate_id, candidate_proba in zip(row_ids[row_valids], row_probas[row_valids]):
+                candidate_word = vocab_tokens[candidate_id]
+                # predicted same word
+                if target_word is not None and candidate_word.lower() == target_word:
+                    continue
+                if return_proba:
+                    candidates.append((candidate_word, int(candidate_id), float(candidate_proba)))
+                else:
+                    candidates.append((candidate_word, int(candidate_id)))
+                if len(candidates) >= n:
+                    break
+            results.append(candidates)
+
+        return results
+
+    def _pick_target_candidates(self, target_token_logits, target_word=None, n=10):
+        return self._pick_target_candidates_batch(target_token_logits.unsqueeze(0), [target_word], n=n)[0]
+
+    def _pick_target_candidates_batch(self, logits, target_words=None, n=10):
+        return [[c[0] for c in candidates] or [''] for candidates in self.pick_batch(logits, target_words, n=n)]
+
+    def predict_masks(self, texts, target_words=None, n=1):
+        """
+        Predict every mask token of each text by a single forward pass. Only masked language models which own
+        `tokenizer`, `model` and `mask_id` (e.g. Bert, Roberta and DistilBert) support it.
+
+        :param list texts: Texts which contain one or more mask tokens.
+        :param list target_words: Original words per text, one per mask token (in order of appearance).
+        :param int n: Not used. Keep same signature as predict.
+        :return: Candidates of each mask token per text.
+        """
+        ids_list = self._encode_batch(texts, padding=False, truncation=False, return_tensors=None)['input_ids']
+        mask_poses_list = [[pos for pos, _id in enumerate(ids) if _id == self.mask_id] for ids in ids_list]
+        target_words = target_words if target_words is not None else [None] * len(texts)
+
+        def _predict(batch):
+            ids_batch, mask_poses_batch, target_words_batch = zip(*batch)
+            return self._predict_mask_poses(self._pad_ids(list(ids_batch)), mask_poses_batch, target_words_batch)
+
+        return self.predict_in_batches(
+            list(zip(ids_list, mask_poses_list, target_words)), [len(ids) for ids in ids_list], _predict)
+
+    def encode_tokens(self, token_lists):
+        """
+        Convert tokens (e.g. output of tokenizer.tokenize) to input ids without decoding and tokenizing text again.
+        Start and separator tokens are added and rows are padded by pad token.
+
+        :param list token_lists: List of tokens per text.
+        :return: Tensor of input ids with shape [number of texts, maximum number of tokens + 2]
+        """
+        ids_list = [self.tokenizer.convert_tokens_to_ids(tokens) for tokens in token_lists]
+        input_ids = torch.full(
+            (len(ids_list), max(len(ids) for ids in ids_list) + 2), self.pad_id, dtype=torch.long)
+        for row, ids in enumerate(ids_list):
+            input_ids[row, 0] = self.tokenizer.cls_token_id
+            input_ids[row, 1:len(ids)+1] = torch.tensor(ids, dtype=torch.long)
+            input_ids[row, len(ids)+1] = self.tokenizer.sep_token_id
+        return input_ids
+
+    def predict_ids(self, input_ids, mask_poses, target_words=None, n=1):
+        """
+        Same as predict_masks but input ids and positions of mask tokens are provided directly.
+
+        :param torch.Tensor input_ids: Input ids (padded by pad token at the end) with shape [number of texts, length].
+        :param list mask_poses: Positions of mask tokens per text.
+        :param list target_words: Original words per text, one per mask token.
+        :param int n: Not used. Keep same signature as predict.
+        :return: Candidates of each mask token per text.
+        """
+        lengths = input_ids.ne(self.pad_id).sum(dim=1).tolist()
+        target_words = target_words if target_words is not None else [None] * len(input_ids)
+
+        def _predict(rows):
+            # Drop columns which are padding for all texts of this batch
+            batch_ids = input_ids[list(rows)][:, :max(lengths[row] for row in rows)]
+            batch = {'input_ids': batch_ids, 'attention_mask': batch_ids.ne(self.pad_id).long()}
+            return self._predict_mask_poses(
+                batch, [mask_poses[row] for row in rows], [target_words[row] for row in rows])
+
+        return self.predict_in_batches(list(range(len(input_ids))), lengths, _predict)
+
+    def _predict_mask_poses(self, batch, batch_mask_poses, batch_target_words=None):
+        batch = self._batch_to_device(batch)
+        with torch.no_grad():
+            outputs = self.model(**batch)
+        logits = self._model_logits(outputs)
+
+        if batch_target_words is None:
+            batch_target_words = [None] * len(batch_mask_poses)
+
+        # Candidates of all mask tokens in this batch are picked at once
+        rows, cols, target_words, num_masks = [], [], [], []
+        for row, (mask_poses, words) in enumerate(zip(batch_mask_poses, batch_target_words)):
+            words = words if words is not None else [None] * len(mask_poses)
+            num_masks.append(0)
+            for mask_pos, word in zip(mask_poses, words):
+                rows.append(row)
+                cols.append(mask_pos)
+                target_words.append(word)
+                num_masks[-1] += 1
+
+        candidates = iter(self._pick_target_candidates_batch(logits[rows, cols], target_words))
+        return [[next(candidates) for _ in range(num_mask)] for num_mask in num_masks]
+
     def pick(self, logits, idxes, target_word, n=1, include_punctuation=False):
         candidate_ids, candidate_probas = self.prob_multinomial(logits, n=n*10)
         candidate_ids = [idxes[candidate_id] for candidate_id in candidate_ids]
@@ -201,9 +474,6 @@ class LanguageModels:
 
         return results
 
-    def id2token(self, _id):
-        raise NotImplementedError()
-
     def prob_multinomial(self, logits, n):
         # Convert to probability
         probas = F.softmax(logits, dim=-1)
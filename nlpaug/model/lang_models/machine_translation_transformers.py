@@ -1,18 +1,27 @@
 try:
     import torch
-    from torch.utils import data as t_data
     from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 except ImportError:
     # No installation required if not using this function
     pass
 
+import hashlib
+import json
+import os
+import queue
+import threading
+
 from nlpaug.model.lang_models import LanguageModels
+from nlpaug.model.lang_models.language_models import make_length_batches
 
 
 class MtTransformers(LanguageModels):
+    # Number of translated batches which are waiting for tgt_model in pipelined mode
+    PIPELINE_QUEUE_SIZE = 2
+
     def __init__(self, src_model_name='facebook/wmt19-en-de', tgt_model_name='facebook/wmt19-de-en',
-                 device='cuda', silence=True, batch_size=32, max_length=None):
-        super().__init__(device, model_type=None, silence=silence)
+                 device='cuda', silence=True, batch_size=32, max_length=None, max_tokens=None, pipelined=False):
+        super().__init__(device, model_type=None, silence=silence, max_tokens=max_tokens)
         try:
             from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
         except ModuleNotFoundError:
@@ -37,49 +46,213 @@ class MtTransformers(LanguageModels):
 
         self.batch_size = batch_size
         self.max_length = max_length
+        self.pipelined = pipelined
+        self._ids_compatible = None
 
     def get_device(self):
         return str(self.src_model.device)
 
-    def predict(self, texts, target_words=None, n=1):
+    def get_cache_namespace(self):
+        """
+        :return: Namespace of translation cache. Translation depends on model pair and every generation parameter
+            (max_length and generation config of both models such as num_beams).
+        """
+        generation_params = {'max_length': self.max_length}
+        for name in ['src_model', 'tgt_model']:
+            generation_config = getattr(getattr(self, name, None), 'generation_config', None)
+            generation_params[name] = generation_config.to_dict() if generation_config is not None else None
+        generation_key = hashlib.sha1(
+            json.dumps(generation_params, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+        return '|'.join([self.src_model_name, self.tgt_model_name, generation_key])
+
+    def predict(self, texts, target_words=None, n=1, cache=None):
+        """
+        :param list texts: Texts for back translation.
+        :param list target_words: Not used.
+        :param int n: Number of back translated texts per input. If it is larger than 1, all of them are sampled by
+            a single generate call (num_return_sequences) and list of unique texts is returned per input.
+        :param TranslationCache cache: Translation cache of caller. Translations are read from it first and only
+            missed texts are translated. Model is shared by augmenters so that cache is passed per call.
+        :return: Back translated texts in original order.
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+        # Sampled translations are not cached
+        if cache is None or n > 1:
+            return self._predict(texts, n=n)
+
+        # Only texts which are not cached (and not duplicated) are translated
+        namespace = self.get_cache_namespace()
+        results = cache.get_many(texts, namespace)
+        miss_texts = list(dict.fromkeys(text for text, result in zip(texts, results) if result is None))
+        if miss_texts:
+            translated_texts = self._predict(miss_texts)
+            cache.set_many(miss_texts, translated_texts, namespace)
+            translations = dict(zip(miss_texts, translated_texts))
+            results = [translations[text] if result is None else result for text, result in zip(texts, results)]
+
+        return results
+
+    def _predict(self, texts, n=1):
+        if self.pipelined:
+            return self.predict_pipelined(texts, n=n)
+
+        # Pivot text is translated once. Variants are sampled when translating it back.
         src_translated_texts = self.translate_one_step_batched(texts, self.src_tokenizer, self.src_model)
-        tgt_translated_texts = self.translate_one_step_batched(src_translated_texts, self.tgt_tokenizer, self.tgt_model)
+        tgt_translated_texts = self.translate_one_step_batched(
+            src_translated_texts, self.tgt_tokenizer, self.tgt_model, n=n)
 
         return tgt_translated_texts
 
     def translate_one_step_batched(
-            self, data, tokenizer, model
+            self, data, tokenizer, model, n=1
     ):
-        tokenized_texts = tokenizer(data, padding=True, truncation=True, return_tensors='pt')
-        tokenized_dataset = t_data.TensorDataset(*(tokenized_texts.values()))
-        tokenized_dataloader = t_data.DataLoader(
-            tokenized_dataset,
-            batch_size=self.batch_size,
-            shuffle=False,
-            num_workers=1
-        )
+        # Inputs are batched by length instead of padding all of them to the longest one
+        ids_list = tokenizer(data, padding=False, truncation=True)['input_ids']
+
+        def _translate(batch_ids):
+            return self._decode(tokenizer, self._generate(batch_ids, tokenizer, model, n=n), n=n)
 
-        all_translated_ids = []
+        return self.predict_in_batches(ids_list, [len(ids) for ids in ids_list], _translate)
+
+    def _generate(self, ids_batch, tokenizer, model, n=1):
+        batch = self._batch_to_device(self._pad_ids(ids_batch, tokenizer=tokenizer))
+        kwargs = {}
+        if n > 1:
+            # Encoder runs once per input and n sequences are sampled from its output. Beam search of model's generation
+            # config (e.g. facebook/wmt19-*) is disabled, otherwise n cannot exceed num_beams and top beams are returned.
+            kwargs = {'do_sample': True, 'num_beams': 1, 'num_return_sequences': n}
         with torch.no_grad():
-            for batch in tokenized_dataloader:
-                batch = tuple(t.to(self.device) for t in batch)
-                input_ids, attention_mask = batch
-
-                translated_ids_batch = model.generate(
-                    input_ids=input_ids, attention_mask=attention_mask,
-                    max_length=self.max_length
-                )
-
-                all_translated_ids.append(
-                    translated_ids_batch.detach().cpu().numpy()
-                )
-
-        all_translated_texts = []
-        for translated_ids_batch in all_translated_ids:
-            translated_texts = tokenizer.batch_decode(
-                translated_ids_batch,
-                skip_special_tokens=True
+            translated_ids_batch = model.generate(
+                input_ids=batch['input_ids'], attention_mask=batch['attention_mask'],
+                max_length=self.max_length, **kwargs
             )
-            all_translated_texts.extend(translated_texts)
+        return translated_ids_batch.detach().cpu()
+
+    @classmethod
+    def _decode(cls, tokenizer, translated_ids_batch, n=1):
+        texts = tokenizer.batch_decode(translated_ids_batch.numpy(), skip_special_tokens=True)
+        if n == 1:
+            return texts
+        # Sequences of same input are next to each other. Duplicated ones are dropped.
+        return [list(dict.fromkeys(texts[i:i+n])) for i in range(0, len(texts), n)]
+
+    def is_ids_compatible(self):
+        """
+        :return: True if ids generated by src_model can be fed to tgt_model directly. It is the case when
+            vocabulary of src_model output is same as vocabulary of tgt_model input and both tokenizers segment text
+            by one same model (e.g. SentencePiece). Pair which has separate source and target segmentation models
+            behind shared vocabulary (e.g. Marian) is translated back from decoded texts.
+        """
+        if self._ids_compatible is None:
+            src_files = self._get_segmentation_files(self.src_tokenizer)
+            tgt_files = self._get_segmentation_files(self.tgt_tokenizer)
+            if not src_files or src_files != tgt_files:
+                self._ids_compatible = False
+            else:
+                ids = list(range(len(self.src_tokenizer)))
+                tokens = self.src_tokenizer.convert_ids_to_tokens(ids)
+                self._ids_compatible = len(self.src_tokenizer) == len(self.tgt_tokenizer) and \
+                    self.tgt_tokenizer.convert_tokens_to_ids(tokens) == ids
+        return self._ids_compatible
+
+    @classmethod
+    def _get_segmentation_files(cls, tokenizer):
+        """
+        :return: Hash of files of tokenizer (e.g. SentencePiece model and vocabulary). None is returned if they cannot
+            be found or tokenizer has different segmentation models for source and target (e.g. Marian spm_files).
+        """
+        spm_files = list(getattr(tokenizer, 'spm_files', None) or [])
+        paths = list(spm_files)
+        init_kwargs = getattr(tokenizer, 'init_kwargs', None) or {}
+        for name in getattr(tokenizer, 'vocab_files_names', None) or {}:
+            path = getattr(tokenizer, name, None) or init_kwargs.get(name)
+            if isinstance(path, str) and path not in paths:
+                paths.append(path)
+        paths = [path for path in paths if os.path.isfile(path)]
+        if not paths:
+            return None
+
+        hashes = {}
+        for path in paths:
+            with open(path, 'rb') as f:
+                hashes[path] = hashlib.sha1(f.read()).hexdigest()
+        if len({hashes[path] for path in spm_files if path in hashes}) > 1:
+            return None
+        return frozenset(hashes.values())
+
+    def _to_tgt_ids(self, translated_ids_batch):
+        # Keep token ids if possible so that intermediate texts are not decoded and tokenized again
+        if self.is_ids_compatible():
+            special_ids = set(self.src_tokenizer.all_special_ids)
+            max_num_token = self.tgt_tokenizer.model_max_length - self.tgt_tokenizer.num_special_tokens_to_add()
+            return [
+                self.tgt_tokenizer.build_inputs_with_special_tokens(
+                    [_id for _id in ids if _id not in special_ids][:max_num_token])
+                for ids in translated_ids_batch.tolist()]
+
+        texts = self.src_tokenizer.batch_decode(translated_ids_batch.numpy(), skip_special_tokens=True)
+        return self.tgt_tokenizer(texts, padding=False, truncation=True)['input_ids']
+
+    def predict_pipelined(self, texts, n=1):
+        """
+        Same as predict but two translation steps are overlapped. While batch k is translated back by tgt_model in
+        current thread, batch k+1 is translated by src_model in background thread. Only few translated batches are
+        kept in memory and they stay as token ids if tokenizers allow it (see is_ids_compatible).
+
+        :param list texts: Texts for back translation.
+        :param int n: Number of back translated texts per input. Same as predict.
+        :return: Back translated texts in original order.
+        """
+        ids_list = self.src_tokenizer(texts, padding=False, truncation=True)['input_ids']
+        batches = make_length_batches(
+            [len(ids) for ids in ids_list], batch_size=self.batch_size, max_tokens=self.max_tokens)
+
+        translated_batches = queue.Queue(maxsize=self.PIPELINE_QUEUE_SIZE)
+        stop = threading.Event()
+
+        def _put(item):
+            # Give up if current thread stopped consuming (e.g. tgt_model raised exception)
+            while not stop.is_set():
+                try:
+                    translated_batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _translate_forward():
+            try:
+                for batch_idxes in batches:
+                    translated_ids_batch = self._generate(
+                        [ids_list[i] for i in batch_idxes], self.src_tokenizer, self.src_model)
+                    if not _put((batch_idxes, self._to_tgt_ids(translated_ids_batch))):
+                        return
+            except Exception as e:
+                _put(e)
+                return
+            _put(None)
+
+        worker = threading.Thread(target=_translate_forward, daemon=True)
+        worker.start()
+
+        results = [None] * len(texts)
+        try:
+            while True:
+                item = translated_batches.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+
+                batch_idxes, tgt_ids_batch = item
+                translated_texts = self._decode(
+                    self.tgt_tokenizer, self._generate(tgt_ids_batch, self.tgt_tokenizer, self.tgt_model, n=n), n=n)
+                for i, translated_text in zip(batch_idxes, translated_texts):
+                    results[i] = translated_text
+        finally:
+            stop.set()
+            worker.join()
 
-        return all_translated_texts
+        return results
@@ -12,8 +12,8 @@ from nlpaug.model.lang_models import LanguageModels
 
 class XSumTransformers(LanguageModels):
     def __init__(self, model_name="t5-base", tokenizer_name=None, min_length=10, max_length=20, 
-        temperature=1.0, top_k=50, top_p=0.9, batch_size=32, device='cuda', silence=True):
-        super().__init__(device, model_type=None, silence=silence)
+        temperature=1.0, top_k=50, top_p=0.9, batch_size=32, device='cuda', silence=True, max_tokens=None):
+        super().__init__(device, model_type=None, silence=silence, max_tokens=max_tokens)
         try:
             from transformers import pipeline
         except ModuleNotFoundError:
@@ -43,20 +43,34 @@ class XSumTransformers(LanguageModels):
         return str(self.model.device)
 
     def predict(self, texts, target_words=None, n=1):
-        results = []
-        with torch.no_grad():
-            for i in range(0, len(texts), self.batch_size):
-                predict_result = self.model(texts[i:i+self.batch_size], 
-                    min_length=self.min_length, 
+        """
+        :param list texts: Texts for summarization.
+        :param list target_words: Not used.
+        :param int n: Number of summaries per input. If it is larger than 1, all of them are sampled by a single
+            generate call (num_return_sequences) and list of unique summaries is returned per input.
+        :return: Summaries in original order.
+        """
+        kwargs = {}
+        if n > 1:
+            # Beam search of pipeline (e.g. num_beams of t5 task_specific_params) is replaced by plain sampling
+            kwargs = {'do_sample': True, 'num_beams': 1, 'num_return_sequences': n}
+
+        def _predict(batch_texts):
+            with torch.no_grad():
+                predict_result = self.model(batch_texts,
+                    min_length=self.min_length,
                     max_length=self.max_length,
                     temperature=self.temperature,
                     top_k=self.top_k,
                     top_p=self.top_p,
-                    num_workers=1)
-                if isinstance(predict_result, list):
-                    results.extend(predict_result)
-                else:
-                    results.append(predict_result)
-        results = [r['summary_text'] for r in results]
-        
-        return results
+                    num_workers=1,
+                    **kwargs)
+            if not isinstance(predict_result, list):
+                predict_result = [predict_result]
+            if n == 1:
+                return [r['summary_text'] for r in predict_result]
+            # One list of n summaries per input
+            predict_result = [[r] if isinstance(r, dict) else r for r in predict_result]
+            return [list(dict.fromkeys(r['summary_text'] for r in rs)) for rs in predict_result]
+
+        return self.predict_in_batches(texts, self.count_tokens(texts, tokenizer=self.model.tokenizer), _predict)
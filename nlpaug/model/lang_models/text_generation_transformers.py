@@ -10,8 +10,8 @@ from nlpaug.model.lang_models import LanguageModels
 
 class TextGenTransformers(LanguageModels):
     def __init__(self, model_path='gpt2', device='cuda', min_length=100, max_length=300, 
-        batch_size=32, temperature=1.0, top_k=50, top_p=0.9, silence=True):
-        super().__init__(device, model_type=None, silence=silence)
+        batch_size=32, temperature=1.0, top_k=50, top_p=0.9, silence=True, max_tokens=None):
+        super().__init__(device, model_type=None, silence=silence, max_tokens=max_tokens)
         try:
             from transformers import pipeline
         except ModuleNotFoundError:
@@ -38,13 +38,12 @@ class TextGenTransformers(LanguageModels):
         return str(self.model.device)
 
     def predict(self, texts, target_words=None, n=1):
-        results = []
-        with torch.no_grad():
-            for i in range(0, len(texts), self.batch_size):
+        def _predict(batch_texts):
+            with torch.no_grad():
                 predict_result = self.model(
-                    texts[i:i+self.batch_size], 
+                    batch_texts,
                     pad_token_id=50256,
-                    min_length=self.min_length, 
+                    min_length=self.min_length,
                     max_length=self.max_length,
                     temperature=self.temperature,
                     top_k=self.top_k,
@@ -53,7 +52,6 @@ class TextGenTransformers(LanguageModels):
                     num_return_sequences=1,
                     num_workers=1
                 )
-                if isinstance(predict_result, list):
-                    results.extend([y for x in predict_result for y in x])
+            return [y['generated_text'] for x in predict_result for y in x]
 
-        return [r['generated_text'] for r in results]
+        return self.predict_in_batches(texts, self.count_tokens(texts, tokenizer=self.model.tokenizer), _predict)
@@ -122,23 +122,11 @@ class XlNet(LanguageModels):
         target_mappings = target_mappings.to(self.device)
 
         # Prediction
-        results = []
         with torch.no_grad():
             outputs = self.model(input_ids=input_idxes, perm_mask=perm_masks, target_mapping=target_mappings,
                 mems=external_memory)
 
         # Selection
-        for output, target_token in zip(outputs[0], target_words):
-            target_token_logits = output[0]
-
-            seed = {'temperature': self.temperature, 'top_k': self.top_k, 'top_p': self.top_p}
-            target_token_logits = self.control_randomness(target_token_logits, seed)
-            target_token_logits, target_token_idxes = self.filtering(target_token_logits, seed)
-            if len(target_token_idxes) != 0:
-                new_tokens = self.pick(target_token_logits, target_token_idxes, target_word=target_token, 
-                    n=10, include_punctuation=include_punctuation)
-                results.append([t[0] for t in new_tokens])
-            else:
-                results.append([''])
-
-        return results
+        new_tokens = self.pick_batch(outputs[0][:, 0], target_words=target_words, n=10,
+            include_punctuation=include_punctuation)
+        return [[t[0] for t in tokens] or [''] for tokens in new_tokens]
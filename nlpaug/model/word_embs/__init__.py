@@ -1,4 +1,6 @@
 from __future__ import absolute_import
+from nlpaug.model.word_embs.ann import *
+from nlpaug.model.word_embs.neighbour_table import *
 from nlpaug.model.word_embs.word_embeddings import *
 from nlpaug.model.word_embs.glove import *
 from nlpaug.model.word_embs.word2vec import *
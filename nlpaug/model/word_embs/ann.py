@@ -0,0 +1,157 @@
+import json
+import os
+
+import numpy as np
+
+from nlpaug.util.shared_array import share_arrays, release_arrays, get_shared_state, set_shared_state
+
+
+class IvfIndex:
+    """
+    Approximate nearest neighbour index (inverted file) for cosine similarity. Vectors are clustered by spherical
+    k-means. Only vectors of the `n_probe` closest clusters are scored at search time instead of whole vocabulary.
+    Index only stores cluster information. Vectors are passed at search time so that they are not duplicated.
+
+    :param int n_list: Number of clusters. Default value is square root of number of vectors.
+    :param int n_probe: Number of clusters will be scanned per search. Larger value, more accurate but slower.
+
+    >>> from nlpaug.model.word_embs.ann import IvfIndex
+    >>> index = IvfIndex().build(vectors)
+    >>> index.save('glove.6B.50d.txt.ivf')
+    """
+
+    CONFIG_FILE_NAME = 'config.json'
+    ARRAY_NAMES = ['centroids', 'offsets', 'ids']
+
+    def __init__(self, n_list=None, n_probe=8):
+        self.n_list = n_list
+        self.n_probe = n_probe
+
+        self.centroids = None  # [n_list, emb_size] float32, l2 normalized
+        self.offsets = None  # [n_list + 1] int64. ids[offsets[i]:offsets[i+1]] belong to i-th cluster
+        self.ids = None  # [vocab_size] int32. Vector indexes grouped by cluster
+
+    @classmethod
+    def _normalize(cls, vectors):
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return (vectors / norms).astype(np.float32)
+
+    def _assign(self, vectors, centroids, block_size):
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), block_size):
+            block = self._normalize(np.asarray(vectors[start:start+block_size], dtype=np.float32))
+            assignments[start:start+block_size] = np.argmax(block @ centroids.T, axis=1)
+        return assignments
+
+    def build(self, vectors, n_iter=10, sample_size=None, block_size=65536, seed=None):
+        """
+        :param numpy.ndarray vectors: Embeddings with shape [vocab_size, emb_size]. Memory-mapped array is supported.
+        :param int n_iter: Number of k-means iterations.
+        :param int sample_size: Number of vectors used for training cluster. Default value is 64 * n_list.
+        :param int block_size: Number of vectors processed at once when assigning clusters.
+        :param int seed: Random seed for reproducing index.
+        :return: Index itself
+        """
+        vocab_size = len(vectors)
+        n_list = self.n_list or max(1, int(np.sqrt(vocab_size)))
+        n_list = min(n_list, vocab_size)
+        random_state = np.random.RandomState(seed)
+
+        sample_size = min(vocab_size, sample_size or 64 * n_list)
+        sample_idxes = np.sort(random_state.choice(vocab_size, size=sample_size, replace=False))
+        samples = self._normalize(np.asarray(vectors[sample_idxes], dtype=np.float32))
+
+        centroids = samples[random_state.choice(sample_size, size=n_list, replace=False)]
+        for _ in range(n_iter):
+            assignments = np.argmax(samples @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, samples)
+            counts = np.bincount(assignments, minlength=n_list)
+
+            # Re-seed empty cluster by random sample
+            empty_idxes = np.flatnonzero(counts == 0)
+            sums[empty_idxes] = samples[random_state.choice(sample_size, size=len(empty_idxes))]
+            centroids = self._normalize(sums)
+
+        assignments = self._assign(vectors, centroids, block_size)
+        order = np.argsort(assignments, kind='stable')
+
+        self.n_list = n_list
+        self.centroids = centroids
+        self.ids = order.astype(np.int32)
+        self.offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(assignments, minlength=n_list))]).astype(np.int64)
+        return self
+
+    def search(self, query, top_k, vectors, norms=None, exclude_ids=None):
+        """
+        :param numpy.ndarray query: Query vector with shape [emb_size].
+        :param int top_k: Number of neighbours.
+        :param numpy.ndarray vectors: Embeddings which are used for building this index.
+        :param numpy.ndarray norms: L2 norm of embeddings. It will be calculated per candidate if None is passed.
+        :param list exclude_ids: Vector indexes which will not be returned (e.g. index of query word).
+        :return: Vector indexes of neighbours, most similar first.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1)
+
+        n_probe = min(self.n_probe, self.n_list)
+        cluster_scores = self.centroids @ query
+        cluster_idxes = np.argpartition(-cluster_scores, n_probe - 1)[:n_probe]
+        candidate_ids = np.concatenate(
+            [self.ids[self.offsets[i]:self.offsets[i+1]] for i in cluster_idxes])
+        if exclude_ids is not None:
+            candidate_ids = candidate_ids[~np.isin(candidate_ids, exclude_ids)]
+        if len(candidate_ids) == 0:
+            return []
+
+        candidate_ids = np.sort(candidate_ids)  # sequential access for memory-mapped vectors
+        candidate_norms = norms[candidate_ids] if norms is not None else np.linalg.norm(
+            vectors[candidate_ids], axis=1)
+        candidate_norms = np.where(candidate_norms == 0, 1, candidate_norms)
+        scores = (vectors[candidate_ids] @ query) / candidate_norms
+
+        top_k = min(top_k, len(candidate_ids))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        return candidate_ids[best].tolist()
+
+    def share_memory(self):
+        share_arrays(self, self.ARRAY_NAMES)
+        return self
+
+    def release_shared_memory(self):
+        release_arrays(self)
+
+    def __getstate__(self):
+        return get_shared_state(self)
+
+    def __setstate__(self, state):
+        set_shared_state(self, state)
+
+    def save(self, index_path):
+        """
+        :param str index_path: Directory of index. It will be created if it does not exist.
+        """
+        os.makedirs(index_path, exist_ok=True)
+        for name in self.ARRAY_NAMES:
+            np.save(os.path.join(index_path, name + '.npy'), getattr(self, name))
+        with open(os.path.join(index_path, self.CONFIG_FILE_NAME), 'w') as f:
+            json.dump({'n_list': self.n_list, 'n_probe': self.n_probe}, f)
+
+    @classmethod
+    def load(cls, index_path, n_probe=None, mmap=True):
+        """
+        :param str index_path: Directory of index.
+        :param int n_probe: Override number of clusters will be scanned per search.
+        :param bool mmap: If True, arrays are memory-mapped instead of loading into memory.
+        :return: Index
+        """
+        with open(os.path.join(index_path, cls.CONFIG_FILE_NAME)) as f:
+            config = json.load(f)
+
+        index = cls(n_list=config['n_list'], n_probe=n_probe or config['n_probe'])
+        for name in cls.ARRAY_NAMES:
+            setattr(index, name, np.load(os.path.join(index_path, name + '.npy'), mmap_mode='r' if mmap else None))
+        return index
@@ -0,0 +1,121 @@
+import numpy as np
+
+from nlpaug.util.shared_array import share_arrays, release_arrays, get_shared_state, set_shared_state
+
+
+class NeighbourTable:
+    """
+    Precomputed top k most similar (cosine similarity) words of the first `num_word` vocabulary entries. Table is an
+    int32 matrix with shape [num_word, top_k]. i-th row contains vector indexes of neighbours of i-th word (most
+    similar first, excluding itself). Word embeddings are usually sorted by frequency so that the first entries cover
+    most of lookups.
+
+    >>> from nlpaug.model.word_embs.neighbour_table import NeighbourTable
+    >>> table = NeighbourTable().build(vectors, num_word=200000, top_k=101)
+    >>> table.save('glove.6B.50d.txt.neighbours.npy')
+    """
+
+    def __init__(self, table=None):
+        self.table = table
+
+    @classmethod
+    def _norms(cls, vectors, block_size):
+        norms = np.empty(len(vectors), dtype=np.float32)
+        for start in range(0, len(vectors), block_size):
+            norms[start:start+block_size] = np.linalg.norm(
+                np.asarray(vectors[start:start+block_size], dtype=np.float32), axis=1)
+        norms[norms == 0] = 1
+        return norms
+
+    def build(self, vectors, num_word=None, top_k=100, block_size=1024, col_block_size=262144):
+        """
+        :param numpy.ndarray vectors: Embeddings with shape [vocab_size, emb_size]. Memory-mapped array is supported.
+        :param int num_word: Number of words (from the beginning of vocabulary) will be precomputed. Default value is
+            whole vocabulary.
+        :param int top_k: Number of neighbours per word.
+        :param int block_size: Number of words processed at once.
+        :param int col_block_size: Number of vocabulary entries compared at once. Memory usage is
+            block_size x col_block_size x 4 bytes.
+        :return: Table itself
+        """
+        vocab_size = len(vectors)
+        num_word = min(num_word or vocab_size, vocab_size)
+        top_k = min(top_k, vocab_size - 1)
+        norms = self._norms(vectors, col_block_size)
+
+        table = np.empty((num_word, top_k), dtype=np.int32)
+        for start in range(0, num_word, block_size):
+            end = min(start + block_size, num_word)
+            rows = np.asarray(vectors[start:end], dtype=np.float32) / norms[start:end, np.newaxis]
+            row_idxes = np.arange(end - start)
+
+            best_scores = np.full((end - start, 0), -np.inf, dtype=np.float32)
+            best_ids = np.empty((end - start, 0), dtype=np.int64)
+            for col_start in range(0, vocab_size, col_block_size):
+                col_end = min(col_start + col_block_size, vocab_size)
+                scores = (rows @ np.asarray(vectors[col_start:col_end], dtype=np.float32).T) / norms[col_start:col_end]
+
+                # Exclude word itself
+                self_cols = np.arange(start, end) - col_start
+                in_block = (self_cols >= 0) & (self_cols < col_end - col_start)
+                scores[row_idxes[in_block], self_cols[in_block]] = -np.inf
+
+                # Merge with best candidates of previous blocks
+                scores = np.concatenate([best_scores, scores], axis=1)
+                ids = np.concatenate(
+                    [best_ids, np.broadcast_to(np.arange(col_start, col_end), (end - start, col_end - col_start))],
+                    axis=1)
+                k = min(top_k, scores.shape[1])
+                best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(scores, best, axis=1)
+                best_ids = np.take_along_axis(ids, best, axis=1)
+
+            order = np.argsort(-best_scores, axis=1, kind='stable')
+            table[start:end] = np.take_along_axis(best_ids, order, axis=1)
+
+        self.table = table
+        return self
+
+    def size(self):
+        return 0 if self.table is None else self.table.shape[0]
+
+    def top_k(self):
+        return 0 if self.table is None else self.table.shape[1]
+
+    def lookup(self, idx, top_k):
+        """
+        :param int idx: Vector index of word.
+        :param int top_k: Number of neighbours.
+        :return: Vector indexes of neighbours. None if word is not precomputed or table does not have enough
+            neighbours.
+        """
+        if idx >= self.size() or top_k > self.top_k():
+            return None
+        return self.table[idx, :top_k].tolist()
+
+    def share_memory(self):
+        share_arrays(self, ['table'])
+        return self
+
+    def release_shared_memory(self):
+        release_arrays(self)
+
+    def __getstate__(self):
+        return get_shared_state(self)
+
+    def __setstate__(self, state):
+        set_shared_state(self, state)
+
+    def save(self, table_path):
+        """
+        :param str table_path: Path of table (.npy).
+        """
+        np.save(table_path, self.table)
+
+    @classmethod
+    def load(cls, table_path, mmap=True):
+        """
+        :param str table_path: Path of table (.npy).
+        :param bool mmap: If True, table is memory-mapped instead of loading into memory.
+        """
+        return cls(np.load(table_path, mmap_mode='r' if mmap else None))
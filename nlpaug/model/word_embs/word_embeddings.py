@@ -1,21 +1,131 @@
+import copy
+import os
+
+import numpy as np
+
+try:
+    from gensim.models import KeyedVectors
+except ImportError:
+    # No installation required if not using this function
+    pass
+
 import nlpaug.util.math.normalization as normalization
+from nlpaug.util.shared_array import SharedArray
+from nlpaug.model.word_embs.ann import IvfIndex
+from nlpaug.model.word_embs.neighbour_table import NeighbourTable
 
 
 class WordEmbeddings:
+    SNAPSHOT_VECTOR_FILE_NAME = 'vectors.npy'
+    SNAPSHOT_VOCAB_FILE_NAME = 'vocab.txt'
+
     def __init__(self, top_k=100, skip_check=True):
         self.top_k = top_k
         self.skip_check = skip_check
         self.emb_size = 0
         self.vocab_size = 0
         self.words = []
+        self.vocab_index = {}  # word -> vector index. Used for O(1) membership test
+        self.index = None
+        self.neighbour_table = None
+        self._shared_arrays = {}
 
     def read(self, file_path, max_num_vector):
         raise NotImplementedError
 
     def _read(self):
-        self.words = [self.model.index_to_key[i] for i in range(len(self.model.index_to_key))]
+        # Share vocabulary with gensim model instead of copying it
+        self.words = self.model.index_to_key
         self.emb_size = self.model[self.model.key_to_index[self.model.index_to_key[0]]]
         self.vocab_size = len(self.words)
+        # Reuse gensim's hashed vocabulary instead of building another one
+        self.vocab_index = self.model.key_to_index
+
+    @classmethod
+    def is_snapshot(cls, snapshot_path):
+        return os.path.isfile(os.path.join(snapshot_path, cls.SNAPSHOT_VECTOR_FILE_NAME)) and \
+            os.path.isfile(os.path.join(snapshot_path, cls.SNAPSHOT_VOCAB_FILE_NAME))
+
+    def save_snapshot(self, snapshot_path, dtype='float32'):
+        """
+        Save embeddings as raw numpy array and vocabulary as plain text (one word per line). Loading snapshot is much
+        faster than parsing original word2vec/ GloVe/ fastText file.
+
+        :param str snapshot_path: Directory of snapshot. It will be created if it does not exist.
+        :param str dtype: Either 'float32' or 'float16'. 'float16' halves file size with slightly lower precision.
+
+        >>> model.save_snapshot('glove.840B.300d.snapshot')
+        """
+        os.makedirs(snapshot_path, exist_ok=True)
+        np.save(os.path.join(snapshot_path, self.SNAPSHOT_VECTOR_FILE_NAME), self.model.vectors.astype(dtype))
+        # Newline is not translated so that word containing separator (e.g. '\r') is kept in its line
+        with open(os.path.join(snapshot_path, self.SNAPSHOT_VOCAB_FILE_NAME), 'w', encoding='utf-8', newline='') as f:
+            f.write('\n'.join(self.model.index_to_key))
+
+    def load_snapshot(self, snapshot_path, mmap=True):
+        """
+        :param str snapshot_path: Directory of snapshot which is saved by `save_snapshot`.
+        :param bool mmap: If True, vectors are memory-mapped (read-only) so that processes share same pages.
+
+        >>> model = nmw.GloVe()
+        >>> model.load_snapshot('glove.840B.300d.snapshot')
+        """
+        vectors = np.load(os.path.join(snapshot_path, self.SNAPSHOT_VECTOR_FILE_NAME), mmap_mode='r' if mmap else None)
+        with open(os.path.join(snapshot_path, self.SNAPSHOT_VOCAB_FILE_NAME), encoding='utf-8', newline='') as f:
+            words = f.read().split('\n')
+
+        model = KeyedVectors(vector_size=vectors.shape[1], dtype=vectors.dtype)
+        model.vectors = vectors
+        model.index_to_key = words
+        model.key_to_index = {word: i for i, word in enumerate(words)}
+        self.model = model
+        self._read()
+
+    def share_memory(self):
+        """
+        Place embeddings (and index/ neighbour table if any) in shared memory. Memory-mapped snapshot is referenced by
+        file instead. When this model is pickled to worker processes (e.g. `aug.augment(data, executor='process')`),
+        workers attach to the same memory instead of receiving a copy. Vocabulary is still copied per worker.
+
+        >>> aug.model.share_memory()
+        >>> aug.augment(data, num_thread=16, executor='process')
+        """
+        self.model.fill_norms()
+        for name in ['vectors', 'norms']:
+            if name not in self._shared_arrays:
+                self._shared_arrays[name] = SharedArray.from_array(getattr(self.model, name))
+                setattr(self.model, name, self._shared_arrays[name].array)
+
+        if self.index is not None:
+            self.index.share_memory()
+        if self.neighbour_table is not None:
+            self.neighbour_table.share_memory()
+        return self
+
+    def release_shared_memory(self):
+        for name, shared in self._shared_arrays.items():
+            setattr(self.model, name, np.array(shared.array))
+            shared.release()
+        self._shared_arrays = {}
+
+        if self.index is not None:
+            self.index.release_shared_memory()
+        if self.neighbour_table is not None:
+            self.neighbour_table.release_shared_memory()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self._shared_arrays:
+            # Only reference of shared arrays is pickled
+            state['model'] = copy.copy(self.model)
+            for name in self._shared_arrays:
+                setattr(state['model'], name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for name, shared in self._shared_arrays.items():
+            setattr(self.model, name, shared.array)
 
     def download(self, model_path):
         raise NotImplementedError
@@ -23,6 +133,17 @@ class WordEmbeddings:
     def get_vocab(self):
         return self.words
 
+    def contains(self, word):
+        return word in self.vocab_index
+
+    def contains_many(self, tokens):
+        """
+        :param list tokens: List of token
+        :return: List of boolean. True if corresponding token is in vocabulary.
+        """
+        vocab_index = self.vocab_index
+        return [token in vocab_index for token in tokens]
+
     @classmethod
     def _normalize(cls, vectors, norm='l2'):
         if norm == 'l2':
@@ -32,7 +153,78 @@ class WordEmbeddings:
         elif norm == 'standard':
             return normalization.standard_norm(vectors)
 
+    def build_index(self, n_list=None, n_probe=8, n_iter=10, seed=None):
+        """
+        Build approximate nearest neighbour index for `predict`. It only needs to be built once per embeddings. Use
+        `save_index` to persist it.
+
+        :param int n_list: Number of clusters. Default value is square root of vocabulary size.
+        :param int n_probe: Number of clusters will be scanned per lookup.
+        :param int n_iter: Number of k-means iterations.
+        :param int seed: Random seed for reproducing index.
+        """
+        self.index = IvfIndex(n_list=n_list, n_probe=n_probe).build(self.model.vectors, n_iter=n_iter, seed=seed)
+        return self.index
+
+    def save_index(self, index_path):
+        self.index.save(index_path)
+
+    def load_index(self, index_path, n_probe=None):
+        """
+        :param str index_path: Directory of index which is saved by `save_index`. Index is memory-mapped.
+        :param int n_probe: Override number of clusters will be scanned per lookup.
+        """
+        self.index = IvfIndex.load(index_path, n_probe=n_probe)
+        return self.index
+
+    def init_index(self, index_path, n_probe=8):
+        # Load index if it exists. Otherwise, build and save it for next time.
+        if os.path.exists(index_path):
+            return self.load_index(index_path, n_probe=n_probe)
+        self.build_index(n_probe=n_probe)
+        self.save_index(index_path)
+        return self.index
+
+    def build_neighbour_table(self, num_word=None, top_k=None, block_size=1024):
+        """
+        Precompute neighbours of the first `num_word` words so that `predict` becomes a table lookup for them. Other
+        words fall back to index (if any) or exact search. Use `save_neighbour_table` to persist it.
+
+        :param int num_word: Number of words (from the beginning of vocabulary) will be precomputed. Default value is
+            whole vocabulary.
+        :param int top_k: Number of neighbours per word. Default value is top_k + 1 of this model.
+        :param int block_size: Number of words processed at once.
+        """
+        top_k = top_k or self.top_k + 1
+        self.neighbour_table = NeighbourTable().build(
+            self.model.vectors, num_word=num_word, top_k=top_k, block_size=block_size)
+        return self.neighbour_table
+
+    def save_neighbour_table(self, table_path):
+        self.neighbour_table.save(table_path)
+
+    def load_neighbour_table(self, table_path):
+        """
+        :param str table_path: Path of table which is saved by `save_neighbour_table`. Table is memory-mapped.
+        """
+        self.neighbour_table = NeighbourTable.load(table_path)
+        return self.neighbour_table
+
     def predict(self, word, n=1):
-        result = self.model.most_similar(word, topn=self.top_k+1)
-        result = [w for w, s in result if w.lower() != word.lower()]
+        word_idx = self.model.key_to_index[word]
+        idxes = None
+        if self.neighbour_table is not None:
+            idxes = self.neighbour_table.lookup(word_idx, self.top_k+1)
+
+        if idxes is not None:
+            result = [self.model.index_to_key[i] for i in idxes]
+        elif self.index is not None:
+            self.model.fill_norms()
+            idxes = self.index.search(
+                self.model.vectors[word_idx], self.top_k+1, vectors=self.model.vectors, norms=self.model.norms,
+                exclude_ids=[word_idx])
+            result = [self.model.index_to_key[i] for i in idxes]
+        else:
+            result = [w for w, s in self.model.most_similar(word, topn=self.top_k+1)]
+        result = [w for w in result if w.lower() != word.lower()]
         return result[:self.top_k]
@@ -9,6 +9,7 @@ import math
 import numpy as np
 
 from nlpaug.model.word_stats import WordStatistics
+from nlpaug.util.shared_array import share_arrays, release_arrays, get_shared_state, set_shared_state
 
 
 class TfIdf(WordStatistics):
@@ -73,6 +74,7 @@ class TfIdf(WordStatistics):
         return idf
 
     def train(self, data):
+        release_arrays(self)
         self.w2idf = self.cal_idf(data)
         self.tokens = []
         self.tfidf_scores = []
@@ -104,6 +106,7 @@ class TfIdf(WordStatistics):
                 f.write(str(w) + ' ' + str(s) + '\n')
 
     def read(self, model_path):
+        release_arrays(self)
         self.w2idf = {}
         self.w2tfidf = {}
 
@@ -127,6 +130,23 @@ class TfIdf(WordStatistics):
         self.tokens = list(self.w2tfidf.keys())
         self.tfidf_scores = list(self.w2tfidf.values())
 
+    def share_memory(self):
+        """
+        Place TF-IDF scores in shared memory so that worker processes (e.g. `aug.augment(data, executor='process')`)
+        attach to it instead of receiving a copy.
+        """
+        share_arrays(self, ['tfidf_scores'])
+        return self
+
+    def release_shared_memory(self):
+        release_arrays(self)
+
+    def __getstate__(self):
+        return get_shared_state(self)
+
+    def __setstate__(self, state):
+        set_shared_state(self, state)
+
     def predict(self, data, top_k):
         target_idxes = self.choice(self.tokens, p=self.tfidf_scores, size=top_k)
         target_words = [self.tokens[i] for i in target_idxes]
@@ -11,3 +11,5 @@ from nlpaug.util.decorator import *
 from nlpaug.util.logger import *
 from nlpaug.util.selection import *
 from nlpaug.util.model_cache import *
+from nlpaug.util.translation_cache import *
+from nlpaug.util.shared_array import *
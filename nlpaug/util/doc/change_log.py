@@ -2,6 +2,8 @@ from nlpaug.util.doc.token import Token
 
 
 class ChangeLog:
+    __slots__ = ('orig_token', 'change_logs', '_is_changed')
+
     def __init__(self, orig_token):
         self.orig_token = orig_token
         self.change_logs = []
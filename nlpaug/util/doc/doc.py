@@ -3,64 +3,129 @@ from nlpaug.util.doc.change_log import ChangeLog
 
 
 class Doc:
+    """
+    Tokens of document and their changes. Tokens are kept as parallel lists and changes of a token are buffered until
+    its ChangeLog is requested (e.g. get_token or get_change_logs) so that augmenter which does not return change logs
+    does not build Token and ChangeLog objects per token.
+    """
+
     def __init__(self, doc='', tokens=None):
         self.doc = doc
-        if tokens is not None and len(tokens) > 0:
-            self.tokens = self.token2obj(tokens)
-        else:
-            self.tokens = []
+        self._source_tokens = list(tokens) if tokens else []
+        self._source_start_poses = None
+        # Index of source token (-1 for inserted token) of each token. It is used to look up original position.
+        self._source_idxes = list(range(len(self._source_tokens)))
+        self._orig_tokens = list(self._source_tokens)
+        self._latest_tokens = list(self._source_tokens)
+        # Buffered changes (token, action, change_seq) of token which ChangeLog is not built yet
+        self._pending_changes = [None] * len(self._source_tokens)
+        self._change_logs = [None] * len(self._source_tokens)
         self.changed_cnt = 0
 
-    def token2obj(self, tokens):
-        objs = []
+    @property
+    def tokens(self):
+        return [self.get_token(i) for i in range(self.size())]
+
+    def _get_source_start_pos(self, source_idx):
+        if self._source_start_poses is None:
+            self._source_start_poses = self.token2pos(self._source_tokens)
+        return self._source_start_poses[source_idx]
+
+    def token2pos(self, tokens):
+        """
+        :param list tokens: Tokens of document
+        :return: Start position of each token. Document is scanned once.
+        """
+        results = []
         start_pos = 0
         for t in tokens:
-            token_obj = Token(token=t, start_pos=start_pos+self.doc[start_pos:].find(t))
-            change_log = ChangeLog(orig_token=token_obj)
-            objs.append(change_log)
+            pos = self.doc.find(t, start_pos)
+            if pos < 0:
+                # Same as finding token in remaining document
+                pos = start_pos - 1 if t else start_pos
+            results.append(pos)
 
-            start_pos += len(token_obj.token)
+            start_pos += len(t)
             start_pos += 1 # TODO: for textual only
 
-        return objs
+        return results
+
+    def token2obj(self, tokens):
+        return [
+            ChangeLog(orig_token=Token(token=t, start_pos=start_pos))
+            for t, start_pos in zip(tokens, self.token2pos(tokens))]
 
     def add_token(self, idx, token, action, change_seq):
         token_obj = Token(token=token, start_pos=-1, action=action, change_seq=change_seq)
-        change_log = ChangeLog(orig_token=token_obj)
-        self.tokens.insert(idx, change_log)
+        self._source_idxes.insert(idx, -1)
+        self._orig_tokens.insert(idx, token)
+        self._latest_tokens.insert(idx, token)
+        self._pending_changes.insert(idx, None)
+        self._change_logs.insert(idx, ChangeLog(orig_token=token_obj))
 
     def add_change_log(self, idx, new_token, action, change_seq):
         self.changed_cnt += 1
-        self.tokens[idx].add(new_token, action=action, change_seq=change_seq)
+        change_log = self._change_logs[idx]
+        if change_log is not None:
+            change_log.add(new_token, action=action, change_seq=change_seq)
+            return
+
+        if self._pending_changes[idx] is None:
+            self._pending_changes[idx] = []
+        self._pending_changes[idx].append((new_token, action, change_seq))
+        self._latest_tokens[idx] = new_token
 
     def update_change_log(self, token_idx, change_idx=None, token=None, action=None, change_seq=None):
-        change_idx = self.tokens[token_idx].size() if change_idx is None else change_idx
-        self.tokens[token_idx].update(change_idx, token=token, action=action, change_seq=change_seq)
+        change_log = self.get_token(token_idx)
+        change_idx = change_log.size() if change_idx is None else change_idx
+        change_log.update(change_idx, token=token, action=action, change_seq=change_seq)
 
     def get_token(self, idx):
-        return self.tokens[idx]
+        change_log = self._change_logs[idx]
+        if change_log is None:
+            source_idx = self._source_idxes[idx]
+            change_log = ChangeLog(orig_token=Token(
+                token=self._orig_tokens[idx], start_pos=self._get_source_start_pos(source_idx)))
+            for token, action, change_seq in self._pending_changes[idx] or []:
+                change_log.add(token, action=action, change_seq=change_seq)
+            self._pending_changes[idx] = None
+            self._change_logs[idx] = change_log
+        return change_log
+
+    def _get_latest_tokens(self):
+        return [
+            t if change_log is None else change_log.get_latest_token().token
+            for t, change_log in zip(self._latest_tokens, self._change_logs)]
 
     def get_original_tokens(self):
-        return [t.orig_token.token for t in self.tokens]
+        return list(self._orig_tokens)
 
     def get_augmented_tokens(self):
-        return [t.get_latest_token().token for t in self.tokens if len(t.get_latest_token().token) > 0]
+        return [t for t in self._get_latest_tokens() if len(t) > 0]
 
     def size(self):
-        return len(self.tokens)
+        return len(self._orig_tokens)
 
     def changed_count(self):
         return self.changed_cnt
 
     def get_change_logs(self, start_pos=0):
-        for i, t in enumerate(self.tokens):
-            self.tokens[i].update_last_token(start_pos)
-
-            start_pos += len(t.get_latest_token().token)
-            if len(t.get_latest_token().token) > 0:
+        # Only changed tokens are returned so that ChangeLog of others is not needed
+        changed_idxes = [
+            i for i, (change_log, pending_changes) in enumerate(zip(self._change_logs, self._pending_changes))
+            if (change_log is not None and change_log.is_changed()) or pending_changes]
+        change_logs = [self.get_token(i) for i in changed_idxes]
+        change_logs = [c for c in change_logs if c.is_changed()]
+        changed_idxes = set(changed_idxes)
+
+        for i, t in enumerate(self._get_latest_tokens()):
+            if i in changed_idxes:
+                self._change_logs[i].update_last_token(start_pos)
+
+            start_pos += len(t)
+            if len(t) > 0:
                 # TODO: for textual only
                 start_pos += 1
 
-        change_logs = [t for t in self.tokens if t.is_changed()]
         change_logs.sort(key=lambda x: x.get_latest_token().change_seq)
         return [c.to_changed_dict() for c in change_logs]
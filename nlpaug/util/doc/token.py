@@ -1,4 +1,6 @@
 class Token:
+    __slots__ = ('_token', '_start_pos', '_action', '_change_seq')
+
     def __init__(self, token, start_pos=-1, action='', change_seq=0):
         self._token = token
         self._start_pos = start_pos
@@ -1,24 +1,237 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def estimate_model_size(model, max_depth=4):
+    """
+    Approximate memory usage (in bytes) of model by summing up numpy arrays and torch tensors which are reachable
+    from its attributes. Memory-mapped arrays are not counted as they are backed by file.
+
+    :param object model: Model object
+    :param int max_depth: Maximum depth of attributes will be visited.
+    :return: Number of bytes
+    """
+    torch = sys.modules.get('torch')
+    visited = set()
+
+    def _size(obj, depth):
+        if obj is None or id(obj) in visited or depth > max_depth:
+            return 0
+        visited.add(id(obj))
+
+        if isinstance(obj, np.memmap):
+            return 0
+        if isinstance(obj, np.ndarray):
+            return obj.nbytes
+        if torch is not None:
+            if isinstance(obj, torch.Tensor):
+                return obj.numel() * obj.element_size()
+            if isinstance(obj, torch.nn.Module):
+                return sum(t.numel() * t.element_size() for t in list(obj.parameters()) + list(obj.buffers()))
+        if isinstance(obj, (str, bytes, int, float, bool)):
+            return 0
+        if isinstance(obj, dict):
+            # Do not walk through large dictionary (e.g. vocabulary) item by item
+            return sys.getsizeof(obj) + sum(_size(v, depth + 1) for v in list(obj.values())[:100])
+        if isinstance(obj, (list, tuple, set)):
+            return sys.getsizeof(obj) + sum(_size(v, depth + 1) for v in list(obj)[:100])
+        if hasattr(obj, '__dict__'):
+            return sum(_size(v, depth + 1) for v in vars(obj).values())
+        return 0
+
+    return _size(model, 0)
+
+
+def get_model_key(model_path):
+    """
+    :param str model_path: Model name or model path.
+    :return: Absolute path of local model so that models with same file name in different directories (e.g.
+        a/vectors.bin and b/vectors.bin) do not share key. Other names (e.g. model of Hugging Face Hub) are returned
+        as they are.
+    """
+    return os.path.abspath(model_path) if os.path.exists(model_path) else model_path
+
+
 class ModelCache:
-    def __init__(self):
-        self._models = {}
+    """
+    Process-wide, thread-safe model registry with LRU eviction. Model is loaded once per key even if several threads
+    request it concurrently.
+
+    :param int max_entries: Maximum number of cached models. Default value is None which means no limit.
+    :param int max_bytes: Approximate memory budget (in bytes) of cached models. Least recently used models are
+        evicted when it is exceeded. Default value is None which means no limit.
+    :param bool empty_cuda_cache: If True, `torch.cuda.empty_cache()` is called after eviction.
+
+    >>> from nlpaug.util import MODEL_CACHE
+    >>> MODEL_CACHE.configure(max_entries=3, max_bytes=8 * 1024 ** 3)
+    >>> MODEL_CACHE.stats()
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, empty_cuda_cache=True):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.empty_cuda_cache = empty_cuda_cache
+
+        self._models = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.RLock()
+        self._key_locks = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+        self._load_time = 0.
+        self._evictions = 0
+
+    def configure(self, max_entries=None, max_bytes=None, empty_cuda_cache=None):
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            if empty_cuda_cache is not None:
+                self.empty_cuda_cache = empty_cuda_cache
+            self._evict()
+
+    def namespace(self, name):
+        """
+        :param str name: Namespace of keys (e.g. augmenter type).
+        :return: View of this cache whose keys are prefixed by name. Eviction and statistics are shared.
+        """
+        return ModelCacheView(self, name)
 
     def get(self, key):
-        return self._models.get(key)
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._models.move_to_end(key)
+            return model
+
+    def keys(self):
+        with self._lock:
+            return list(self._models.keys())
+
+    def remove(self, key):
+        with self._lock:
+            self._models.pop(key, None)
+            self._sizes.pop(key, None)
 
     def clear(self):
-        self._models.clear()
+        with self._lock:
+            self._models.clear()
+            self._sizes.clear()
+        self._empty_cuda_cache()
+
+    def _get_cached(self, key, updates):
+        model = self._models.get(key)
+        if model is None:
+            return None
+        self._hits += 1
+        self._models.move_to_end(key)
+        self._apply_updates(model, updates)
+        return model
+
+    def get_or_create(self, key, factory, force_reload=False, updates=None, size=None):
+        """
+        :param object key: Key of model
+        :param func factory: Function for loading model. It is only called when model is not cached.
+        :param bool force_reload: If True, model will be loaded even if it is cached.
+        :param dict updates: Attributes will be set to cached model.
+        :param int size: Memory usage (in bytes) of model. It will be estimated if None is passed.
+        :return: Model
+        """
+        with self._lock:
+            if not force_reload:
+                cached = self._get_cached(key, updates)
+                if cached is not None:
+                    return cached
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
 
-    def get_or_create(self, key, factory, force_reload=False, updates=None):
-        if not force_reload:
-            cached = self._models.get(key)
-            if cached is not None:
-                self._apply_updates(cached, updates)
-                return cached
+        # Only one thread loads model of this key. Others wait and reuse it.
+        with key_lock:
+            try:
+                with self._lock:
+                    if not force_reload:
+                        cached = self._get_cached(key, updates)
+                        if cached is not None:
+                            return cached
+                    self._misses += 1
+
+                start_time = time.perf_counter()
+                model = factory()
+                load_time = time.perf_counter() - start_time
+                size = estimate_model_size(model) if size is None else size
+
+                with self._lock:
+                    self._models[key] = model
+                    self._models.move_to_end(key)
+                    self._sizes[key] = size
+                    self._loads += 1
+                    self._load_time += load_time
+                    self._evict(keep_key=key)
+            finally:
+                # Lock is released even if factory raises so that failed keys do not stay in lock dict
+                with self._lock:
+                    if self._key_locks.get(key) is key_lock:
+                        del self._key_locks[key]
 
-        model = factory()
-        self._models[key] = model
         return model
 
+    def _total_bytes(self):
+        return sum(self._sizes.values())
+
+    def _is_over_budget(self):
+        if self.max_entries is not None and len(self._models) > self.max_entries:
+            return True
+        if self.max_bytes is not None and self._total_bytes() > self.max_bytes:
+            return True
+        return False
+
+    def _evict(self, keep_key=None):
+        evicted = False
+        while self._is_over_budget():
+            candidates = [k for k in self._models if k != keep_key]
+            if not candidates:
+                break
+            # Least recently used first
+            self.remove(candidates[0])
+            self._evictions += 1
+            evicted = True
+
+        if evicted:
+            self._empty_cuda_cache()
+
+    def _empty_cuda_cache(self):
+        torch = sys.modules.get('torch')
+        if self.empty_cuda_cache and torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def stats(self):
+        """
+        :return: Dictionary of hits, misses, loads, load_time (seconds), evictions, entries and bytes (approximate).
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'loads': self._loads,
+                'load_time': self._load_time,
+                'evictions': self._evictions,
+                'entries': len(self._models),
+                'bytes': self._total_bytes(),
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits = self._misses = self._loads = self._evictions = 0
+            self._load_time = 0.
+
     @staticmethod
     def _apply_updates(model, updates):
         if not updates:
@@ -26,3 +239,44 @@ class ModelCache:
 
         for attr, value in updates.items():
             setattr(model, attr, value)
+
+
+class ModelCacheView:
+    """
+    Keys of view are prefixed by namespace so that different augmenters do not conflict with each other while all of
+    them share same budget of `MODEL_CACHE`.
+    """
+
+    def __init__(self, cache, name):
+        self.cache = cache
+        self.name = name
+
+    def _key(self, key):
+        return (self.name, key)
+
+    def get(self, key):
+        return self.cache.get(self._key(key))
+
+    def get_or_create(self, key, factory, force_reload=False, updates=None, size=None):
+        return self.cache.get_or_create(
+            self._key(key), factory, force_reload=force_reload, updates=updates, size=size)
+
+    def remove(self, key):
+        self.cache.remove(self._key(key))
+
+    def keys(self):
+        return [k[1] for k in self.cache.keys() if isinstance(k, tuple) and k[0] == self.name]
+
+    def clear(self):
+        for key in self.keys():
+            self.remove(key)
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+
+# Process-wide registry. All augmenters load models through it.
+MODEL_CACHE = ModelCache()
+# Small read-only lookup tables (e.g. keyboard and ocr mappings). They are kept apart from MODEL_CACHE so that they
+# are neither evicted by large models nor counted in its budget.
+LOOKUP_CACHE = ModelCache(max_entries=64, empty_cuda_cache=False)
@@ -118,3 +118,34 @@ def nucleus_sampling(data, p, replace=0, ascending=False, above=True):
         sorted_data[replace_idxes] = replace
 
     return sorted_data, idxes
+
+
+def filter_top_k_batch(data, k, replace=-float('Inf')):
+    """
+    Batched version of filter_top_k for pytorch's tensor. Every row keeps its top k values and the others are
+    replaced. Values which are equal to the kth value are kept.
+
+    :param tensor data: Input data with shape [number of rows, number of values]
+    :param int k: Number of top element will be reserved (or not replaced) per row
+    :param float replace: Default value is -inf. Input data will be replaced by this value if data match criteria.
+    :return: tensor Filtered result with same shape as input data
+    """
+    kth_values = torch.topk(data, k, dim=-1)[0][:, -1:]
+    return data.masked_fill(data < kth_values, replace)
+
+
+def nucleus_sampling_batch(data, p, replace=-float('Inf')):
+    """
+    Batched version of nucleus_sampling for pytorch's tensor. Same as nucleus_sampling, every row keeps values of
+    which cumulative probability (in descending order) is not larger than p. Unlike nucleus_sampling, data is not
+    sorted so that position of each value is its index.
+
+    :param tensor data: Input data with shape [number of rows, number of values]
+    :param float p: Probability for filtering (or be replaced)
+    :param float replace: Default value is -inf. Input data will be replaced by this value if data match criteria.
+    :return: tensor Filtered result with same shape as input data
+    """
+    sorted_data, sorted_indices = torch.sort(data, dim=-1, descending=True)
+    cum_probas = torch.cumsum(F.softmax(sorted_data, dim=-1), dim=-1)
+    replace_idxes = torch.zeros_like(cum_probas, dtype=torch.bool).scatter(-1, sorted_indices, cum_probas > p)
+    return data.masked_fill(replace_idxes, replace)
@@ -0,0 +1,127 @@
+import mmap
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+
+class SharedArray:
+    """
+    Read-only numpy array which can be shared across processes without copying. Array is placed in
+    `multiprocessing.shared_memory` (or referenced by file if it is memory-mapped already). Only reference (name,
+    shape and dtype) is pickled so worker processes attach to the same memory instead of receiving a copy.
+
+    >>> from nlpaug.util import SharedArray
+    >>> shared = SharedArray.from_array(vectors)
+    >>> vectors = shared.array
+    """
+
+    def __init__(self, shape, dtype, name=None, filename=None, offset=0):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.name = name
+        self.filename = filename
+        self.offset = offset
+
+        self._shm = None
+        self._array = None
+        self._is_owner = False
+
+    @classmethod
+    def from_array(cls, array):
+        """
+        :param numpy.ndarray array: Array will be shared. Memory-mapped array (e.g. loaded with mmap_mode='r') is
+            referenced by file. Otherwise, it is copied to shared memory once.
+        :return: SharedArray
+        """
+        # Only whole memory-mapped file can be referenced. Slice of it is copied.
+        if isinstance(array, np.memmap) and array.filename is not None and isinstance(array.base, mmap.mmap):
+            shared = cls(array.shape, array.dtype, filename=array.filename, offset=array.offset)
+            shared._array = array
+            return shared
+
+        array = np.ascontiguousarray(array)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        shared = cls(array.shape, array.dtype, name=shm.name)
+        shared._shm = shm
+        shared._is_owner = True
+        shared._array = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+        shared._array[...] = array
+        shared._array.flags.writeable = False
+        return shared
+
+    def _attach(self):
+        if self.filename is not None:
+            return np.memmap(self.filename, dtype=self.dtype, mode='r', shape=self.shape, offset=self.offset)
+
+        if sys.version_info >= (3, 13):
+            self._shm = shared_memory.SharedMemory(name=self.name, track=False)
+        else:
+            self._shm = shared_memory.SharedMemory(name=self.name)
+            # Only creator should unlink shared memory. Otherwise, it is removed when first worker exits.
+            resource_tracker.unregister(self._shm._name, 'shared_memory')
+        array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+        array.flags.writeable = False
+        return array
+
+    @property
+    def array(self):
+        if self._array is None:
+            self._array = self._attach()
+        return self._array
+
+    def release(self):
+        """
+        Detach from shared memory. Shared memory will be removed if it is created by this process. Arrays returned by
+        `array` must not be used afterward.
+        """
+        self._array = None
+        if self._shm is not None:
+            self._shm.close()
+            if self._is_owner:
+                self._shm.unlink()
+        self._shm = None
+        self._is_owner = False
+
+    def __getstate__(self):
+        return {
+            'shape': self.shape, 'dtype': self.dtype.str, 'name': self.name, 'filename': self.filename,
+            'offset': self.offset
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+def share_arrays(obj, names):
+    """
+    Replace numpy array attributes of object by shared one. Use `get_shared_state` and `set_shared_state` in
+    `__getstate__` and `__setstate__` of object so that shared arrays are not pickled.
+    """
+    shared_arrays = obj.__dict__.setdefault('_shared_arrays', {})
+    for name in names:
+        array = getattr(obj, name)
+        if array is None or name in shared_arrays:
+            continue
+        shared_arrays[name] = SharedArray.from_array(np.asarray(array) if isinstance(array, list) else array)
+        setattr(obj, name, shared_arrays[name].array)
+
+
+def release_arrays(obj):
+    for name, shared in obj.__dict__.get('_shared_arrays', {}).items():
+        setattr(obj, name, np.array(shared.array))
+        shared.release()
+    obj.__dict__['_shared_arrays'] = {}
+
+
+def get_shared_state(obj):
+    state = obj.__dict__.copy()
+    for name in state.get('_shared_arrays', {}):
+        state[name] = None
+    return state
+
+
+def set_shared_state(obj, state):
+    obj.__dict__.update(state)
+    for name, shared in state.get('_shared_arrays', {}).items():
+        setattr(obj, name, shared.array)
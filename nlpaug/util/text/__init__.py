@@ -1,2 +1,3 @@
 from nlpaug.util.text.tokenizer import *
+from nlpaug.util.text.stopword_matcher import *
 from nlpaug.util.text.part_of_speech import *
@@ -0,0 +1,84 @@
+import functools
+import re
+import string
+
+
+class StopwordMatcher:
+    """
+    Compiled stopwords which are checked per token by text augmenters. Literal stopwords are kept in frozenset and
+    result of stopwords_regex is memorized per distinct token so that each token is matched once regardless of number
+    of texts.
+
+    :param list stopwords: List of words which will be skipped from augment operation.
+    :param str stopwords_regex: Regular expression (or compiled one) for matching words which will be skipped from
+        augment operation.
+    :param bool case_sensitive: If False, tokens and stopwords are compared in lower case.
+
+    >>> from nlpaug.util.text.stopword_matcher import StopwordMatcher
+    >>> matcher = StopwordMatcher(stopwords=['the', 'a'], stopwords_regex='[0-9]+')
+    """
+
+    # Same as `token in string.punctuation` which also matches substring (e.g. '!"')
+    PUNCTUATIONS = frozenset(
+        string.punctuation[i:j] for i in range(len(string.punctuation) + 1)
+        for j in range(i, len(string.punctuation) + 1))
+    # Memorized regex results are dropped when number of distinct tokens exceeds it
+    MAX_CACHE_SIZE = 100000
+
+    def __init__(self, stopwords=None, stopwords_regex=None, case_sensitive=True):
+        self.case_sensitive = case_sensitive
+        self.stopwords = frozenset(self._fold(s) for s in stopwords) if stopwords else frozenset()
+        self.stopwords_regex = re.compile(stopwords_regex) if isinstance(stopwords_regex, str) else stopwords_regex
+        self._regex_results = {}
+
+    def _fold(self, token):
+        return token if self.case_sensitive else token.lower()
+
+    @classmethod
+    def is_punctuation(cls, token):
+        return token in cls.PUNCTUATIONS
+
+    def is_stopword(self, token):
+        return self._fold(token) in self.stopwords
+
+    def match_regex(self, token):
+        """
+        :param str token: Token
+        :return: True if stopwords_regex matches token itself or token surrounded by space.
+        """
+        if self.stopwords_regex is None:
+            return False
+
+        result = self._regex_results.get(token)
+        if result is None:
+            # https://github.com/makcedward/nlpaug/issues/81
+            regex = self.stopwords_regex
+            result = bool(
+                regex.match(token) or regex.match(' '+token+' ') or regex.match(' '+token) or
+                regex.match(token+' '))
+            if len(self._regex_results) >= self.MAX_CACHE_SIZE:
+                self._regex_results.clear()
+            self._regex_results[token] = result
+        return result
+
+    def is_skipped(self, token):
+        return self.is_stopword(token) or self.match_regex(token)
+
+
+def get_stopword_matcher(stopwords=None, stopwords_regex=None, case_sensitive=True):
+    """
+    :return: StopwordMatcher which is shared by augmenters with same stopwords and stopwords_regex.
+    """
+    regex_key = None
+    if stopwords_regex is not None:
+        regex_key = (stopwords_regex, 0) if isinstance(stopwords_regex, str) else \
+            (stopwords_regex.pattern, stopwords_regex.flags)
+    return _get_stopword_matcher(frozenset(stopwords) if stopwords else None, regex_key, case_sensitive)
+
+
+# Matchers are small and not models so that they are kept apart from MODEL_CACHE
+@functools.lru_cache(maxsize=128)
+def _get_stopword_matcher(stopwords, regex_key, case_sensitive):
+    return StopwordMatcher(
+        stopwords=stopwords, stopwords_regex=re.compile(*regex_key) if regex_key else None,
+        case_sensitive=case_sensitive)
@@ -5,6 +5,9 @@ ADDING_SPACE_AROUND_PUNCTUATION_REGEX = re.compile(r'(?<! )(?=[.,!?()])|(?<=[.,!
 SPLIT_WORD_REGEX = re.compile(r'\b.*?\S.*?(?:\b|$)')
 
 TOKENIZER_REGEX = re.compile(r'(\W)')
+# Same as splitting by TOKENIZER_REGEX and dropping whitespace pieces but done by single pass
+TOKEN_REGEX = re.compile(r'\w+|[^\w\s]')
+TOKEN_WITH_SPACE_REGEX = re.compile(r'(\w+|[^\w\s])(\s*)')
 DETOKENIZER_REGEXS = [
 	(re.compile(r'\s([.,:;?!%]+)([ \'"`])'), r'\1\2'), # End of sentence
 	(re.compile(r'\s([.,:;?!%]+)$'), r'\1'), # End of sentence
@@ -12,6 +15,18 @@ DETOKENIZER_REGEXS = [
 	(re.compile(r'\s([\]\)\}\>])\s'), r'\g<1> '), # right bracket
 ]
 
+# Detokenizing regexs which are applied to texts of whole batch. Texts are separated by BATCH_SEPARATOR which is
+# neither whitespace nor punctuation of DETOKENIZER_REGEXS so that regexs do not match across texts.
+BATCH_SEPARATOR = '\x00'
+BATCH_DETOKENIZER_REGEXS = [
+	(DETOKENIZER_REGEXS[0][0], DETOKENIZER_REGEXS[0][1]),
+	(re.compile(r'\s([.,:;?!%]+)(?=\n?\x00|$)'), r'\1'),
+	(DETOKENIZER_REGEXS[2][0], DETOKENIZER_REGEXS[2][1]),
+	(DETOKENIZER_REGEXS[3][0], DETOKENIZER_REGEXS[3][1]),
+]
+# Characters which are required by each DETOKENIZER_REGEXS. Regex is skipped if text does not contain any of them.
+DETOKENIZER_CHARS = [frozenset('.,:;?!%'), frozenset('.,:;?!%'), frozenset('[({<'), frozenset('])}>')]
+
 SENTENCE_SEPARATOR = '.!?'
 
 def add_space_around_punctuation(text):
@@ -20,15 +35,70 @@ def add_space_around_punctuation(text):
 def split_sentence(text):
     return SPLIT_WORD_REGEX.findall(text)
 
+def _detokenize(text, regexs):
+	for (regex, sub), chars in zip(regexs, DETOKENIZER_CHARS):
+		if not chars.isdisjoint(text):
+			text = regex.sub(sub, text)
+	return text
+
+
 class Tokenizer:
 	@staticmethod
 	def tokenizer(text):
-		tokens = TOKENIZER_REGEX.split(text)
-		return [t for t in tokens if len(t.strip()) > 0]
+		return TOKEN_REGEX.findall(text)
 
 	@staticmethod
 	def reverse_tokenizer(tokens):
-		text = ' '.join(tokens)
-		for regex, sub in DETOKENIZER_REGEXS:
-			text = regex.sub(sub, text)
-		return text.strip()
\ No newline at end of file
+		return _detokenize(' '.join(tokens), DETOKENIZER_REGEXS).strip()
+
+	@staticmethod
+	def tokenize_batch(texts):
+		"""
+		:param list texts: Texts
+		:return: Tokens of each text. Same as calling tokenizer per text.
+
+		>>> Tokenizer.tokenize_batch(['The quick brown fox', 'jumps over the lazy dog'])
+		"""
+		findall = TOKEN_REGEX.findall
+		return [findall(text) for text in texts]
+
+	@staticmethod
+	def detokenize_batch(tokens_list):
+		"""
+		:param list tokens_list: Tokens of each text
+		:return: Texts. Same as calling reverse_tokenizer per tokens but regexs are applied to whole batch at once.
+
+		>>> Tokenizer.detokenize_batch([['The', 'quick', 'brown', 'fox', '.'], ['Hello', ',', 'world']])
+		"""
+		texts = [' '.join(tokens) for tokens in tokens_list]
+		if any(BATCH_SEPARATOR in text for text in texts):
+			return [_detokenize(text, DETOKENIZER_REGEXS).strip() for text in texts]
+
+		text = _detokenize(BATCH_SEPARATOR.join(texts), BATCH_DETOKENIZER_REGEXS)
+		return [t.strip() for t in text.split(BATCH_SEPARATOR)]
+
+	@staticmethod
+	def tokenize_with_spaces(text):
+		"""
+		Same tokens as tokenizer and whitespaces around them so that text can be rebuilt exactly by
+		detokenize_with_spaces without any regex post-processing.
+
+		:param str text: Text
+		:return: Tokens and whitespaces. First whitespace is leading one and whitespaces[i+1] follows tokens[i].
+
+		>>> tokens, spaces = Tokenizer.tokenize_with_spaces('Hello,  world')
+		"""
+		pairs = TOKEN_WITH_SPACE_REGEX.findall(text)
+		leading = text[:len(text) - len(text.lstrip())] if pairs else text
+		return [token for token, _ in pairs], [leading] + [space for _, space in pairs]
+
+	@staticmethod
+	def detokenize_with_spaces(tokens, spaces):
+		"""
+		:param list tokens: Tokens (may be augmented)
+		:param list spaces: Whitespaces from tokenize_with_spaces
+		:return: Text. Whitespace of unchanged tokens is kept as original.
+
+		>>> Tokenizer.detokenize_with_spaces(*Tokenizer.tokenize_with_spaces('Hello,  world'))
+		"""
+		return spaces[0] + ''.join([token + space for token, space in zip(tokens, spaces[1:])])
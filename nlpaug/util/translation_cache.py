@@ -0,0 +1,149 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+class TranslationCache:
+    """
+    Persistent translation cache backed by SQLite. Translation is keyed by hash of source text and namespace (e.g.
+    model pair and generation parameters) so that same corpus does not need to be translated again in next run.
+    Least recently used translations are evicted when max_entries or max_bytes is exceeded.
+
+    :param str path: File path of SQLite database. Default value is ~/.cache/nlpaug/translation_cache.sqlite3
+    :param int max_entries: Maximum number of cached translations. Default value is None which means no limit.
+    :param int max_bytes: Approximate budget (in bytes) of cached translations (source text hash and translated
+        text). Default value is None which means no limit.
+    :param float timeout: Seconds to wait for database lock which is held by other process.
+
+    >>> from nlpaug.util import TranslationCache
+    >>> cache = TranslationCache(max_bytes=1024 ** 3)
+    >>> cache.stats()
+    """
+
+    def __init__(self, path=None, max_entries=None, max_bytes=None, timeout=30.):
+        self.path = path or self.default_path()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._connect()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _connect(self):
+        self._conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS translations '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)')
+
+    def __getstate__(self):
+        # Connection cannot be pickled (e.g. augmenter is sent to worker process). It is opened again from path.
+        state = self.__dict__.copy()
+        state.pop('_conn', None)
+        state.pop('_lock', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._connect()
+
+    @classmethod
+    def default_path(cls):
+        return os.path.join(os.path.expanduser('~'), '.cache', 'nlpaug', 'translation_cache.sqlite3')
+
+    @classmethod
+    def make_key(cls, text, namespace=''):
+        return hashlib.sha256('\0'.join([namespace, text]).encode('utf-8')).hexdigest()
+
+    def get_many(self, texts, namespace=''):
+        """
+        :param list texts: Source texts.
+        :param str namespace: Namespace of translations (e.g. model pair and generation parameters).
+        :return: Cached translation of each text. None is returned if it is not cached.
+        """
+        keys = [self.make_key(text, namespace) for text in texts]
+        found = {}
+        with self._lock, self._conn:
+            # SQLite limits number of variables per statement
+            unique_keys = list(set(keys))
+            for i in range(0, len(unique_keys), 500):
+                chunk = unique_keys[i:i+500]
+                rows = self._conn.execute(
+                    'SELECT key, value FROM translations WHERE key IN ({})'.format(','.join('?' * len(chunk))),
+                    chunk).fetchall()
+                found.update(rows)
+
+            now = time.time()
+            self._conn.executemany('UPDATE translations SET last_used = ? WHERE key = ?', [(now, k) for k in found])
+            self._hits += sum(1 for k in keys if k in found)
+            self._misses += sum(1 for k in keys if k not in found)
+
+        return [found.get(k) for k in keys]
+
+    def set_many(self, texts, translations, namespace=''):
+        """
+        :param list texts: Source texts.
+        :param list translations: Translation of each text.
+        :param str namespace: Namespace of translations (e.g. model pair and generation parameters).
+        """
+        now = time.time()
+        rows = []
+        for text, translation in zip(texts, translations):
+            key = self.make_key(text, namespace)
+            rows.append((key, translation, len(key) + len(translation.encode('utf-8')), now))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO translations (key, value, size, last_used) VALUES (?, ?, ?, ?)', rows)
+            self._evict()
+
+    def _evict(self):
+        num_entry, num_byte = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM translations').fetchone()
+        excess_entries = num_entry - self.max_entries if self.max_entries is not None else 0
+        excess_bytes = num_byte - self.max_bytes if self.max_bytes is not None else 0
+        if excess_entries <= 0 and excess_bytes <= 0:
+            return
+
+        # Least recently used first
+        evict_keys = []
+        for key, size in self._conn.execute('SELECT key, size FROM translations ORDER BY last_used, rowid'):
+            if excess_entries <= 0 and excess_bytes <= 0:
+                break
+            evict_keys.append((key, ))
+            excess_entries -= 1
+            excess_bytes -= size
+
+        self._conn.executemany('DELETE FROM translations WHERE key = ?', evict_keys)
+        self._evictions += len(evict_keys)
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM translations')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def stats(self):
+        """
+        :return: Dictionary of hits, misses, evictions (of this instance), entries and bytes (approximate).
+        """
+        with self._lock:
+            num_entry, num_byte = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM translations').fetchone()
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'entries': num_entry,
+                'bytes': num_byte,
+            }
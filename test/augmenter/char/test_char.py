@@ -182,3 +182,71 @@ class TestCharacter(unittest.TestCase):
             augmented_texts = aug.augment(texts)
             for augmented_text in augmented_texts:
                 self.assertTrue(len(augmented_text) == 0 or augmented_text.strip() == '')
+
+    def test_batch_engine(self):
+        texts = ['The quick brown fox jumps over the lazy dog'] * 50 + ['']
+        augs = [
+            nac.RandomCharAug(action='substitute', aug_char_max=1, aug_word_max=2),
+            nac.RandomCharAug(action='insert', aug_char_max=1, aug_word_max=2),
+            nac.RandomCharAug(action='delete', aug_char_max=1, aug_word_max=2),
+            nac.KeyboardAug(aug_char_max=1, aug_word_max=2, include_special_char=False),
+            nac.OcrAug(aug_char_max=1, aug_char_min=1, aug_word_max=2),
+        ]
+
+        original_tokens = texts[0].split(' ')
+        for aug in augs:
+            self.assertIsNotNone(aug._get_batch_action_handler())
+            augmented_texts = aug.augment(texts)
+            self.assertEqual(len(augmented_texts), len(texts))
+            self.assertEqual(augmented_texts[-1], '')
+            self.assertTrue(any(augmented_text != texts[0] for augmented_text in augmented_texts[:-1]))
+
+            for augmented_text in augmented_texts[:-1]:
+                tokens = augmented_text.split(' ')
+                self.assertEqual(len(tokens), len(original_tokens))
+                changed_tokens = [(o, t) for o, t in zip(original_tokens, tokens) if o != t]
+                self.assertLessEqual(len(changed_tokens), 2)
+                for original_token, token in changed_tokens:
+                    # Only one character is changed per word
+                    if aug.action == Action.INSERT:
+                        self.assertEqual(len(token), len(original_token) + 1)
+                    elif aug.action == Action.DELETE:
+                        self.assertEqual(len(token), len(original_token) - 1)
+                    else:
+                        self.assertEqual(len(token), len(original_token))
+                        self.assertEqual(sum(a != b for a, b in zip(original_token, token)), 1)
+
+            # Single input with multiple outputs
+            self.assertEqual(len(aug.augment(texts[0], n=3)), 3)
+
+    def test_batch_engine_multi_char_candidates(self):
+        aug = nac.RandomCharAug(action='insert', candidates=['<>'], min_char=2, aug_char_min=1, aug_char_max=1,
+                                aug_word_p=1.)
+        augmented_texts = aug.augment(['ab cd', 'ef'])
+        for augmented_text, expected in zip(augmented_texts, [['<>ab', 'a<>b'], ['<>ef', 'e<>f']]):
+            for token in augmented_text.split(' '):
+                self.assertTrue(token in expected or token in ['<>cd', 'c<>d'])
+
+    def test_batch_engine_stopwords(self):
+        stopwords = ['The', 'brown', 'fox', 'jumps', 'the', 'dog']
+        texts = ['The quick brown fox jumps over the lazy dog'] * 20
+        aug = nac.KeyboardAug(stopwords=stopwords, aug_word_p=1., include_special_char=False)
+        for augmented_text in aug.augment(texts):
+            for stopword in stopwords:
+                self.assertIn(stopword, augmented_text.split(' '))
+
+    def test_batch_engine_default_aug_p(self):
+        # Every word has same length so that number of deleted words and characters decides token lengths
+        text = 'abcde fghij klmno pqrst uvwxy'
+        aug = nac.RandomCharAug(action='delete', aug_char_p=None, aug_char_max=None, aug_word_p=None,
+                                aug_word_max=None)
+
+        for augmented_text in [aug.augment(text)[0]] + aug.augment([text] * 5):
+            self.assertEqual(sorted(len(token) for token in augmented_text.split(' ')), [3, 3, 5, 5, 5])
+
+    def test_batch_engine_fallback(self):
+        # Swap and change logs are handled per input
+        self.assertIsNone(nac.RandomCharAug(action='swap')._get_batch_action_handler())
+        aug = nac.KeyboardAug()
+        aug.include_detail = True
+        self.assertIsNone(aug._get_batch_action_handler())
@@ -2,8 +2,10 @@ import unittest
 import re
 import json
 import os
+import random
 
 import nlpaug.augmenter.char as nac
+from nlpaug.util import MODEL_CACHE
 
 
 class TestKeyboard(unittest.TestCase):
@@ -180,3 +182,46 @@ class TestKeyboard(unittest.TestCase):
             self.assertTrue(False)
         except ValueError:
             self.assertTrue(True)
+
+    def test_shared_model(self):
+        aug = nac.KeyboardAug()
+        self.assertIs(aug.model, nac.KeyboardAug().model)
+        self.assertIsNot(aug.model, nac.KeyboardAug(include_numeric=False).model)
+
+        # Mapping is shared by augmenters so that it cannot be modified
+        with self.assertRaises(TypeError):
+            aug.model.model['a'] = ['b']
+
+    def test_model_is_not_bounded_by_model_cache(self):
+        aug = nac.KeyboardAug()
+        max_entries, max_bytes = MODEL_CACHE.max_entries, MODEL_CACHE.max_bytes
+        try:
+            # Budget of MODEL_CACHE does not evict keyboard model
+            MODEL_CACHE.configure(max_entries=0, max_bytes=0)
+            self.assertIs(aug.model, nac.KeyboardAug().model)
+            self.assertFalse(any(k[0] == 'keyboard' for k in MODEL_CACHE.keys()))
+        finally:
+            MODEL_CACHE.configure(max_entries=max_entries, max_bytes=max_bytes)
+
+    def test_snapshot(self):
+        aug = nac.KeyboardAug(include_special_char=False)
+        snapshot_path = 'char_keyboard_snapshot.npz'
+        try:
+            aug.model.save_snapshot(snapshot_path)
+            snapshot_aug = nac.KeyboardAug(model_path=snapshot_path)
+
+            self.assertEqual(snapshot_aug.model.model, aug.model.model)
+            augmented_text = snapshot_aug.augment('The quick brown fox jumps over the lazy dog')[0]
+            self.assertNotEqual('The quick brown fox jumps over the lazy dog', augmented_text)
+        finally:
+            if os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+
+    def test_random_seed_reproduces_batch(self):
+        texts = ['The quick brown fox jumps over the lazy dog'] * 10
+        aug = nac.KeyboardAug()
+
+        random.seed(0)
+        augmented_texts = aug.augment(texts)
+        random.seed(0)
+        self.assertEqual(augmented_texts, aug.augment(texts))
@@ -1,4 +1,4 @@
-import unittest, os
+import unittest, os, pickle
 
 from nlpaug.augmenter.char import OcrAug
 
@@ -61,4 +61,23 @@ class TestOcr(unittest.TestCase):
             sample_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'res', 'common', 'non_exist.json'))
             aug = OcrAug(dict_of_path=sample_path)
         self.assertIn('The dict_of_path does not exist', str(error.exception))
-        
\ No newline at end of file
+        
+    def test_ocr_shared_model(self):
+        aug = OcrAug()
+        self.assertIs(aug.model, OcrAug().model)
+
+        with self.assertRaises(TypeError):
+            aug.model.model.update({'0': ['1']})
+        # Read-only mapping can be pickled (e.g. process executor)
+        self.assertEqual(pickle.loads(pickle.dumps(aug.model)).model, aug.model.model)
+
+    def test_ocr_model_from_snapshot(self):
+        snapshot_path = 'char_ocr_snapshot.npz'
+        try:
+            OcrAug().model.save_snapshot(snapshot_path)
+            aug = OcrAug(dict_of_path=snapshot_path)
+            self.assertEqual(aug.model.model['0'], OcrAug().model.model['0'])
+            self.assertNotEqual('Zoology', aug.augment('Zoology')[0])
+        finally:
+            if os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
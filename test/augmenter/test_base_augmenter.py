@@ -1,5 +1,7 @@
 import unittest
 import os
+import gc
+import weakref
 import numpy as np
 from dotenv import load_dotenv
 
@@ -113,3 +115,88 @@ class TestBaseAugmenterBehavior(unittest.TestCase):
 
         self.assertIsInstance(results, np.ndarray)
         self.assertEqual(0, results.size)
+
+    def test_list_input_multiprocess_keeps_order(self):
+        aug = DummyAugmenter(action=Action.SUBSTITUTE)
+        texts = [' text{} '.format(i) for i in range(20)]
+        results = aug.augment(texts, num_thread=2, executor='process', chunksize=3)
+
+        self.assertEqual(['text{}|substitute'.format(i) for i in range(20)], results)
+
+    def test_single_input_multiprocess_returns_n_results(self):
+        aug = DummyAugmenter(action=Action.INSERT)
+        results = aug.augment(' value ', n=3, num_thread=2, executor='process')
+
+        self.assertEqual(['value|insert'] * 3, results)
+
+    def test_process_pool_is_terminated_when_augmenter_is_collected(self):
+        aug = DummyAugmenter(action=Action.SUBSTITUTE)
+        aug.augment(['a', 'b', 'c'], num_thread=2, executor='process')
+        pool = aug._pool
+        workers = list(pool._pool)
+        aug_ref = weakref.ref(aug)
+
+        del aug
+        gc.collect()
+
+        self.assertIsNone(aug_ref())
+        self.assertTrue(all(not worker.is_alive() for worker in workers))
+
+    def test_invalid_executor(self):
+        aug = DummyAugmenter(action=Action.INSERT)
+        with self.assertRaises(ValueError):
+            aug.augment('value', executor='gpu')
+
+    def test_pool_is_reused_across_calls(self):
+        with DummyAugmenter(action=Action.SUBSTITUTE) as aug:
+            aug.augment(['a', 'b', 'c'], num_thread=2)
+            pool = aug._pool
+            results = aug.augment(['d', 'e', 'f'], num_thread=2)
+
+            self.assertIs(pool, aug._pool)
+            self.assertEqual(['d|substitute', 'e|substitute', 'f|substitute'], results)
+
+            aug.augment(['g', 'h', 'i'], num_thread=3)
+            self.assertIsNot(pool, aug._pool)
+
+        self.assertIsNone(aug._pool)
+
+    def test_injected_pool_is_not_closed(self):
+        from multiprocessing.dummy import Pool
+
+        with Pool(2) as pool:
+            aug = DummyAugmenter(action=Action.DELETE)
+            aug.set_pool(pool)
+            results = aug.augment(['a', 'b', 'c'], num_thread=2)
+            aug.close()
+
+            self.assertEqual(['a|delete', 'b|delete', 'c|delete'], results)
+            self.assertEqual([1, 4], pool.map(lambda x: x * x, [1, 2]))
+
+    def test_augment_iter_streams_batches(self):
+        aug = DummyAugmenter(action=Action.SWAP)
+        texts = (' text{} '.format(i) for i in range(7))
+        results = aug.augment_iter(texts, batch_size=3)
+
+        self.assertEqual('text0|swap', next(results))
+        self.assertEqual(['text{}|swap'.format(i) for i in range(1, 7)], list(results))
+
+    def test_augment_iter_multiple_outputs(self):
+        aug = DummyAugmenter(action=Action.SWAP)
+        results = list(aug.augment_iter(['a', 'b', 'c'], batch_size=2, n=2))
+
+        self.assertEqual([['a|swap'] * 2, ['b|swap'] * 2, ['c|swap'] * 2], results)
+
+    def test_augment_iter_model_batch_augmenter_receives_batch(self):
+        batch_sizes = []
+
+        def insert(self, data):
+            batch_sizes.append(len(data))
+            return [f'{item}|batched' for item in data]
+
+        BatchAugmenter = type('ContextualWordEmbsAug', (DummyAugmenter,), {'insert': insert})
+        aug = BatchAugmenter(action=Action.INSERT)
+        results = list(aug.augment_iter(iter(['a', 'b', 'c', 'd', 'e']), batch_size=2))
+
+        self.assertEqual(['a|batched', 'b|batched', 'c|batched', 'd|batched', 'e|batched'], results)
+        self.assertEqual([2, 2, 1], batch_sizes)
@@ -49,3 +49,51 @@ def test_pipeline_duplicate_resolution_and_empty_result():
 
     empty_pipeline = DummyPipeline(action=Action.SUBSTITUTE, flow=[])
     assert empty_pipeline.augment('', n=1) == []
+
+
+def test_pipeline_multiprocess():
+    pipeline = DummyPipeline(action=Action.SUBSTITUTE, flow=[DummyAugmenter('1')])
+
+    assert pipeline.augment('a', n=2, num_thread=2, executor='process') == ['a1', 'a1']
+
+
+def test_pipeline_augment_iter():
+    pipeline = DummyPipeline(action=Action.SUBSTITUTE, flow=[DummyAugmenter('1'), DummyAugmenter('2')])
+
+    assert list(pipeline.augment_iter(iter(['a', 'b', 'c']), batch_size=2)) == ['a12', 'b12', 'c12']
+    assert list(pipeline.augment_iter(['a'], n=2)) == [['a12', 'a12']]
+
+
+class CountingAugmenter(DummyAugmenter):
+    def __init__(self, suffix='x'):
+        super().__init__(suffix)
+        self.batch_sizes = []
+        self.cnt = 0
+
+    def _augment_batch(self, data, num_thread=1, executor='thread', chunksize=1):
+        self.batch_sizes.append(len(data))
+        return super()._augment_batch(data, num_thread=num_thread, executor=executor, chunksize=chunksize)
+
+    def substitute(self, data):
+        self.cnt += 1
+        return f'{data}{self.suffix}{self.cnt}'
+
+
+def test_pipeline_batch_mode_sends_inputs_x_n_in_one_call():
+    aug = CountingAugmenter('-')
+    pipeline = DummyPipeline(action=Action.SUBSTITUTE, flow=[aug])
+
+    results = pipeline.augment(['a', 'b'], n=3, batch_mode=True)
+    assert results == [['a-1', 'a-2', 'a-3'], ['b-4', 'b-5', 'b-6']]
+    assert aug.batch_sizes == [6]
+
+    assert pipeline.augment(['c', 'd'], batch_mode=True) == ['c-7', 'd-8']
+    assert pipeline.augment('e', n=2, batch_mode=True) == ['e-9', 'e-10']
+    assert pipeline.augment([], batch_mode=True) == []
+
+
+def test_pipeline_batch_mode_retries_duplicates():
+    pipeline = DummyPipeline(action=Action.SUBSTITUTE, flow=[DummyAugmenter('1')])
+
+    # Deterministic augmenter cannot generate more than one unique output
+    assert pipeline.augment('a', n=3, batch_mode=True) == ['a1']
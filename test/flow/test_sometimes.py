@@ -1,6 +1,7 @@
 import unittest
 
 import nlpaug.augmenter.char as nac
+import nlpaug.augmenter.word as naw
 import nlpaug.flow as naf
 from nlpaug.util import Action
 
@@ -72,3 +73,18 @@ class TestSometimes(unittest.TestCase):
         self.assertLess(0, len(flows))
         self.assertLess(0, len(texts))
 
+
+    def test_draw_batch(self):
+        self.assertFalse(naf.Sometimes(aug_p=0).draw_batch(10).any())
+        self.assertTrue(naf.Sometimes(aug_p=1).draw_batch(10).all())
+        self.assertTrue(naf.Sequential().draw_batch(10).all())
+
+    def test_batch_mode(self):
+        texts = ['The quick brown fox jumps over the lazy dog'] * 4
+        flow = naf.Sometimes([nac.RandomCharAug(action=Action.INSERT), naw.RandomWordAug()], aug_p=1)
+
+        augmented_texts = flow.augment(texts, n=2, batch_mode=True)
+        self.assertEqual(len(texts), len(augmented_texts))
+        for text, augmented_text in zip(texts, augmented_texts):
+            self.assertEqual(2, len(augmented_text))
+            self.assertNotIn(text, augmented_text)
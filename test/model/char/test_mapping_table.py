@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+import nlpaug.augmenter.char as nac
+import nlpaug.model.char as nmc
+
+
+class TestMappingTable(unittest.TestCase):
+    def test_lookup_and_sample(self):
+        table = nmc.MappingTable(mapping={'o': ['0'], 'a': ['s', 'q'], 'ab': ['x'], 'e': []})
+        codepoints = nmc.MappingTable.encode('oaez')
+
+        rows = table.lookup(codepoints)
+        # Multi-character key and key without candidate are ignored
+        self.assertEqual(rows.tolist(), [1, 0, -1, -1])
+
+        for _ in range(10):
+            values = [table.values[i] for i in table.sample(rows[:2])]
+            self.assertEqual(values[0], '0')
+            self.assertIn(values[1], ['s', 'q'])
+
+    def test_shared_candidates(self):
+        table = nmc.MappingTable(candidates=['x', 'yz'])
+        rows = table.lookup(nmc.MappingTable.encode('abc'))
+        self.assertEqual(rows.tolist(), [0, 0, 0])
+        self.assertEqual(table.value_lens[table.candidates[0]].tolist(), [1, 2])
+
+        table = nmc.MappingTable(candidates=[])
+        self.assertEqual(table.lookup(nmc.MappingTable.encode('abc')).tolist(), [-1, -1, -1])
+
+    def test_encode_decode(self):
+        text = 'naïve 😀'
+        codepoints = nmc.MappingTable.encode(text)
+        self.assertEqual(len(codepoints), len(text))
+        self.assertEqual(nmc.MappingTable.decode(codepoints.astype(np.int64)), text)
+
+    def test_model_mapping_table(self):
+        model = nac.KeyboardAug(include_special_char=False, include_numeric=False, include_upper_case=False).model
+        table = model.get_mapping_table()
+        self.assertIs(table, model.get_mapping_table())
+        self.assertEqual(len(table.keys), len(model.model))
@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from nlpaug.model.lang_models.gpt2 import Gpt2
+
+
+class FakeTokenizer:
+    def encode(self, text):
+        return [int(t) for t in text.split()]
+
+
+def build_gpt2():
+    torch.manual_seed(0)
+    config = transformers.GPT2Config(vocab_size=32, n_positions=64, n_embd=16, n_layer=2, n_head=2)
+    model = Gpt2.__new__(Gpt2)
+    model.device = 'cpu'
+    model.pad_id = 1
+    model.tokenizer = FakeTokenizer()
+    model.model = transformers.GPT2LMHeadModel(config).eval()
+    return model
+
+
+def test_gpt2_predict_next_matches_full_forward():
+    model = build_gpt2()
+    picked = []
+
+    def pick_batch(logits, include_punctuation=False):
+        picked.extend(logits)
+        return [[] for _ in logits]
+
+    with patch.object(model, 'pick_batch', side_effect=pick_batch):
+        _, memory = model.predict_next(texts=['3 4 5 6', '7 8'])
+        # Prune first row and feed one token to second row
+        model.predict_next(next_ids=[9], external_memory=memory, rows=[1])
+
+    with torch.no_grad():
+        expected_first = model.model(input_ids=torch.tensor([[3, 4, 5, 6]])).logits[0, -1]
+        expected_step = model.model(input_ids=torch.tensor([[7, 8, 9]])).logits[0, -1]
+
+    assert len(picked) == 3
+    assert torch.allclose(picked[0], expected_first, atol=1e-4)
+    assert torch.allclose(picked[2], expected_step, atol=1e-4)
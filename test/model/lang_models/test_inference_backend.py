@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from nlpaug.model.lang_models.inference_backend import default_backend_dir, get_library_versions, \
+    get_model_revision, load_masked_lm, write_atomic
+
+
+def test_default_backend_dir():
+    backend_dir = default_backend_dir('bert-base-uncased', 'onnx', revision='abc')
+    assert os.path.join('nlpaug', 'backends', 'bert-base-uncased', 'abc', 'onnx') in backend_dir
+    assert backend_dir.endswith(get_library_versions().replace('+', '_'))
+    assert os.path.join('google_electra-small', 'unknown', 'quantized') in default_backend_dir(
+        'google/electra-small', 'quantized')
+    assert default_backend_dir('bert-base-uncased', 'onnx', revision='abc') != default_backend_dir(
+        'bert-base-uncased', 'onnx', revision='def')
+
+
+def test_local_model_revision_changes_with_files(tmp_path):
+    (tmp_path / 'config.json').write_text('{}')
+    revision = get_model_revision(str(tmp_path))
+    assert revision == get_model_revision(str(tmp_path))
+
+    (tmp_path / 'model.safetensors').write_bytes(b'weights')
+    assert revision != get_model_revision(str(tmp_path))
+
+
+def test_write_atomic_does_not_leave_partial_file(tmp_path):
+    path = str(tmp_path / 'model.onnx')
+
+    def _interrupted_write(tmp_file):
+        with open(tmp_file, 'wb') as f:
+            f.write(b'trunc')
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        write_atomic(path, _interrupted_write)
+    assert os.listdir(str(tmp_path)) == []
+
+    def _write(tmp_file):
+        assert os.path.dirname(tmp_file) == str(tmp_path) and tmp_file.endswith('.onnx')
+        with open(tmp_file, 'wb') as f:
+            f.write(b'model')
+
+    write_atomic(path, _write)
+    assert os.listdir(str(tmp_path)) == ['model.onnx']
+    with open(path, 'rb') as f:
+        assert f.read() == b'model'
+
+
+def test_load_masked_lm_validates_backend_and_device(tmp_path):
+    def loader():
+        raise AssertionError('Model should not be loaded')
+
+    with pytest.raises(ValueError):
+        load_masked_lm('bert-base-uncased', loader, backend='tensorrt', backend_dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        load_masked_lm('bert-base-uncased', loader, backend='quantized', backend_dir=str(tmp_path), device='cuda')
+
+
+def test_quantized_backend_is_cached(tmp_path):
+    torch = pytest.importorskip('torch')
+
+    load_cnt = []
+
+    def skeleton_loader():
+        return torch.nn.Sequential(torch.nn.Linear(4, 8), torch.nn.ReLU(), torch.nn.Linear(8, 4))
+
+    def loader():
+        load_cnt.append(1)
+        return skeleton_loader()
+
+    model = load_masked_lm('tiny', loader, backend='quantized', backend_dir=str(tmp_path))
+    cached_model = load_masked_lm(
+        'tiny', loader, backend='quantized', backend_dir=str(tmp_path), skeleton_loader=skeleton_loader)
+
+    assert len(load_cnt) == 1
+    # Only tensors are saved so that it can be loaded without unpickling arbitrary object
+    torch.load(str(tmp_path / 'quantized_state_dict.pt'), weights_only=True)
+    inputs = torch.randn(2, 4)
+    assert torch.allclose(model(inputs), cached_model(inputs))
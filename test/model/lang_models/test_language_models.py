@@ -7,6 +7,7 @@ import pytest
 torch = pytest.importorskip("torch")
 
 from nlpaug.model.lang_models.language_models import LanguageModels
+from nlpaug.util import MODEL_CACHE
 
 
 class FakeTokenizer:
@@ -134,3 +135,127 @@ def test_language_model_prob_multinomial_and_filtering():
     filtered_logits_top_p, idxes_top_p = model.filtering(torch.tensor([1.0, 2.0, 3.0, 4.0]), {'top_k': None, 'top_p': 0.8})
     assert len(idxes_top_p) >= 1
     assert filtered_logits_top_p.shape[0] == len(idxes_top_p)
+
+
+def test_language_model_pick_batch_uses_single_multinomial_call():
+    model = FakeLanguageModel(device='cpu', model_type='bert', temperature=1.0, top_k=None, top_p=None)
+
+    with patch.object(torch, 'multinomial', wraps=torch.multinomial) as multinomial:
+        results = model.pick_batch(torch.zeros((3, 9)), target_words=['target', None, 'valid'], n=2)
+
+    assert multinomial.call_count == 1
+    assert sorted(results[0]) == [('extra', 8), ('valid', 7)]
+    assert len(results[1]) == 2 and set(results[1]) <= {('Target', 5), ('valid', 7), ('extra', 8)}
+    assert sorted(results[2]) == [('Target', 5), ('extra', 8)]
+
+
+def test_language_model_pick_batch_applies_top_k_per_row():
+    model = FakeLanguageModel(device='cpu', model_type='bert', temperature=1.0, top_k=1, top_p=None)
+    logits = torch.zeros((2, 9))
+    logits[0, 7] = 5.0
+    # Skipped token is removed before top-k
+    logits[1, 6] = 5.0
+    logits[1, 8] = 4.0
+
+    results = model.pick_batch(logits, include_punctuation=True)
+
+    assert results == [[('valid', 7)], [('extra', 8)]]
+    assert model._pick_target_candidates_batch(logits) == [['valid'], ['extra']]
+    assert model.get_skip_mask(9).tolist() == [True, True, True, True, True, False, True, False, False]
+
+
+def test_language_model_vocab_masks_are_built_once_per_model():
+    model = FakeLanguageModel(device='cpu', model_type='bert', temperature=1.0, top_k=None, top_p=None)
+    MODEL_CACHE.reset_stats()
+
+    with patch.object(FakeLanguageModel, 'id2token', autospec=True, side_effect=lambda self, _id: 'valid') as id2token:
+        masks = [model.get_skip_mask(9) for _ in range(2)]
+        for _ in range(3):
+            model.pick_batch(torch.zeros((2, 9)), n=1)
+
+    assert masks[0] is masks[1]
+    assert id2token.call_count == 9
+    # Model registry is not involved in sampling steps
+    assert MODEL_CACHE.stats()['hits'] == 0
+    assert MODEL_CACHE.stats()['misses'] == 0
+
+
+def test_language_model_pick_batch_returns_proba():
+    model = FakeLanguageModel(device='cpu', model_type='bert', temperature=1.0, top_k=None, top_p=None,
+        optimize={'return_proba': True})
+    logits = torch.full((1, 9), -float('Inf'))
+    logits[0, 7] = 0.
+
+    assert model.pick_batch(logits) == [[('valid', 7, 1.0)]]
+
+
+def test_language_model_predict_masks_uses_single_forward_pass():
+    model = FakeLanguageModel(device='cpu', model_type='bert', batch_size=8)
+    model.mask_id = 9
+    model.tokenizer = SimpleNamespace(
+        pad=lambda encoded, **kwargs: {
+            'input_ids': torch.tensor([ids + [0] * (4 - len(ids)) for ids in encoded['input_ids']]),
+            'attention_mask': torch.tensor([[1] * len(ids) + [0] * (4 - len(ids)) for ids in encoded['input_ids']]),
+        })
+    model._encode_batch = lambda texts, **kwargs: {'input_ids': [[1, 9, 5, 9], [1, 5, 9]]}
+    forward_calls = []
+
+    def forward(**batch):
+        forward_calls.append(batch)
+        return SimpleNamespace(logits=torch.arange(2 * 4 * 3, dtype=torch.float).view(2, 4, 3))
+
+    model.model = forward
+    picked = []
+
+    def pick_target_candidates_batch(logits, target_words=None):
+        picked.extend(logits.tolist())
+        return [[word] for word in target_words]
+
+    with patch.object(model, '_pick_target_candidates_batch', side_effect=pick_target_candidates_batch):
+        results = model.predict_masks(['a [MASK] b [MASK]', 'a b [MASK]'], target_words=[['x', 'y'], ['z']])
+
+    assert len(forward_calls) == 1
+    assert results == [[['x'], ['y']], [['z']]]
+    assert picked == [[3.0, 4.0, 5.0], [9.0, 10.0, 11.0], [18.0, 19.0, 20.0]]
+
+
+def test_language_model_predict_in_batches_restores_order():
+    model = FakeLanguageModel(device='cpu', model_type='bert', batch_size=2, max_tokens=None)
+    batches = []
+
+    def predict_fx(batch):
+        batches.append(batch)
+        return [text.upper() for text in batch]
+
+    results = model.predict_in_batches(['a', 'bbb', 'cc', 'dddd'], [1, 3, 2, 4], predict_fx)
+
+    assert results == ['A', 'BBB', 'CC', 'DDDD']
+    assert batches == [['dddd', 'bbb'], ['cc', 'a']]
+
+
+def test_language_model_encode_tokens_and_predict_ids():
+    model = FakeLanguageModel(device='cpu', model_type='bert', batch_size=8)
+    model.mask_id, model.pad_id = 9, 0
+    model.tokenizer = SimpleNamespace(
+        convert_tokens_to_ids=lambda tokens: [{'a': 5, 'b': 6}.get(t, 3) for t in tokens],
+        cls_token_id=1, sep_token_id=2)
+
+    input_ids = model.encode_tokens([['a', 'b', 'a'], ['b']])
+    assert input_ids.tolist() == [[1, 5, 6, 5, 2], [1, 6, 2, 0, 0]]
+
+    input_ids[1, [1]] = model.mask_id
+    batches = []
+
+    def forward(**batch):
+        batches.append(batch)
+        return SimpleNamespace(logits=torch.zeros(batch['input_ids'].shape + (4,)))
+
+    model.model = forward
+    with patch.object(model, '_pick_target_candidates_batch',
+                      side_effect=lambda logits, target_words=None: [[word] for word in target_words]):
+        results = model.predict_ids(input_ids[1:], [[1]], target_words=[['b']])
+
+    assert results == [[['b']]]
+    # Columns which are padding for whole batch are dropped
+    assert batches[0]['input_ids'].tolist() == [[1, 9, 2]]
+    assert batches[0]['attention_mask'].tolist() == [[1, 1, 1]]
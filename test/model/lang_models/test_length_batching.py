@@ -0,0 +1,20 @@
+from nlpaug.model.lang_models.language_models import make_length_batches
+
+
+def test_make_length_batches_groups_similar_length():
+    lengths = [5, 400, 7, 390, 6, 410]
+
+    batches = make_length_batches(lengths, batch_size=32, max_tokens=800)
+
+    assert batches == [[5], [1, 3], [2, 4, 0]]
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert max(lengths[i] for i in batch) * len(batch) <= 800
+
+
+def test_make_length_batches_batch_size_and_long_input():
+    assert make_length_batches([3, 3, 3, 3, 3], batch_size=2) == [[0, 1], [2, 3], [4]]
+    # Input which is longer than budget forms a batch by itself
+    assert make_length_batches([2000, 10, 10], max_tokens=100) == [[0], [1, 2]]
+    assert make_length_batches([1, 2, 3]) == [[2, 1, 0]]
+    assert make_length_batches([]) == []
@@ -0,0 +1,177 @@
+import threading
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from nlpaug.model.lang_models.machine_translation_transformers import MtTransformers
+
+
+class FakeTokenizer:
+    # Id 0 is padding. Other ids are lower case letters.
+    all_special_ids = [0]
+    model_max_length = 64
+    vocab_files_names = {'vocab_file': 'spm.model'}
+
+    def __init__(self, vocab='abcdefghijklmnopqrstuvwxyz', vocab_file=None, spm_files=None):
+        self.vocab = ['<pad>'] + list(vocab)
+        self.vocab_file = vocab_file
+        self.spm_files = spm_files
+        self.decode_calls = 0
+
+    def __len__(self):
+        return len(self.vocab)
+
+    def __call__(self, texts, padding=False, truncation=True):
+        return {'input_ids': [[self.vocab.index(c) for c in text] for text in texts]}
+
+    def pad(self, encoded, padding=True, return_tensors='pt'):
+        max_len = max(len(ids) for ids in encoded['input_ids'])
+        return {
+            'input_ids': torch.tensor([ids + [0] * (max_len - len(ids)) for ids in encoded['input_ids']]),
+            'attention_mask': torch.tensor([[1] * len(ids) + [0] * (max_len - len(ids)) for ids in encoded['input_ids']]),
+        }
+
+    def batch_decode(self, ids_batch, skip_special_tokens=True):
+        self.decode_calls += 1
+        return [''.join(self.vocab[_id] for _id in ids if _id != 0) for ids in ids_batch]
+
+    def convert_ids_to_tokens(self, ids):
+        return [self.vocab[_id] for _id in ids]
+
+    def convert_tokens_to_ids(self, tokens):
+        return [self.vocab.index(token) for token in tokens]
+
+    def num_special_tokens_to_add(self):
+        return 0
+
+    def build_inputs_with_special_tokens(self, ids):
+        return ids
+
+
+class FakeSeq2Seq:
+    # Shift every letter by offset. Forward and backward offsets cancel each other.
+    def __init__(self, offset, num_beams=1):
+        self.offset = offset
+        self.num_beams = num_beams
+        self.threads = set()
+
+    def generate(self, input_ids, attention_mask, max_length=None, do_sample=False, num_beams=None,
+                 num_return_sequences=1):
+        self.threads.add(threading.current_thread().name)
+        # Same as transformers, num_beams of generation config is used if it is not passed
+        num_beams = self.num_beams if num_beams is None else num_beams
+        if num_beams > 1 and num_return_sequences > num_beams:
+            raise ValueError('num_return_sequences has to be smaller or equal to num_beams')
+        shifted = (input_ids - 1 + self.offset) % 26 + 1
+        outputs = torch.where(attention_mask.bool(), shifted, torch.zeros_like(input_ids))
+        # Every sequence ends by letter of its sequence index, so sequence 0 and 1 are duplicated
+        outputs = outputs.repeat_interleave(num_return_sequences, dim=0)
+        suffix = torch.tensor([max(i % num_return_sequences, 1) for i in range(len(outputs))]).view(-1, 1)
+        return torch.cat([outputs, suffix if do_sample else outputs[:, :0]], dim=1)
+
+
+def build_mt(src_tokenizer=None, tgt_tokenizer=None, batch_size=2):
+    model = MtTransformers.__new__(MtTransformers)
+    model.device = 'cpu'
+    model.batch_size = batch_size
+    model.max_tokens = None
+    model.max_length = None
+    model.pipelined = True
+    model._ids_compatible = None
+    model.src_tokenizer = src_tokenizer or FakeTokenizer()
+    model.tgt_tokenizer = tgt_tokenizer or FakeTokenizer()
+    model.src_model = FakeSeq2Seq(1)
+    model.tgt_model = FakeSeq2Seq(-1)
+    return model
+
+
+def test_mt_predict_pipelined_matches_two_step_predict():
+    texts = ['hello', 'a', 'xyz', 'back', 'translation']
+    model = build_mt()
+
+    results = model.predict(texts)
+
+    assert results == texts
+    # Forward translation runs in background thread while backward translation runs in current thread
+    assert threading.current_thread().name not in model.src_model.threads
+    assert model.tgt_model.threads == {threading.current_thread().name}
+
+    model.pipelined = False
+    assert model.predict(texts) == results
+
+
+def write_file(path, content):
+    path.write_text(content)
+    return str(path)
+
+
+def test_mt_predict_pipelined_keeps_token_ids_if_compatible(tmp_path):
+    # Both tokenizers load same segmentation model
+    spm_file = write_file(tmp_path / 'spm.model', 'abcdefghijklmnopqrstuvwxyz')
+    model = build_mt(FakeTokenizer(vocab_file=spm_file), FakeTokenizer(vocab_file=spm_file))
+    assert model.predict_pipelined(['abc', 'de', 'f']) == ['abc', 'de', 'f']
+    assert model.is_ids_compatible()
+    # Only back translated texts are decoded
+    assert model.src_tokenizer.decode_calls == 0
+
+    model = build_mt(
+        FakeTokenizer(vocab_file=spm_file),
+        FakeTokenizer(vocab='zyxwvutsrqponmlkjihgfedcba', vocab_file=spm_file))
+    assert not model.is_ids_compatible()
+    model.predict_pipelined(['abc', 'de', 'f'])
+    assert model.src_tokenizer.decode_calls == 2
+
+
+def test_mt_predict_pipelined_decodes_texts_of_marian_style_pair(tmp_path):
+    # Vocabulary is shared while source and target texts are segmented by different SentencePiece models
+    vocab_file = write_file(tmp_path / 'vocab.json', 'abcdefghijklmnopqrstuvwxyz')
+    spm_files = [write_file(tmp_path / 'source.spm', 'source'), write_file(tmp_path / 'target.spm', 'target')]
+    model = build_mt(
+        FakeTokenizer(vocab_file=vocab_file, spm_files=spm_files),
+        FakeTokenizer(vocab_file=vocab_file, spm_files=spm_files))
+
+    assert not model.is_ids_compatible()
+    assert model.predict_pipelined(['abc', 'de', 'f']) == ['abc', 'de', 'f']
+    assert model.src_tokenizer.decode_calls == 2
+
+    # Tokenizers without files are not trusted either
+    model = build_mt()
+    assert not model.is_ids_compatible()
+
+
+def test_mt_predict_pipelined_raises_forward_error():
+    model = build_mt()
+    model.src_model.generate = lambda **kwargs: (_ for _ in ()).throw(RuntimeError('forward failed'))
+
+    with pytest.raises(RuntimeError, match='forward failed'):
+        model.predict_pipelined(['abc', 'de'])
+
+
+def test_mt_predict_samples_n_outputs_by_one_generate_call():
+    model = build_mt()
+    model.pipelined = False
+    calls = []
+    generate = model.tgt_model.generate
+    model.tgt_model.generate = lambda **kwargs: calls.append(kwargs['num_return_sequences']) or generate(**kwargs)
+
+    results = model.predict(['abc', 'de'], n=3)
+
+    assert results == [['abca', 'abcb'], ['dea', 'deb']]
+    assert calls == [3]
+
+    model.pipelined = True
+    assert model.predict(['abc', 'de'], n=3) == results
+
+
+def test_mt_predict_samples_more_outputs_than_num_beams_of_model():
+    model = build_mt()
+    model.pipelined = False
+    # e.g. facebook/wmt19-de-en uses beam search by default
+    model.tgt_model.num_beams = 4
+    calls = []
+    generate = model.tgt_model.generate
+    model.tgt_model.generate = lambda **kwargs: calls.append(kwargs) or generate(**kwargs)
+
+    assert model.predict(['abc'], n=6) == [['abca', 'abcb', 'abcc', 'abcd', 'abce']]
+    assert calls[0]['do_sample'] and calls[0]['num_beams'] == 1 and calls[0]['num_return_sequences'] == 6
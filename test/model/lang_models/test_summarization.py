@@ -0,0 +1,52 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from nlpaug.model.lang_models.summarization_transformers import XSumTransformers
+
+
+class FakeTokenizer:
+    def __call__(self, texts, padding=False, truncation=False):
+        return {'input_ids': [text.split() for text in texts]}
+
+
+class FakeSummarizationPipeline:
+    # t5 summarization pipeline sets num_beams=4 by task_specific_params
+    tokenizer = FakeTokenizer()
+    num_beams = 4
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, num_beams=None, num_return_sequences=1, do_sample=False, **kwargs):
+        self.calls.append(dict(kwargs, num_beams=num_beams, num_return_sequences=num_return_sequences,
+                               do_sample=do_sample))
+        num_beams = self.num_beams if num_beams is None else num_beams
+        if num_beams > 1 and num_return_sequences > num_beams:
+            raise ValueError('num_return_sequences has to be smaller or equal to num_beams')
+        results = [
+            [{'summary_text': '{} {}'.format(text, i)} for i in range(num_return_sequences)] for text in texts]
+        # Same as transformers, one summary is returned as dict instead of list
+        return [r[0] for r in results] if num_return_sequences == 1 else results
+
+
+def build_xsum():
+    model = XSumTransformers.__new__(XSumTransformers)
+    model.batch_size = 2
+    model.max_tokens = None
+    model.min_length, model.max_length = 10, 20
+    model.temperature, model.top_k, model.top_p = 1.0, 50, 0.9
+    model.model = FakeSummarizationPipeline()
+    return model
+
+
+def test_xsum_samples_more_outputs_than_num_beams_of_pipeline():
+    model = build_xsum()
+
+    assert model.predict(['a b', 'c'], n=5) == [
+        ['a b {}'.format(i) for i in range(5)], ['c {}'.format(i) for i in range(5)]]
+    assert all(call['do_sample'] and call['num_beams'] == 1 for call in model.model.calls)
+
+    # Pipeline config is kept for single summary
+    model.predict(['a b'])
+    assert model.model.calls[-1]['num_beams'] is None
@@ -0,0 +1,48 @@
+import numpy as np
+
+import nlpaug.model.word_embs as nmw
+
+
+def write_glove_file(path, vocab_size=500, emb_size=16, seed=0):
+    vectors = np.random.RandomState(seed).randn(vocab_size, emb_size).astype(np.float32)
+    with open(path, 'w') as f:
+        for i, vector in enumerate(vectors):
+            f.write('word{} {}\n'.format(i, ' '.join(str(v) for v in vector)))
+    return vectors
+
+
+def test_ivf_index_matches_brute_force_when_probing_all_clusters():
+    vectors = np.random.RandomState(1).randn(1000, 8).astype(np.float32)
+    index = nmw.IvfIndex(n_list=10, n_probe=10).build(vectors, seed=1)
+
+    assert index.offsets[-1] == len(vectors)
+    assert sorted(index.ids.tolist()) == list(range(len(vectors)))
+
+    query = vectors[3]
+    scores = (vectors @ query) / np.linalg.norm(vectors, axis=1)
+    expected = [i for i in np.argsort(-scores) if i != 3][:5]
+    assert index.search(query, 5, vectors, exclude_ids=[3]) == expected
+
+
+def test_word_embeddings_index_save_and_load(tmp_path):
+    model_path = str(tmp_path / 'glove.txt')
+    index_path = str(tmp_path / 'glove.txt.ivf')
+    write_glove_file(model_path)
+
+    model = nmw.GloVe(top_k=5)
+    model.read(model_path)
+    expected = model.predict('word7')
+
+    model.init_index(index_path, n_probe=10 ** 3)
+    assert model.predict('word7') == expected
+
+    loaded_model = nmw.GloVe(top_k=5)
+    loaded_model.read(model_path)
+    loaded_model.init_index(index_path, n_probe=10 ** 3)
+    assert isinstance(loaded_model.index.ids, np.memmap)
+    assert loaded_model.predict('word7') == expected
+
+    loaded_model.index.n_probe = 1
+    candidates = loaded_model.predict('word7')
+    assert 0 < len(candidates) <= 5
+    assert 'word7' not in candidates
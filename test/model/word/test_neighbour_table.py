@@ -0,0 +1,43 @@
+import numpy as np
+
+import nlpaug.model.word_embs as nmw
+
+
+def test_neighbour_table_matches_brute_force_across_blocks():
+    vectors = np.random.RandomState(2).randn(300, 8).astype(np.float32)
+    table = nmw.NeighbourTable().build(vectors, num_word=50, top_k=4, block_size=16, col_block_size=64)
+
+    assert table.table.dtype == np.int32
+    assert table.table.shape == (50, 4)
+
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    for idx in [0, 17, 49]:
+        scores = normed @ normed[idx]
+        expected = [i for i in np.argsort(-scores) if i != idx][:4]
+        assert table.lookup(idx, 4) == expected
+
+    assert table.lookup(50, 4) is None
+    assert table.lookup(0, 5) is None
+
+
+def test_word_embeddings_neighbour_table_lookup_and_fallback(tmp_path):
+    model_path = str(tmp_path / 'glove.txt')
+    table_path = str(tmp_path / 'neighbours.npy')
+    vectors = np.random.RandomState(0).randn(200, 16).astype(np.float32)
+    with open(model_path, 'w') as f:
+        for i, vector in enumerate(vectors):
+            f.write('word{} {}\n'.format(i, ' '.join(str(v) for v in vector)))
+
+    model = nmw.GloVe(top_k=5)
+    model.read(model_path)
+    expected = [model.predict('word3'), model.predict('word150')]
+
+    model.build_neighbour_table(num_word=100)
+    model.save_neighbour_table(table_path)
+
+    loaded_model = nmw.GloVe(top_k=5)
+    loaded_model.read(model_path)
+    loaded_model.load_neighbour_table(table_path)
+    assert isinstance(loaded_model.neighbour_table.table, np.memmap)
+    # word150 is not precomputed and falls back to exact search
+    assert [loaded_model.predict('word3'), loaded_model.predict('word150')] == expected
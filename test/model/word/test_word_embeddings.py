@@ -0,0 +1,88 @@
+import numpy as np
+
+import nlpaug.augmenter.word as naw
+import nlpaug.model.word_embs as nmw
+
+
+def read_glove(tmp_path):
+    model_path = str(tmp_path / 'glove.txt')
+    vectors = np.random.RandomState(0).randn(20, 4).astype(np.float32)
+    with open(model_path, 'w') as f:
+        for word, vector in zip(['quick', 'brown', 'fox', 'dog'] + ['word{}'.format(i) for i in range(16)], vectors):
+            f.write('{} {}\n'.format(word, ' '.join(str(v) for v in vector)))
+
+    model = nmw.GloVe(top_k=3)
+    model.read(model_path)
+    return model
+
+
+def test_vocab_membership(tmp_path):
+    model = read_glove(tmp_path)
+
+    assert model.contains('fox')
+    assert not model.contains('cat')
+    assert model.contains_many(['The', 'quick', 'cat', 'dog']) == [False, True, False, True]
+
+
+def test_word_embs_aug_skips_out_of_vocabulary_words(tmp_path):
+    aug = naw.WordEmbsAug(model_type='glove', model=read_glove(tmp_path))
+    tokens = ['The', 'quick', 'cat', 'dog']
+
+    assert aug.skip_aug([0, 1, 2, 3], tokens) == [1, 3]
+
+
+def test_snapshot_round_trip(tmp_path):
+    model = read_glove(tmp_path)
+    snapshot_path = str(tmp_path / 'snapshot')
+    model.save_snapshot(snapshot_path)
+    assert nmw.WordEmbeddings.is_snapshot(snapshot_path)
+
+    loaded_model = nmw.GloVe(top_k=3)
+    loaded_model.load_snapshot(snapshot_path)
+
+    assert isinstance(loaded_model.model.vectors, np.memmap)
+    assert loaded_model.get_vocab() == model.get_vocab()
+    assert loaded_model.contains('fox')
+    np.testing.assert_array_equal(loaded_model.model['fox'], model.model['fox'])
+    assert loaded_model.predict('fox') == model.predict('fox')
+
+
+def test_snapshot_keeps_words_with_line_separators(tmp_path):
+    model = read_glove(tmp_path)
+    words = list(model.model.index_to_key)
+    words[1], words[2] = 'brown\rfox', 'lazy\u2028dog'
+    model.model.index_to_key = words
+    model.model.key_to_index = {word: i for i, word in enumerate(words)}
+    snapshot_path = str(tmp_path / 'snapshot')
+    model.save_snapshot(snapshot_path)
+
+    loaded_model = nmw.GloVe(top_k=3)
+    loaded_model.load_snapshot(snapshot_path)
+
+    assert loaded_model.model.index_to_key == words
+    np.testing.assert_array_equal(loaded_model.model['lazy\u2028dog'], model.model.vectors[2])
+    np.testing.assert_array_equal(loaded_model.model['word0'], model.model.vectors[4])
+
+
+def test_float16_snapshot_in_augmenter(tmp_path):
+    model = read_glove(tmp_path)
+    snapshot_path = str(tmp_path / 'snapshot')
+    model.save_snapshot(snapshot_path, dtype='float16')
+
+    aug = naw.WordEmbsAug(model_type='glove', model_path=snapshot_path, force_reload=True, top_k=3)
+    assert aug.model.model.vectors.dtype == np.float16
+    assert aug.model.contains('dog')
+    assert len(aug.augment('quick brown fox')) == 1
+
+
+def test_models_with_same_file_name_are_not_shared(tmp_path):
+    model_paths = []
+    for dir_name, word in [('a', 'fox'), ('b', 'cat')]:
+        (tmp_path / dir_name).mkdir()
+        model_path = tmp_path / dir_name / 'vectors.txt'
+        model_path.write_text('{} 0.1 0.2\nword 0.3 0.4\n'.format(word))
+        model_paths.append(str(model_path))
+
+    models = [naw.WordEmbsAug(model_type='glove', model_path=model_path).model for model_path in model_paths]
+    assert models[0] is not models[1]
+    assert models[0].contains('fox') and models[1].contains('cat')
@@ -0,0 +1,69 @@
+"""
+	Compare latency and throughput of inference backends of ContextualWordEmbsAug on CPU. Load time of the first run
+	of a backend includes exporting or quantizing model. Run it twice to measure loading from cache.
+
+	python ./test/profiling/word/benchmark_context_word_embs_backend.py --model_path bert-base-uncased --model_type bert
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+
+TEXTS = [
+	'The quick brown fox jumps over the lazy dog.',
+	'Seeing all of the negative reviews for this movie, I figured that it could be yet another comic masterpiece '
+	'that wasn\'t quite meant to be.',
+	'Data augmentation is a technique to increase the diversity of training data without collecting new data.',
+	'He went to the store.',
+]
+
+
+def run_backend(backend, args):
+	import nlpaug.augmenter.word as naw
+
+	start_time = time.perf_counter()
+	aug = naw.ContextualWordEmbsAug(
+		model_path=args.model_path, model_type=args.model_type, device='cpu', batch_size=args.batch_size,
+		backend=backend, force_reload=True)
+	load_time = time.perf_counter() - start_time
+
+	texts = (TEXTS * (args.num_text // len(TEXTS) + 1))[:args.num_text]
+	# Warm up
+	aug.augment(texts[:args.batch_size])
+
+	latencies = []
+	for _ in range(args.num_run):
+		for start in range(0, len(texts), args.batch_size):
+			batch_start_time = time.perf_counter()
+			aug.augment(texts[start:start+args.batch_size])
+			latencies.append(time.perf_counter() - batch_start_time)
+
+	return {
+		'backend': backend,
+		'load_time': load_time,
+		'p50_ms': np.percentile(latencies, 50) * 1000,
+		'p95_ms': np.percentile(latencies, 95) * 1000,
+		'throughput': args.num_text * args.num_run / sum(latencies),
+	}
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--model_path', default='bert-base-uncased')
+	parser.add_argument('--model_type', default='bert')
+	parser.add_argument('--backends', default='torch,quantized,onnx,onnx_quantized')
+	parser.add_argument('--batch_size', type=int, default=8)
+	parser.add_argument('--num_text', type=int, default=64)
+	parser.add_argument('--num_run', type=int, default=3)
+	args = parser.parse_args()
+
+	print('{:<16}{:>12}{:>12}{:>12}{:>18}'.format('backend', 'load (s)', 'p50 (ms)', 'p95 (ms)', 'texts/second'))
+	for backend in args.backends.split(','):
+		result = run_backend(backend, args)
+		print('{backend:<16}{load_time:>12.2f}{p50_ms:>12.1f}{p95_ms:>12.1f}{throughput:>18.2f}'.format(**result))
+
+
+if __name__ == '__main__':
+	main()
@@ -1,9 +1,12 @@
 import json
+import pickle
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
+import pytest
 
 import nlpaug.augmenter.sentence as nas
 import nlpaug.augmenter.word as naw
@@ -68,6 +71,10 @@ class FakeMaskedLmModel:
             outputs.append(["swift", "rapid"])
         return outputs
 
+    def predict_masks(self, masked_texts, target_words=None, n=2):
+        self.predict_masks_calls = getattr(self, "predict_masks_calls", 0) + 1
+        return [[["swift", "rapid"]] * text.split().count("[MASK]") for text in masked_texts]
+
 
 class FakeTextGenerationModel:
     def __init__(self, device="cpu", **kwargs):
@@ -101,9 +108,13 @@ class FakeSeq2SeqModel:
     def get_device(self):
         return self.device
 
-    def predict(self, texts, n=1):
+    def predict(self, texts, n=1, cache=None):
+        self.predict_calls = getattr(self, "predict_calls", 0) + 1
+        self.caches = getattr(self, "caches", []) + [cache]
         if isinstance(texts, str):
             texts = [texts]
+        if n > 1:
+            return [[f"{text} translated {i}" for i in range(n)] for text in texts]
         return [f"{text} translated" for text in texts]
 
 
@@ -164,6 +175,124 @@ def test_contextual_word_embs_offline_substitute_and_batch():
         assert all(item != text for item in batch_augmented)
 
 
+def test_contextual_word_embs_multi_mask_uses_single_forward_pass():
+    fake_model = FakeMaskedLmModel(device="cpu")
+    text = "The quick brown fox jumps over the lazy dog"
+    with patch.object(naw.ContextualWordEmbsAug, "get_model", return_value=fake_model), \
+            patch.object(fake_model, "predict", side_effect=AssertionError("predict per position is not expected")):
+        aug = naw.ContextualWordEmbsAug(model_path="bert-base-uncased", aug_p=1, aug_max=None, multi_mask=True)
+        augmented = aug.augment([text, text])
+
+    assert fake_model.predict_masks_calls == 1
+    for item in augmented:
+        tokens = item.split()
+        assert len(tokens) == len(text.split())
+        assert all(token in ["swift", "rapid"] for token in tokens)
+
+
+def test_contextual_word_embs_multi_mask_refine_steps():
+    fake_model = FakeMaskedLmModel(device="cpu")
+    with patch.object(naw.ContextualWordEmbsAug, "get_model", return_value=fake_model):
+        aug = naw.ContextualWordEmbsAug(model_path="bert-base-uncased", multi_mask=True, refine_steps=2)
+        augmented = aug.augment("The quick brown fox jumps over the lazy dog")
+
+    assert fake_model.predict_masks_calls == 3
+    assert "[MASK]" not in augmented[0]
+
+
+def test_contextual_word_embs_multi_mask_requires_custom_api():
+    with patch.object(naw.ContextualWordEmbsAug, "get_model", return_value=FakeMaskedLmModel()):
+        with pytest.raises(ValueError):
+            naw.ContextualWordEmbsAug(model_path="bert-base-uncased", multi_mask=True, use_custom_api=False)
+        with pytest.raises(ValueError):
+            naw.ContextualWordEmbsAug(model_path="bert-base-uncased", multi_mask=True, refine_steps=-1)
+
+
+class FakeTokenIdMaskedLmModel(FakeMaskedLmModel):
+    mask_id = 1
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.vocab = {"[PAD]": 0, "[MASK]": 1, "swift": 2}
+        self.predict_ids_inputs = []
+
+    def token2id(self, token):
+        return self.vocab.setdefault(token, len(self.vocab))
+
+    def encode_tokens(self, token_lists):
+        input_ids = np.zeros((len(token_lists), max(len(tokens) for tokens in token_lists) + 2), dtype=np.int64)
+        for row, tokens in enumerate(token_lists):
+            input_ids[row, 1:len(tokens) + 1] = [self.token2id(token) for token in tokens]
+        return input_ids
+
+    def predict_ids(self, input_ids, mask_poses, target_words=None, n=1):
+        self.predict_ids_inputs.append((input_ids.copy(), mask_poses))
+        return [[["swift"]] * len(poses) for poses in mask_poses]
+
+
+@pytest.mark.parametrize("multi_mask, refine_steps", [(False, 0), (True, 0), (True, 1)])
+def test_contextual_word_embs_token_ids_skip_text_round_trip(multi_mask, refine_steps):
+    fake_model = FakeTokenIdMaskedLmModel(device="cpu")
+    text = "The quick brown fox jumps over the lazy dog"
+    with patch.object(naw.ContextualWordEmbsAug, "get_model", return_value=fake_model), \
+            patch.object(fake_model, "predict", side_effect=AssertionError("text path is not expected")), \
+            patch.object(fake_model, "predict_masks", side_effect=AssertionError("text path is not expected")), \
+            patch.object(FakeTokenizer, "decode", autospec=True, side_effect=FakeTokenizer.decode) as decode:
+        aug = naw.ContextualWordEmbsAug(
+            model_path="bert-base-uncased", multi_mask=multi_mask, refine_steps=refine_steps, use_token_ids=True)
+        augmented = aug.augment([text, text])
+
+    # Decoded when splitting input and building output only. Not per augmented word.
+    assert decode.call_count == 4
+    assert len(fake_model.predict_ids_inputs) == (1 + refine_steps if multi_mask else 3)
+    for input_ids, mask_poses in fake_model.predict_ids_inputs:
+        for row, poses in enumerate(mask_poses):
+            assert all(input_ids[row, pos] == fake_model.mask_id for pos in poses)
+    for item in augmented:
+        assert item.split().count("swift") == 3
+        assert len(item.split()) == len(text.split())
+
+
+@pytest.mark.parametrize("multi_mask", [False, True])
+def test_contextual_word_embs_token_ids_tokenize_reserved_stopwords(multi_mask):
+    fake_model = FakeTokenIdMaskedLmModel(device="cpu")
+    text = "The quick brown fox jumps over the lazy dog"
+    with patch.object(naw.ContextualWordEmbsAug, "get_model", return_value=fake_model):
+        aug = naw.ContextualWordEmbsAug(
+            model_path="bert-base-uncased", multi_mask=multi_mask, use_token_ids=True, stopwords=["quick brown"])
+        augmented = aug.augment(text)
+
+    # Stopword is passed to model as ids of its own tokens instead of one (unknown) id of raw text
+    quick_id, brown_id = fake_model.token2id("quick"), fake_model.token2id("brown")
+    assert "quick brown" not in fake_model.vocab
+    for input_ids, mask_poses in fake_model.predict_ids_inputs:
+        row = input_ids[0].tolist()
+        assert row[row.index(quick_id) + 1] == brown_id
+        assert all(input_ids[0, pos] == fake_model.mask_id for pos in mask_poses[0])
+    assert "quick brown" in augmented[0]
+
+
+def test_contextual_word_embs_token_ids_restore_original_ids_without_candidate():
+    fake_model = FakeTokenIdMaskedLmModel(device="cpu")
+    text = "The quick brown fox jumps over the lazy dog"
+    with patch.object(naw.ContextualWordEmbsAug, "get_model", return_value=fake_model), \
+            patch.object(fake_model, "predict_ids", autospec=True,
+                         side_effect=lambda input_ids, mask_poses, **kwargs: (
+                             fake_model.predict_ids_inputs.append((input_ids.copy(), mask_poses)) or
+                             [[[]] * len(poses) for poses in mask_poses])):
+        aug = naw.ContextualWordEmbsAug(
+            model_path="bert-base-uncased", multi_mask=True, refine_steps=1, use_token_ids=True)
+        augmented = aug.augment(text)
+
+    assert augmented == [text]
+    # Words which are not masked again get their original ids back
+    expected_ids = [fake_model.token2id(token) for token in text.split()]
+    input_ids, mask_poses = fake_model.predict_ids_inputs[-1]
+    for pos, expected_id in enumerate(expected_ids, start=1):
+        if pos not in mask_poses[0]:
+            assert input_ids[0, pos] == expected_id
+
+
 def test_contextual_word_embs_cache_reuses_model_and_updates_runtime_attrs():
     context_word_embs_module.CONTEXT_WORD_EMBS_MODELS.clear()
     created = []
@@ -218,6 +347,58 @@ def test_back_translation_offline_and_cache_reset():
         naw.BackTranslationAug.clear_cache()
 
 
+def test_back_translation_samples_n_outputs_in_one_call():
+    fake_model = FakeSeq2SeqModel(device="cpu", batch_size=4, max_length=128)
+    with patch.object(naw.BackTranslationAug, "get_model", return_value=fake_model):
+        aug = naw.BackTranslationAug(device="cpu", batch_size=4, max_length=128)
+        result = aug.augment("The quick brown fox", n=3)
+
+    assert result == ["The quick brown fox translated {}".format(i) for i in range(3)]
+    assert fake_model.predict_calls == 1
+
+
+def test_back_translation_accumulates_unique_outputs_across_retries():
+    class OneUniqueOutputModel(FakeSeq2SeqModel):
+        predict_calls = 0
+
+        def predict(self, texts, n=1, cache=None):
+            # Every call returns only one new unique output
+            self.predict_calls += 1
+            return [[f"{text} translated {self.predict_calls}"] * n for text in texts]
+
+    fake_model = OneUniqueOutputModel(device="cpu", batch_size=4, max_length=128)
+    with patch.object(naw.BackTranslationAug, "get_model", return_value=fake_model):
+        aug = naw.BackTranslationAug(device="cpu", batch_size=4, max_length=128)
+        result = aug.augment("The quick brown fox", n=3)
+
+    assert result == ["The quick brown fox translated {}".format(i) for i in range(1, 4)]
+    assert fake_model.predict_calls == 3
+
+
+def test_back_translation_translation_cache_belongs_to_augmenter(tmp_path):
+    fake_model = FakeSeq2SeqModel(device="cpu", batch_size=4, max_length=128)
+    with patch.object(naw.BackTranslationAug, "get_model", return_value=fake_model):
+        cached_aug = naw.BackTranslationAug(device="cpu", cache_path=str(tmp_path / "cache.sqlite3"))
+        other_aug = naw.BackTranslationAug(device="cpu")
+        cached_aug.augment("a")
+        other_aug.augment("a")
+
+    # Shared model does not keep cache of any augmenter
+    assert not hasattr(fake_model, "cache")
+    assert fake_model.caches == [cached_aug.cache, None]
+
+
+def test_back_translation_with_translation_cache_can_be_pickled(tmp_path):
+    fake_model = FakeSeq2SeqModel(device="cpu", batch_size=4, max_length=128)
+    with patch.object(naw.BackTranslationAug, "get_model", return_value=fake_model):
+        aug = naw.BackTranslationAug(device="cpu", cache_path=str(tmp_path / "cache.sqlite3"))
+
+    # Augmenter is pickled when it is sent to worker process
+    restored = pickle.loads(pickle.dumps(aug))
+    assert restored.cache.path == aug.cache.path
+    assert restored.augment("a") == ["a translated"]
+
+
 def test_back_translation_cache_reuses_model_and_updates_runtime_attrs():
     back_translation_module.BACK_TRANSLATION_MODELS.clear()
     created = []
@@ -293,6 +474,47 @@ def test_sentence_contextual_generation_custom_api_offline_batch():
         assert result[1].startswith(texts[1])
 
 
+class FakeIncrementalGpt2Model(FakeTextGenerationModel):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.optimize = {"external_memory": 1024}
+        self.calls = []
+
+    def predict(self, texts, n=1, **kwargs):
+        raise AssertionError("Whole text is not expected to be sent again")
+
+    def decode(self, ids):
+        return "".join({7: " word", 8: ".", 9: " more"}[_id] for _id in ids)
+
+    def predict_next(self, texts=None, next_ids=None, external_memory=None, rows=None, include_punctuation=False):
+        self.calls.append({"texts": texts, "next_ids": next_ids, "rows": rows})
+        if external_memory is None:
+            return [[("word", 7)] for _ in texts], {"inputs": list(range(len(texts)))}
+
+        inputs = [external_memory["inputs"][row] for row in rows]
+        # First input completes a sentence in the second step. Second input never does.
+        outputs = [[(".", 8)] if i == 0 else [("more", 9)] for i in inputs]
+        return outputs, {"inputs": inputs}
+
+
+def test_sentence_contextual_generation_gpt2_reuses_external_memory():
+    fake_model = FakeIncrementalGpt2Model(device="cpu")
+    with patch.object(nas.ContextualWordEmbsForSentenceAug, "get_model", return_value=fake_model):
+        aug = nas.ContextualWordEmbsForSentenceAug(model_path="gpt2", device=None, use_custom_api=True)
+        result = aug.augment(["The quick brown fox", "Jumps over the lazy dog"])
+
+    # Text follows generated token ids instead of joining stripped tokens by space
+    assert result[0] == "The quick brown fox word."
+    assert result[1] == "Jumps over the lazy dog word" + " more" * 29
+    assert len(fake_model.calls) == 30
+    assert fake_model.calls[0]["texts"] == ["The quick brown fox", "Jumps over the lazy dog"]
+    assert fake_model.calls[1]["rows"] == [0, 1]
+    assert fake_model.calls[1]["next_ids"] == [7, 7]
+    # Finished row is pruned
+    assert fake_model.calls[2]["rows"] == [1]
+    assert fake_model.calls[2]["next_ids"] == [9]
+
+
 def test_lambada_offline(tmp_path):
     model_dir = Path(tmp_path) / "lambada"
     cls_dir = model_dir / "cls"
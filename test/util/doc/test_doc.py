@@ -29,3 +29,33 @@ def test_doc_empty_tokens_starts_empty():
     assert doc.size() == 0
     assert doc.get_original_tokens() == []
     assert doc.get_augmented_tokens() == []
+
+
+def test_doc_builds_change_logs_lazily():
+    doc = Doc('The quick brown fox', ['The', 'quick', 'brown', 'fox'])
+    doc.add_change_log(1, new_token='slow', action=Action.SUBSTITUTE, change_seq=1)
+
+    # No ChangeLog is needed to return augmented tokens
+    assert doc.get_augmented_tokens() == ['The', 'slow', 'brown', 'fox']
+    assert doc._change_logs == [None, None, None, None]
+
+    # Buffered changes are replayed when ChangeLog is requested
+    change_log = doc.get_token(1)
+    assert [t.token for t in change_log.change_logs] == ['quick', 'slow']
+    assert change_log.orig_token.start_pos == 4
+    doc.add_change_log(1, new_token='fast', action=Action.SUBSTITUTE, change_seq=2)
+    assert doc.get_augmented_tokens() == ['The', 'fast', 'brown', 'fox']
+
+
+def test_doc_change_log_positions():
+    doc = Doc('Hello big world', ['Hello', 'big', 'world'])
+    doc.add_change_log(1, new_token='', action=Action.DELETE, change_seq=1)
+    doc.add_change_log(2, new_token='earth', action=Action.SUBSTITUTE, change_seq=2)
+
+    assert doc.get_augmented_tokens() == ['Hello', 'earth']
+    assert doc.get_change_logs() == [
+        {'orig_token': 'big', 'orig_start_pos': 6, 'new_token': '', 'new_start_pos': 6, 'change_seq': 1,
+         'action': Action.DELETE},
+        {'orig_token': 'world', 'orig_start_pos': 10, 'new_token': 'earth', 'new_start_pos': 6, 'change_seq': 2,
+         'action': Action.SUBSTITUTE},
+    ]
@@ -189,3 +189,19 @@ class TestFiltering(unittest.TestCase):
         expected_data = np.array([0.0000, 0.0000, -11.5886, -13.3220, -18.5356, -18.8203], dtype=np.float32)
         np.testing.assert_equal(modified_data, expected_data)
         np.testing.assert_equal(idxes, np.array([5, 4, 1, 2]))
+
+    def test_top_n_pytorch_batch(self):
+        data = torch.tensor([[-10, -0.1, 0.0, 0, 3.4, 1.5], [1.5, 3.4, 0, 0.0, -0.1, -10]])
+
+        modified_data = filtering.filter_top_k_batch(data, 2, replace=-99).data.numpy()
+        np.testing.assert_equal(modified_data, np.array(
+            [[-99, -99, -99, -99, 3.4, 1.5], [1.5, 3.4, -99, -99, -99, -99]], dtype=np.float32))
+
+    def test_cum_proba_batch(self):
+        data = torch.tensor([-9.2171, -18.5356, -18.8203, -10.8368, -13.3220, -11.5886])
+        data = torch.stack([data, torch.flip(data, (0, ))])
+
+        modified_data = filtering.nucleus_sampling_batch(data, 0.95)
+        np.testing.assert_equal(torch.isfinite(modified_data).numpy(), np.array(
+            [[True, False, False, True, False, False], [False, False, True, False, False, True]]))
+        np.testing.assert_equal(modified_data[0, [0, 3]].numpy(), np.array([-9.2171, -10.8368], dtype=np.float32))
@@ -0,0 +1,107 @@
+import threading
+import time
+
+import numpy as np
+
+from nlpaug.util import ModelCache, estimate_model_size
+
+
+class DummyModel:
+    def __init__(self, size=0):
+        self.weights = np.zeros(size, dtype=np.uint8)
+        self.top_k = None
+
+
+def test_lru_eviction_by_entries():
+    cache = ModelCache(max_entries=2)
+    cache.get_or_create('a', DummyModel)
+    cache.get_or_create('b', DummyModel)
+    cache.get_or_create('a', DummyModel)  # a becomes most recently used
+    cache.get_or_create('c', DummyModel)
+
+    assert cache.keys() == ['a', 'c']
+    assert cache.stats()['evictions'] == 1
+
+
+def test_eviction_by_byte_budget():
+    cache = ModelCache(max_bytes=2500)
+    cache.get_or_create('a', lambda: DummyModel(1000))
+    cache.get_or_create('b', lambda: DummyModel(1000))
+    assert cache.stats()['bytes'] >= 2000
+
+    cache.get_or_create('c', lambda: DummyModel(1000))
+    assert cache.keys() == ['b', 'c']
+
+    # Model which is larger than budget is still returned and kept
+    model = cache.get_or_create('d', lambda: DummyModel(5000))
+    assert model.weights.size == 5000
+    assert cache.keys() == ['d']
+
+
+def test_concurrent_get_or_create_loads_once():
+    cache = ModelCache()
+    load_cnt = []
+
+    def factory():
+        load_cnt.append(1)
+        time.sleep(0.05)
+        return DummyModel()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_create('a', factory))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(load_cnt) == 1
+    assert all(r is results[0] for r in results)
+
+    stats = cache.stats()
+    assert stats['loads'] == 1
+    assert stats['misses'] == 1
+    assert stats['hits'] == 7
+    assert stats['load_time'] > 0
+
+
+def test_failed_factory_releases_key_lock():
+    cache = ModelCache()
+
+    def factory():
+        raise IOError('missing model')
+
+    for key in ['a', 'b', 'c']:
+        try:
+            cache.get_or_create(key, factory)
+        except IOError:
+            pass
+
+    assert cache._key_locks == {}
+    assert cache.keys() == []
+    assert cache.get_or_create('a', DummyModel) is not None
+
+
+def test_updates_force_reload_and_namespace():
+    cache = ModelCache()
+    view_a = cache.namespace('a')
+    view_b = cache.namespace('b')
+
+    model = view_a.get_or_create('model', DummyModel)
+    assert view_a.get_or_create('model', DummyModel, updates={'top_k': 5}) is model
+    assert model.top_k == 5
+    assert view_a.get_or_create('model', DummyModel, force_reload=True) is not model
+
+    view_b.get_or_create('model', DummyModel)
+    view_a.clear()
+    assert 'model' not in view_a
+    assert 'model' in view_b
+    assert cache.stats()['entries'] == 1
+
+
+def test_estimate_model_size_skips_memory_mapped_arrays(tmp_path):
+    np.save(str(tmp_path / 'a.npy'), np.zeros(1000, dtype=np.uint8))
+    model = DummyModel(100)
+    model.mapped = np.load(str(tmp_path / 'a.npy'), mmap_mode='r')
+    model.nested = {'w': np.zeros(10, dtype=np.float32)}
+
+    assert 140 <= estimate_model_size(model) < 1000
@@ -0,0 +1,79 @@
+import multiprocessing
+import pickle
+
+import numpy as np
+
+from nlpaug.util import SharedArray
+import nlpaug.model.word_stats as nmws
+import nlpaug.model.word_embs as nmw
+
+
+def _sum_array(shared):
+    return float(shared.array.sum())
+
+
+def test_shared_array_is_pickled_by_reference():
+    array = np.arange(100000, dtype=np.float32).reshape(1000, 100)
+    shared = SharedArray.from_array(array)
+    try:
+        payload = pickle.dumps(shared)
+        assert len(payload) < 1000
+
+        attached = pickle.loads(payload)
+        np.testing.assert_array_equal(array, attached.array)
+        assert not attached.array.flags.writeable
+
+        with multiprocessing.get_context('spawn').Pool(1) as pool:
+            assert pool.apply(_sum_array, (shared,)) == float(array.sum())
+        attached.release()
+    finally:
+        shared.release()
+
+
+def test_shared_array_references_memory_mapped_file(tmp_path):
+    array_path = str(tmp_path / 'array.npy')
+    np.save(array_path, np.arange(10, dtype=np.int32))
+    shared = SharedArray.from_array(np.load(array_path, mmap_mode='r'))
+
+    attached = pickle.loads(pickle.dumps(shared))
+    assert attached.filename == array_path
+    np.testing.assert_array_equal(np.arange(10), attached.array)
+
+
+def test_tfidf_share_memory():
+    model = nmws.TfIdf()
+    model.train([['a', 'b'], ['b', 'c', 'd']])
+    expected_scores = np.array(model.tfidf_scores)
+
+    model.share_memory()
+    try:
+        loaded_model = pickle.loads(pickle.dumps(model))
+        np.testing.assert_array_equal(expected_scores, loaded_model.tfidf_scores)
+        assert loaded_model.tokens == model.tokens
+        assert len(loaded_model.predict(None, top_k=3)) == 3
+    finally:
+        model.release_shared_memory()
+    np.testing.assert_array_equal(expected_scores, model.tfidf_scores)
+
+
+def test_word_embeddings_share_memory(tmp_path):
+    model_path = str(tmp_path / 'glove.txt')
+    vectors = np.random.RandomState(0).randn(100, 8).astype(np.float32)
+    with open(model_path, 'w') as f:
+        for i, vector in enumerate(vectors):
+            f.write('word{} {}\n'.format(i, ' '.join(str(v) for v in vector)))
+
+    model = nmw.GloVe(top_k=3)
+    model.read(model_path)
+    model.build_neighbour_table(num_word=10)
+    expected = [model.predict('word1'), model.predict('word50')]
+
+    model.share_memory()
+    try:
+        loaded_model = pickle.loads(pickle.dumps(model))
+        assert not loaded_model.model.vectors.flags.writeable
+        assert [loaded_model.predict('word1'), loaded_model.predict('word50')] == expected
+        assert loaded_model.contains('word99')
+    finally:
+        model.release_shared_memory()
+    assert model.predict('word50') == expected[1]
@@ -0,0 +1,82 @@
+import pickle
+import time
+from types import SimpleNamespace
+
+from nlpaug.model.lang_models.machine_translation_transformers import MtTransformers
+from nlpaug.util import TranslationCache
+
+
+def test_translation_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = TranslationCache(path)
+    cache.set_many(['hello', 'world'], ['hallo', 'welt'], namespace='en-de')
+    cache.close()
+
+    cache = TranslationCache(path)
+    assert cache.get_many(['world', 'hello', 'new'], namespace='en-de') == ['welt', 'hallo', None]
+    # Namespace (e.g. another model pair) is part of key
+    assert cache.get_many(['hello'], namespace='en-fr') == [None]
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['misses'] == 2
+    assert cache.stats()['entries'] == 2
+
+
+def test_translation_cache_evicts_least_recently_used(tmp_path):
+    cache = TranslationCache(str(tmp_path / 'cache.sqlite3'), max_entries=2)
+    cache.set_many(['a', 'b'], ['A', 'B'])
+    time.sleep(0.01)
+    cache.get_many(['a'])  # a becomes most recently used
+    time.sleep(0.01)
+    cache.set_many(['c'], ['C'])
+
+    assert cache.get_many(['a', 'b', 'c']) == ['A', None, 'C']
+    assert cache.stats()['evictions'] == 1
+
+    cache = TranslationCache(str(tmp_path / 'bytes.sqlite3'), max_bytes=200)
+    cache.set_many(['a', 'b', 'c'], ['x' * 50, 'y' * 50, 'z' * 50])
+    assert cache.stats()['bytes'] <= 200
+    assert cache.get_many(['c']) == ['z' * 50]
+
+
+def test_translation_cache_pickle_round_trip(tmp_path):
+    cache = TranslationCache(str(tmp_path / 'cache.sqlite3'), max_entries=10)
+    cache.set_many(['a'], ['A'])
+
+    restored = pickle.loads(pickle.dumps(cache))
+    assert restored.path == cache.path and restored.max_entries == 10
+    assert restored.get_many(['a', 'b']) == ['A', None]
+    restored.set_many(['b'], ['B'])
+    assert cache.get_many(['b']) == ['B']
+
+
+def test_mt_predict_only_translates_cache_misses(tmp_path):
+    model = MtTransformers.__new__(MtTransformers)
+    model.src_model_name, model.tgt_model_name, model.max_length = 'en-de', 'de-en', None
+    cache = TranslationCache(str(tmp_path / 'cache.sqlite3'))
+    translated = []
+
+    def _predict(texts, n=1):
+        translated.append(texts)
+        return [text.upper() for text in texts]
+
+    model._predict = _predict
+
+    assert model.predict(['a', 'b', 'a'], cache=cache) == ['A', 'B', 'A']
+    assert model.predict(['b', 'c'], cache=cache) == ['B', 'C']
+    assert model.predict('c', cache=cache) == ['C']
+    # Duplicated and cached texts are not translated again
+    assert translated == [['a', 'b'], ['c']]
+
+    model.max_length = 10
+    model.predict(['a'], cache=cache)
+    assert translated[-1] == ['a']
+
+    # Generation config of model (e.g. num_beams) is part of namespace
+    model.tgt_model = SimpleNamespace(generation_config=SimpleNamespace(to_dict=lambda: {'num_beams': 4}))
+    model.predict(['a'], cache=cache)
+    assert translated[-1] == ['a']
+    assert len(translated) == 4
+
+    # Without cache, every text is translated
+    model.predict(['a'])
+    assert translated[-1] == ['a']
@@ -0,0 +1,47 @@
+import re
+
+import nlpaug.augmenter.char as nac
+import nlpaug.augmenter.word as naw
+from nlpaug.util import MODEL_CACHE
+from nlpaug.util.text.stopword_matcher import StopwordMatcher, get_stopword_matcher
+
+
+def test_stopword_matcher():
+    matcher = StopwordMatcher(stopwords=['The', 'fox'], stopwords_regex=r'[a-z]{2}mps ')
+
+    assert matcher.is_stopword('The')
+    assert not matcher.is_stopword('the')
+    # Regex is matched with token surrounded by space
+    assert matcher.match_regex('jumps')
+    assert not matcher.match_regex('quick')
+    assert matcher.is_skipped('fox') and matcher.is_skipped('jumps') and not matcher.is_skipped('dog')
+
+    # Same as checking substring of string.punctuation
+    for token in ['.', '!"', '', 'a', '.a', '..']:
+        assert StopwordMatcher.is_punctuation(token) == (token in '!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~')
+
+    assert StopwordMatcher(stopwords=['The'], case_sensitive=False).is_stopword('THE')
+
+
+def test_stopword_matcher_is_shared():
+    matcher = get_stopword_matcher(stopwords=['a', 'b'], stopwords_regex='[0-9]+')
+    assert matcher is get_stopword_matcher(stopwords=['b', 'a'], stopwords_regex='[0-9]+')
+    assert matcher is not get_stopword_matcher(stopwords=['a', 'b'])
+
+    word_aug = naw.RandomWordAug(stopwords=['a', 'b'], stopwords_regex='[0-9]+')
+    char_aug = nac.KeyboardAug(stopwords=['a', 'b'], stopwords_regex='[0-9]+')
+    assert word_aug.get_stopword_matcher() is char_aug.get_stopword_matcher()
+
+    # Replaced stopwords are picked up
+    word_aug.stopwords = ['quick']
+    assert word_aug.pre_skip_aug(['The', 'quick', 'fox', '123', '.']) == [0, 2]
+
+
+def test_stopword_matcher_is_not_in_model_cache():
+    keys, stats = MODEL_CACHE.keys(), MODEL_CACHE.stats()
+    matcher = get_stopword_matcher(stopwords=['c'], stopwords_regex=re.compile('[a-z]+', re.IGNORECASE))
+    assert matcher is get_stopword_matcher(stopwords=['c'], stopwords_regex=re.compile('[a-z]+', re.IGNORECASE))
+    assert matcher.match_regex('ABC')
+
+    assert MODEL_CACHE.keys() == keys
+    assert MODEL_CACHE.stats() == stats
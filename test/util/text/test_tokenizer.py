@@ -25,4 +25,23 @@ class TestTokenizer(unittest.TestCase):
         text = 'The quick (brown) [fox] {jumps} over the lazy dog?'
 
         tokens = Tokenizer.tokenizer(text)
-        self.assertEqual(text, Tokenizer.reverse_tokenizer(tokens))
\ No newline at end of file
+        self.assertEqual(text, Tokenizer.reverse_tokenizer(tokens))
+
+    def test_batch(self):
+        texts = ['The quick brown fox, jumps over the lazy dog.', 'Hello ( world ) again !', '', 'a\x00b']
+
+        tokens_list = Tokenizer.tokenize_batch(texts)
+        self.assertEqual(tokens_list, [Tokenizer.tokenizer(text) for text in texts])
+        self.assertEqual(
+            Tokenizer.detokenize_batch(tokens_list), [Tokenizer.reverse_tokenizer(tokens) for tokens in tokens_list])
+        self.assertEqual(Tokenizer.detokenize_batch(tokens_list[:3]), [texts[0], 'Hello (world) again!', ''])
+
+    def test_tokenize_with_spaces(self):
+        text = '  The quick\tbrown  fox, (jumps) '
+        tokens, spaces = Tokenizer.tokenize_with_spaces(text)
+        self.assertEqual(tokens, Tokenizer.tokenizer(text))
+        self.assertEqual(text, Tokenizer.detokenize_with_spaces(tokens, spaces))
+
+        # Whitespace around unchanged tokens is kept
+        tokens[1] = 'slow'
+        self.assertEqual('  The slow\tbrown  fox, (jumps) ', Tokenizer.detokenize_with_spaces(tokens, spaces))